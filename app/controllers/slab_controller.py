@@ -1,26 +1,94 @@
 # app/controllers/slab_controller.py
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Optional, Union
 from app.models.base import Laje
-from app.models.value_objects import AnalysisResult
+from app.models.slab_spec import SlabSpec
+from app.models.value_objects import AnalysisResult, CompactAnalysisResult
 from app.engines.interfaces import ICalculationEngine
 from app.services.steel_detailer import SteelDetailer
+from app.services.tracing import rastrear, trecho
+from app.services import metrics
 from config import settings
 
+_ANALISES = metrics.contador("pylaje_analises_total", "Análises de laje executadas (run_analysis)")
+_LATENCIA = metrics.histograma("pylaje_analise_segundos", "Duração de cada análise de laje (s)")
+_AVALIACOES = metrics.contador("pylaje_otimizador_avaliacoes_total", "Espessuras testadas por optimize_thickness")
+_CACHE = metrics.contador("pylaje_cache_consultas_total", "Consultas aos caches (desde o início do processo)",
+                          rotulos=("cache", "resultado"))
+_CACHE_ITENS = metrics.medidor("pylaje_cache_itens", "Itens guardados em cada cache", rotulos=("cache",))
+
+
+class _MotorCache:
+    """Motor levado ao cache: só a chave (engine.chave_cache()) entra na comparação."""
+    __slots__ = ('engine', 'chave')
+
+    def __init__(self, engine: ICalculationEngine, chave: Hashable):
+        self.engine = engine
+        self.chave = chave
+
+    def __hash__(self) -> int:
+        return hash(self.chave)
+
+    def __eq__(self, outro) -> bool:
+        return isinstance(outro, _MotorCache) and self.chave == outro.chave
+
+
+@lru_cache(maxsize=settings.CACHE_ANALISES_MAX)
+def _analisar_cacheado(spec: SlabSpec, motor: _MotorCache) -> CompactAnalysisResult:
+    # Guarda a versão imutável: cada chamador recebe dicts próprios via to_result()
+    res = SlabController(spec, motor.engine).run_analysis()
+    return CompactAnalysisResult.from_result(res)
+
+
+@metrics.coletor
+def _coletar_cache():
+    info = _analisar_cacheado.cache_info()
+    _CACHE.com(cache="analises", resultado="acerto").definir(info.hits)
+    _CACHE.com(cache="analises", resultado="falta").definir(info.misses)
+    _CACHE_ITENS.com(cache="analises").definir(info.currsize)
+
+
 class SlabController:
-    def __init__(self, model: Laje, engine: ICalculationEngine):
-        self.model = model
+    def __init__(self, model: Union[Laje, SlabSpec], engine: ICalculationEngine):
+        # Aceita a especificação imutável; o objeto Laje criado é exclusivo deste controller
+        self.spec: Optional[SlabSpec] = model if isinstance(model, SlabSpec) else None
+        self.model = model.to_laje() if isinstance(model, SlabSpec) else model
         self.engine = engine
         self.last_result: Optional[AnalysisResult] = None
 
+    @staticmethod
+    def analisar_spec(spec: SlabSpec, engine: ICalculationEngine) -> AnalysisResult:
+        """
+        Análise de `spec` com `engine`, memorizada quando o motor declara uma
+        identidade (engine.chave_cache(); mesma spec + mesma chave = resultado
+        reaproveitado). Sem chave, roda direto no motor. Seguro para chamadas
+        concorrentes.
+        """
+        chave = engine.chave_cache() if hasattr(engine, "chave_cache") else None
+        if chave is None:
+            return SlabController(spec, engine).run_analysis()
+        return _analisar_cacheado(spec, _MotorCache(engine, chave)).to_result()
+
+    @staticmethod
+    def limpar_cache():
+        _analisar_cacheado.cache_clear()
+
+    @rastrear()
+    @metrics.cronometrar(_LATENCIA, _ANALISES)
     def run_analysis(self) -> AnalysisResult:
         # 1. Cálculos de Norma
-        esforcos = self.engine.calcular_esforcos_elu(self.model)
-        armaduras = self.engine.dimensionar_armaduras(self.model, esforcos)
-        verif_cortante = self.engine.verificar_cisalhamento(self.model, armaduras)
-        verif_els = self.engine.verificar_els(self.model)
+        with trecho("esforcos"):
+            esforcos = self.engine.calcular_esforcos_elu(self.model)
+        with trecho("armaduras"):
+            armaduras = self.engine.dimensionar_armaduras(self.model, esforcos)
+        with trecho("cisalhamento"):
+            verif_cortante = self.engine.verificar_cisalhamento(self.model, armaduras)
+        with trecho("els"):
+            verif_els = self.engine.verificar_els(self.model)
         
         # 2. NOVA: Verificação de Fissuração (Wk)
-        verif_wk = self.engine.verificar_fissuracao(self.model, esforcos, armaduras)
+        with trecho("fissuracao"):
+            verif_wk = self.engine.verificar_fissuracao(self.model, esforcos, armaduras)
 
         # 3. Reações de Apoio para Vigas
         reacoes = {
@@ -36,15 +104,16 @@ class SlabController:
         area_laje = self.model.lx * self.model.ly
         pp = self.model.get_peso_proprio()
 
-        for pos in ['mx', 'my', 'mx_neg', 'my_neg']:
-            as_req = armaduras.get(pos, 0.0)
-            if isinstance(as_req, (int, float)) and as_req > 0:
-                solucao = SteelDetailer.encontrar_melhor_armadura(as_req, self.model.h)
-                detalhe_map[pos] = solucao.get('texto', "Mínima")
-                fator_area = 0.30 if "neg" in pos else 1.0
-                peso_total_aco += (solucao.get('peso_kg_m2', 0) * area_laje * fator_area)
-            else:
-                detalhe_map[pos] = "Mínima"
+        with trecho("detalhamento"):
+            for pos in ['mx', 'my', 'mx_neg', 'my_neg']:
+                as_req = armaduras.get(pos, 0.0)
+                if isinstance(as_req, (int, float)) and as_req > 0:
+                    solucao = SteelDetailer.encontrar_melhor_armadura(as_req, self.model.h)
+                    detalhe_map[pos] = solucao.get('texto', "Mínima")
+                    fator_area = 0.30 if "neg" in pos else 1.0
+                    peso_total_aco += (solucao.get('peso_kg_m2', 0) * area_laje * fator_area)
+                else:
+                    detalhe_map[pos] = "Mínima"
 
         vol_concreto = (pp / 25.0) * area_laje
         taxa_aco = (peso_total_aco * 1.15) / area_laje if area_laje > 0 else 0
@@ -81,12 +150,20 @@ class SlabController:
         )
         return self.last_result
 
-    def optimize_thickness(self) -> Optional[float]:
+    def optimize_thickness(self, progresso: Optional[Callable[[int, int], None]] = None) -> Optional[float]:
+        # Cada tentativa é uma spec derivada: o modelo original não é alterado
+        base = self.spec or SlabSpec.from_laje(self.model)
         current_h = settings.H_MIN_LAJE_PISO
+        total = int((0.35 - current_h) / settings.PASSO_INCREMENTO_H) + 1
+        tentativa = 0
         while current_h <= 0.35:
-            self.model._h = current_h
-            self.model.calcular_altura_util()
-            res = self.run_analysis()
+            if progresso:
+                # Ponto de interrupção: o callback pode levantar para cancelar
+                progresso(tentativa, total)
+            tentativa += 1
+            _AVALIACOES.inc()
+            res = self.analisar_spec(base.replace(h=current_h), self.engine)
+            self.last_result = res
             if res.status_geral == "APROVADO":
                 return current_h
             current_h += settings.PASSO_INCREMENTO_H
@@ -1,21 +1,43 @@
 import math
-from typing import Dict, Any
+from typing import Dict, Any, Hashable, Optional, Tuple
 from app.engines.interfaces import ICalculationEngine
 from app.engines.coefficients import TableSolver
+from app.engines import combinations
+from app.engines.combinations import ConjuntoCombinacoes, ELU, FREQUENTE, QUASE_PERMANENTE
 from app.models.base import Laje
+from app.models.slab_spec import como_laje
 from config import settings
 
 class AnalyticEngine(ICalculationEngine):
     """
     Motor analítico NBR 6118:2023.
     Suporta: Placas (Marcus/Bares) e Balanços (Isostáticos).
+    Todos os métodos públicos aceitam Laje ou SlabSpec (imutável).
+    As cargas de cada verificação vêm das combinações do motor (padrão: settings.CATEGORIA_USO).
     """
 
+    def __init__(self, combinacoes: Optional[ConjuntoCombinacoes] = None):
+        self.combinacoes = combinacoes or combinations.padrao()
+        self._i_elu, self._i_freq, self._i_qp = (self.combinacoes.indice(nome)
+                                                 for nome in (ELU, FREQUENTE, QUASE_PERMANENTE))
+
+    def chave_cache(self) -> Optional[Hashable]:
+        # Só o próprio AnalyticEngine: subclasses podem guardar estado que muda os
+        # resultados e precisam declarar a sua chave
+        if type(self) is not AnalyticEngine:
+            return None
+        return (AnalyticEngine, self.combinacoes)
+
+    def cargas_combinadas(self, laje: Laje) -> Tuple[float, ...]:
+        """Carga (kN/m²) de cada combinação do motor, na ordem de combinacoes.nomes."""
+        laje = como_laje(laje)
+        c = laje.carregamento
+        return self.combinacoes.avaliar(c.permanente_total(laje.get_peso_proprio()), c.q_acidental)
+
     def calcular_esforcos_elu(self, laje: Laje) -> Dict[str, float]:
-        pp = laje.get_peso_proprio()
+        laje = como_laje(laje)
         # Carga de cálculo (ELU)
-        pd = (laje.carregamento.g_revestimento + laje.carregamento.g_paredes + pp) * settings.GAMMA_G + \
-             laje.carregamento.q_acidental * settings.GAMMA_Q
+        pd = self.cargas_combinadas(laje)[self._i_elu]
         
         # --- DETECÇÃO DE BALANÇO (ISÓSTATICO) ---
         # Verifica se é um caso de Marquise (3 livres, 1 engastada)
@@ -108,6 +130,7 @@ class AnalyticEngine(ICalculationEngine):
         return res
 
     def dimensionar_armaduras(self, laje: Laje, esforcos: Dict[str, float]) -> Dict[str, Any]:
+        laje = como_laje(laje)
         # ... (Manter código existente igual) ...
         # (Copiar o método dimensionar_armaduras da versão anterior)
         fcd = (laje.materiais.fck / 10.0) / settings.GAMMA_C
@@ -132,6 +155,7 @@ class AnalyticEngine(ICalculationEngine):
         return resultados_as
 
     def verificar_cisalhamento(self, laje: Laje, as_flexao: Dict[str, float]) -> Dict[str, Any]:
+        laje = como_laje(laje)
         # ... (Manter código existente igual) ...
         # (Copiar o método verificar_cisalhamento da versão anterior)
         esforcos = self.calcular_esforcos_elu(laje)
@@ -150,12 +174,12 @@ class AnalyticEngine(ICalculationEngine):
         return {"v_sd": round(v_sd, 2), "v_rd1": round(v_rd1, 2), "ratio": round(v_sd / v_rd1, 3) if v_rd1>0 else 0, "status": "OK" if v_sd <= v_rd1 else "FALHA", "detalhes": f"bw={bw:.2f}m"}
 
     def verificar_fissuracao(self, laje: Laje, esforcos_elu: Dict[str, float], as_adotado: Dict[str, float]) -> Dict[str, Any]:
+        laje = como_laje(laje)
         # ... (Manter código existente igual) ...
         # (Copiar método verificar_fissuracao da versão anterior)
         # Brevidade: Retorna lógica já implementada
-        pp = laje.get_peso_proprio()
-        p_freq = (laje.carregamento.g_revestimento + laje.carregamento.g_paredes + pp) + (0.4 * laje.carregamento.q_acidental)
-        p_elu = (laje.carregamento.g_revestimento + laje.carregamento.g_paredes + pp) * settings.GAMMA_G + laje.carregamento.q_acidental * settings.GAMMA_Q
+        cargas = self.cargas_combinadas(laje)
+        p_freq, p_elu = cargas[self._i_freq], cargas[self._i_elu]
         fator = p_freq / p_elu if p_elu > 0 else 1.0
         max_wk = 0.0; status = "OK"; lim = 0.3
         Es = 210000.0; fctm = 0.3 * (laje.materiais.fck ** (2/3))
@@ -173,8 +197,8 @@ class AnalyticEngine(ICalculationEngine):
         """
         Cálculo de Flecha para Balanço ou Placa.
         """
-        pp = laje.get_peso_proprio()
-        p_els = laje.carregamento.g_revestimento + laje.carregamento.g_paredes + pp + (0.3 * laje.carregamento.q_acidental)
+        laje = como_laje(laje)
+        p_els = self.cargas_combinadas(laje)[self._i_qp]
         Ecs_kNm2 = laje.materiais.Ecs * 1e6
         h = laje.h
         Ic = laje.get_inercia_flexao()
@@ -0,0 +1,143 @@
+"""
+Caminho de execução em lote do motor de cálculo.
+
+Lotes pequenos são analisados no próprio processo. Lotes grandes usam um pool de
+processos sobre `multiprocessing.shared_memory`: as lajes são codificadas uma
+única vez em colunas float64 (ver app.models.columnar), os workers recebem apenas
+intervalos de índices e escrevem os resultados diretamente no array de saída.
+Nenhum objeto Laje ou AnalysisResult é serializado por item.
+"""
+import os
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models.base import Laje
+from app.models.value_objects import AnalysisResult
+from app.models import columnar
+from app.engines.interfaces import ICalculationEngine
+from app.engines.analytic import AnalyticEngine
+from app.controllers.slab_controller import SlabController
+from app.services import metrics
+from config import settings
+
+# Callback opcional de progresso: progresso(concluidas, total). Pode levantar
+# exceção para interromper o lote (cancelamento pela interface).
+Progresso = Optional[Callable[[int, int], None]]
+_PASSO_PROGRESSO = 32  # Linhas entre notificações no caminho em processo
+# Processos novos (spawn), nunca fork: o lote pode partir de uma thread da interface
+# (QThreadPool), e bifurcar um processo Qt com várias threads não é seguro
+_CONTEXTO_MP = mp.get_context("spawn")
+_LAJES_LOTE = metrics.contador("pylaje_lajes_processadas_total", "Lajes processadas por etapa do pavimento",
+                               rotulos=("etapa",)).com(etapa="analise")
+
+# Estado do worker (preenchido pelo initializer de cada processo do pool)
+_worker_shm: List[shared_memory.SharedMemory] = []
+_worker_entrada: Optional[np.ndarray] = None
+_worker_saida: Optional[np.ndarray] = None
+_worker_engine: Optional[ICalculationEngine] = None
+
+
+def _inicializar_worker(nome_entrada: str, nome_saida: str, n: int, engine_factory: Callable[[], ICalculationEngine]):
+    global _worker_entrada, _worker_saida, _worker_engine
+    shm_in = shared_memory.SharedMemory(name=nome_entrada)
+    shm_out = shared_memory.SharedMemory(name=nome_saida)
+    _worker_shm[:] = [shm_in, shm_out]  # Mantém os blocos anexados durante a vida do worker
+    _worker_entrada = np.ndarray((n, columnar.N_COLUNAS_LAJE), dtype=np.float64, buffer=shm_in.buf)
+    _worker_saida = np.ndarray((n, columnar.N_COLUNAS_RESULTADO), dtype=np.float64, buffer=shm_out.buf)
+    _worker_engine = engine_factory()
+
+
+def _processar_intervalo(intervalo: Tuple[int, int]) -> int:
+    """Analisa as linhas [ini, fim) e grava os resultados no bloco de saída."""
+    ini, fim = intervalo
+    for i in range(ini, fim):
+        laje = columnar.linha_para_laje(_worker_entrada[i])
+        res = SlabController(laje, _worker_engine).run_analysis()
+        columnar.resultado_para_linha(res, _worker_saida[i])
+    return fim - ini
+
+
+class BatchExecutor:
+    """
+    Executa análises de muitas lajes, escolhendo entre o processo atual e o pool
+    de memória compartilhada conforme o tamanho do lote.
+    """
+
+    def __init__(
+        self,
+        engine_factory: Callable[[], ICalculationEngine] = AnalyticEngine,
+        processos: Optional[int] = None,
+        limiar_paralelo: Optional[int] = None,
+        tamanho_bloco: Optional[int] = None
+    ):
+        self.engine_factory = engine_factory
+        self.processos = processos or settings.LOTE_PROCESSOS or os.cpu_count() or 1
+        self.limiar_paralelo = settings.LOTE_LIMIAR_PARALELO if limiar_paralelo is None else limiar_paralelo
+        self.tamanho_bloco = tamanho_bloco or settings.LOTE_TAMANHO_BLOCO
+
+    def usa_pool(self, n: int) -> bool:
+        return self.processos > 1 and n >= self.limiar_paralelo
+
+    def analisar(self, lajes: Sequence[Laje]) -> List[AnalysisResult]:
+        """Analisa a sequência de lajes e retorna os resultados na mesma ordem."""
+        n = len(lajes)
+        if not self.usa_pool(n) or not all(columnar.laje_suportada(l) for l in lajes):
+            engine = self.engine_factory()
+            return [SlabController(laje, engine).run_analysis() for laje in lajes]
+
+        entrada = np.empty((n, columnar.N_COLUNAS_LAJE), dtype=np.float64)
+        for i, laje in enumerate(lajes):
+            columnar.laje_para_linha(laje, entrada[i])
+        saida = self.analisar_colunas(entrada)
+        return [columnar.linha_para_resultado(linha) for linha in saida.tolist()]
+
+    def analisar_colunas(self, entrada: np.ndarray, progresso: Progresso = None) -> np.ndarray:
+        """
+        Recebe a matriz (n x COLUNAS_LAJE) e retorna a matriz (n x COLUNAS_RESULTADO).
+        Útil para varreduras paramétricas que já geram as entradas em colunas.
+        """
+        n = entrada.shape[0]
+        saida = np.empty((n, columnar.N_COLUNAS_RESULTADO), dtype=np.float64)
+        if n == 0:
+            return saida
+        _LAJES_LOTE.inc(n) # Conta também as lajes analisadas nos processos do pool
+
+        if not self.usa_pool(n):
+            engine = self.engine_factory()
+            for i in range(n):
+                if progresso and i % _PASSO_PROGRESSO == 0:
+                    progresso(i, n)
+                res = SlabController(columnar.linha_para_laje(entrada[i]), engine).run_analysis()
+                columnar.resultado_para_linha(res, saida[i])
+            if progresso:
+                progresso(n, n)
+            return saida
+
+        shm_in = shared_memory.SharedMemory(create=True, size=entrada.nbytes)
+        shm_out = shared_memory.SharedMemory(create=True, size=saida.nbytes)
+        try:
+            np.ndarray(entrada.shape, dtype=np.float64, buffer=shm_in.buf)[:] = entrada
+            saida_shm = np.ndarray(saida.shape, dtype=np.float64, buffer=shm_out.buf)
+
+            intervalos = [(i, min(i + self.tamanho_bloco, n)) for i in range(0, n, self.tamanho_bloco)]
+            with _CONTEXTO_MP.Pool(
+                processes=min(self.processos, len(intervalos)),
+                initializer=_inicializar_worker,
+                initargs=(shm_in.name, shm_out.name, n, self.engine_factory)
+            ) as pool:
+                concluidas = 0
+                # Se o callback interromper, o 'with' encerra o pool (terminate)
+                for qtd in pool.imap_unordered(_processar_intervalo, intervalos):
+                    concluidas += qtd
+                    if progresso:
+                        progresso(concluidas, n)
+
+            saida[:] = saida_shm
+            del saida_shm  # Libera a referência ao buffer antes de fechar o bloco
+        finally:
+            shm_in.close(); shm_in.unlink()
+            shm_out.close(); shm_out.unlink()
+        return saida
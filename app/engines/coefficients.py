@@ -1,6 +1,23 @@
 import json
 from typing import Dict, Tuple, Any, List
 from pathlib import Path
+from app.services import metrics
+
+_AVISOS = metrics.contador("pylaje_avisos_total", "Problemas relatados (print) ao carregar dados", rotulos=("origem",))
+# Contado fora do registro: a tabela pode ser lida antes de metrics.ativar()
+# (que zera as métricas). O coletor publica o total.
+_avisos_carga = 0
+
+
+def _contar_aviso():
+    global _avisos_carga
+    _avisos_carga += 1
+
+
+@metrics.coletor
+def _coletar_avisos():
+    _AVISOS.com(origem="coeficientes").definir(_avisos_carga)
+
 
 class TableSolver:
     """
@@ -18,6 +35,7 @@ class TableSolver:
                     cls._cached_data = json.load(f)
             except Exception as e:
                 print(f"Erro ao carregar tabela de coeficientes: {e}")
+                _contar_aviso()
                 cls._cached_data = {"casos_marcus": {}}
 
     @staticmethod
@@ -56,7 +74,8 @@ class TableSolver:
         return 1 # Fallback
 
     @staticmethod
-    def get_coefficients(caso: int, lam: float) -> Dict[str, float]:
+    def dados_caso(caso: int) -> List[Dict[str, float]]:
+        """Linhas da tabela do caso ordenadas por lambda (vazia se nem o caso 1 existir)."""
         TableSolver._load_data()
         
         casos = TableSolver._cached_data.get("casos_marcus", {})
@@ -66,10 +85,14 @@ class TableSolver:
         if not dados_caso:
             # Tenta usar caso 1 (apoiado) como segurança
             dados_caso = casos.get("1", {}).get("dados", [])
-            if not dados_caso:
-                return {"alpha_x": 10.0, "alpha_y": 10.0 * lam**2, "mu_x": 0.5, "mu_y": 0.5}
 
-        dados_sorted = sorted(dados_caso, key=lambda x: x['lambda'])
+        return sorted(dados_caso, key=lambda x: x['lambda'])
+
+    @staticmethod
+    def get_coefficients(caso: int, lam: float) -> Dict[str, float]:
+        dados_sorted = TableSolver.dados_caso(caso)
+        if not dados_sorted:
+            return {"alpha_x": 10.0, "alpha_y": 10.0 * lam**2, "mu_x": 0.5, "mu_y": 0.5}
         
         if lam <= dados_sorted[0]['lambda']:
             return dados_sorted[0]
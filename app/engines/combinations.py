@@ -0,0 +1,115 @@
+"""
+Combinações de ações (NBR 6118 11.7 / NBR 8681).
+
+Cada combinação é um par de coeficientes (permanente, variável) aplicado ao
+vetor de cargas da laje [g, q] (kN/m²):
+
+    ELU (normal):      γg·g + γq·q
+    rara:              g + q
+    frequente:         g + ψ1·q
+    quase-permanente:  g + ψ2·q
+
+Um ConjuntoCombinacoes guarda os coeficientes de todas as combinações em
+colunas, de forma que avaliar todas elas é uma única operação: por laje
+(avaliar, escalares) ou para um lote inteiro (avaliar_lote, n x combinações
+com numpy). Acrescentar combinações só acrescenta colunas.
+
+Os valores padrão (γ = 1,4; categoria residencial: ψ1 = 0,4 e ψ2 = 0,3)
+reproduzem exatamente as cargas usadas até aqui pelo AnalyticEngine.
+"""
+from dataclasses import dataclass
+from typing import Dict, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from config import settings
+
+ELU, RARA, FREQUENTE, QUASE_PERMANENTE = "ELU", "rara", "frequente", "quase_permanente"
+
+
+class FatoresPsi(NamedTuple):
+    psi0: float # Combinação (ação variável secundária no ELU)
+    psi1: float # Frequente
+    psi2: float # Quase-permanente
+
+
+# Categoria de uso -> fatores de redução (ver settings.PSI_POR_CATEGORIA)
+CATEGORIAS: Dict[str, FatoresPsi] = {nome: FatoresPsi(*psi) for nome, psi in settings.PSI_POR_CATEGORIA.items()}
+
+
+@dataclass(frozen=True)
+class Combinacao:
+    nome: str
+    coef_g: float # Multiplica as ações permanentes (revestimento + paredes + peso próprio)
+    coef_q: float # Multiplica a ação variável (acidental)
+
+
+@dataclass(frozen=True)
+class ConjuntoCombinacoes:
+    """Combinações avaliadas juntas. Imutável e comparável: pode entrar em chaves de cache."""
+    combinacoes: Tuple[Combinacao, ...]
+    categoria: str = ""
+
+    def __post_init__(self):
+        nomes = [c.nome for c in self.combinacoes]
+        if len(set(nomes)) != len(nomes):
+            raise ValueError(f"Combinações com nomes repetidos: {nomes}")
+        # Pares (coef_g, coef_q) prontos para o caminho por laje (fora da comparação/hash)
+        object.__setattr__(self, "_pares", tuple((c.coef_g, c.coef_q) for c in self.combinacoes))
+
+    @classmethod
+    def padrao(cls, categoria: str = settings.CATEGORIA_USO, gamma_g: float = settings.GAMMA_G,
+               gamma_q: float = settings.GAMMA_Q) -> "ConjuntoCombinacoes":
+        """ELU, rara, frequente e quase-permanente para a categoria de uso."""
+        try:
+            psi = CATEGORIAS[categoria]
+        except KeyError:
+            raise ValueError(f"Categoria de uso desconhecida: '{categoria}' (opções: {', '.join(CATEGORIAS)})")
+        return cls((
+            Combinacao(ELU, gamma_g, gamma_q),
+            Combinacao(RARA, 1.0, 1.0),
+            Combinacao(FREQUENTE, 1.0, psi.psi1),
+            Combinacao(QUASE_PERMANENTE, 1.0, psi.psi2),
+        ), categoria)
+
+    def com(self, *extras: Combinacao) -> "ConjuntoCombinacoes":
+        """Novo conjunto com as combinações extras ao final."""
+        return ConjuntoCombinacoes(self.combinacoes + tuple(extras), self.categoria)
+
+    @property
+    def nomes(self) -> Tuple[str, ...]:
+        return tuple(c.nome for c in self.combinacoes)
+
+    def indice(self, nome: str) -> int:
+        return self.nomes.index(nome)
+
+    def avaliar(self, g: float, q: float) -> Tuple[float, ...]:
+        """Cargas de todas as combinações para uma laje (na ordem de `nomes`)."""
+        return tuple([cg * g + cq * q for cg, cq in self._pares])
+
+    def coeficientes(self) -> np.ndarray:
+        """Matriz (2 x combinações): linha 0 = coeficientes de g, linha 1 = de q."""
+        return np.array([[c.coef_g for c in self.combinacoes],
+                         [c.coef_q for c in self.combinacoes]], dtype=np.float64)
+
+    def avaliar_lote(self, g: Sequence[float], q: Sequence[float]) -> np.ndarray:
+        """
+        Matriz (n x combinações) para n lajes. Cada elemento é calculado como em
+        avaliar (produto e soma em float64, sem reassociação), então lote e
+        laje a laje dão os mesmos valores.
+        """
+        g = np.asarray(g, dtype=np.float64).reshape(-1, 1)
+        q = np.asarray(q, dtype=np.float64).reshape(-1, 1)
+        coef = self.coeficientes()
+        return g * coef[0] + q * coef[1]
+
+
+_PADRAO = None
+
+
+def padrao() -> ConjuntoCombinacoes:
+    """Conjunto da categoria configurada em settings (criado uma vez)."""
+    global _PADRAO
+    if _PADRAO is None:
+        _PADRAO = ConjuntoCombinacoes.padrao()
+    return _PADRAO
@@ -0,0 +1,45 @@
+"""
+Adaptador de campos nodais de placa (mx, my, flecha) para visualização.
+
+`CampoNodal` guarda, para cada laje do pavimento, uma malha regular de nós
+(ny x nx) sobre o retângulo da laje. É o formato esperado pelo renderizador de
+contornos (ui/gui/widgets/contour_layer.py): um solver de placas por elementos
+finitos entrega os valores nodais neste mesmo formato, com os rótulos de CAMPOS.
+
+Ainda não há solver de malha neste módulo. Campos montados a partir dos
+resultados analíticos ficam em app.services.campos_aproximados, com rótulos
+próprios que os distinguem de resultados de MEF.
+"""
+from dataclasses import dataclass, field
+from typing import Dict
+
+import numpy as np
+
+# Nome do campo -> rótulo (unidade) de resultados de MEF
+CAMPOS = {
+    "mx": "Contorno mx (kN.m/m)",
+    "my": "Contorno my (kN.m/m)",
+    "flecha": "Contorno flecha (mm)",
+}
+# Campos com sinal (escala de cores divergente, centrada em zero)
+CAMPOS_COM_SINAL = ("mx", "my")
+
+
+@dataclass
+class CampoNodal:
+    x0: np.ndarray # (n,) canto inferior esquerdo de cada laje
+    y0: np.ndarray
+    lx: np.ndarray
+    ly: np.ndarray
+    valores: Dict[str, np.ndarray] = field(default_factory=dict) # nome -> (n, ny, nx)
+
+    @property
+    def n(self) -> int:
+        return self.x0.size
+
+    def limites(self, nome: str):
+        """(mínimo, máximo) do campo em todo o pavimento, para uma escala de cores estável."""
+        v = self.valores[nome]
+        if v.size == 0:
+            return 0.0, 0.0
+        return float(np.nanmin(v)), float(np.nanmax(v))
@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Hashable, Optional
 from app.models.base import Laje
 
 class ICalculationEngine(ABC):
     """
     Interface abstrata que define o que qualquer motor de cálculo deve realizar.
+    Os métodos recebem uma Laje ou uma SlabSpec (ver app.models.slab_spec.como_laje).
     """
 
     @abstractmethod
@@ -28,4 +29,12 @@ class ICalculationEngine(ABC):
     @abstractmethod
     def verificar_els(self, laje: Laje) -> Dict[str, Any]:
         """Verificações de serviço (Flecha)."""
-        pass
\ No newline at end of file
+        pass
+
+    def chave_cache(self) -> Optional[Hashable]:
+        """
+        Identidade do motor para memorizar análises (SlabController.analisar_spec).
+        Dois motores com a mesma chave devem dar resultados iguais para a mesma
+        spec. None (padrão) = não memorizar: cada análise roda neste motor.
+        """
+        return None
@@ -0,0 +1,290 @@
+"""
+Alternância da carga acidental (carregamento em xadrez) por superposição.
+
+Em pavimentos contínuos o maior momento positivo de uma laje aparece com a
+carga acidental nela e não nas vizinhas. Em vez de analisar cada arranjo, o
+pavimento é descrito por uma matriz de influência A (n x n, esparsa: a laje e
+suas vizinhas de continuidade): A[i, j] é o momento positivo na laje i por
+kN/m² aplicado só na laje j.
+
+O arranjo de referência (tudo carregado) é a própria análise laje a laje do
+AnalyticEngine: M_ref = k_c·(coef_g·g + coef_q·q), com k_c a soma da linha de A
+(bordas contínuas engastadas, carga da própria laje). A matriz entra só no que
+muda ao retirar a carga acidental de algumas lajes (s_j = 0 ou 1):
+
+    M(s) = M_ref + A @ (coef_q·q·(s - 1))
+
+Assim a coluna "tudo carregado" coincide com os momentos da análise (A @ g
+daria outro valor quando as vizinhas têm cargas diferentes), e a envoltória
+sobre TODOS os 2^n arranjos sai das partes positiva e negativa de A:
+
+    M_max = M_ref - A⁻ @ (coef_q·q)
+    M_min = M_ref - A⁺ @ (coef_q·q)
+
+para cada combinação de ações (app.engines.combinations), de uma vez.
+aplicar_envoltoria leva M_max de ELU aos momentos de dimensionamento.
+
+Coeficientes (mesmas tabelas de Marcus do AnalyticEngine, k = lx²/α):
+    - tudo carregado: bordas contínuas engastadas -> k_c (soma da linha de A);
+    - xadrez (laje carregada, vizinhas não): decomposição clássica em meia
+      carga simétrica (bordas contínuas engastadas) + meia carga antissimétrica
+      (bordas contínuas apoiadas) -> (k_c + k_a) / 2;
+    - a diferença (k_c - k_a) / 2 é repartida entre as bordas contínuas na
+      proporção do efeito de liberar cada borda isoladamente, e entre as
+      vizinhas de uma mesma borda em partes iguais.
+Balanços (3 bordas livres) não dependem das vizinhas: só a diagonal.
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from app.engines.coefficients import TableSolver
+from app.engines.combinations import ConjuntoCombinacoes, ELU
+from app.engines import combinations
+from app.engines.analytic import AnalyticEngine
+from app.controllers.slab_controller import SlabController
+from app.models import columnar
+
+_ESQ, _DIR, _TOPO, _FUNDO = (columnar.BORDAS.index(b) for b in ('esquerda', 'direita', 'topo', 'fundo'))
+_ENGASTADO = columnar.CODIGOS_BORDA["engastado"]
+_LIVRE = columnar.CODIGOS_BORDA["livre"]
+_IDX_BORDAS = slice(5, 9)
+_IDX_PP = [0, 3] + list(range(17, 23)) # Colunas que definem o peso próprio (tipo, h, nervuras, enchimento)
+_IDX_G_REV, _IDX_Q, _IDX_G_PAR = 14, 15, 16
+
+
+def _casos(eng: np.ndarray) -> np.ndarray:
+    """TableSolver.identificar_caso aplicado às linhas de uma matriz (n x 4) de engastes."""
+    n_eng = eng.sum(axis=1)
+    canto = (eng[:, _ESQ] | eng[:, _DIR]) & (eng[:, _TOPO] | eng[:, _FUNDO])
+    return np.select([n_eng == 4, n_eng == 1, (n_eng == 2) & canto, n_eng == 2, n_eng == 3],
+                     [6, 2, 3, 4, 5], default=1)
+
+
+def coeficientes_momento(lx: np.ndarray, ly: np.ndarray, eng: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(kx, ky) com mx = p·kx e my = p·ky, pelas tabelas de Marcus (interpolação em λ = ly/lx)."""
+    lam = ly / lx
+    alpha_x, alpha_y = np.empty_like(lam), np.empty_like(lam)
+    casos = _casos(eng)
+    for caso in np.unique(casos):
+        sel = casos == caso
+        dados = TableSolver.dados_caso(int(caso))
+        if not dados:
+            alpha_x[sel], alpha_y[sel] = 10.0, 10.0 * lam[sel] ** 2
+            continue
+        lams = [d['lambda'] for d in dados]
+        # np.interp mantém os extremos fora da faixa, como get_coefficients
+        alpha_x[sel] = np.interp(lam[sel], lams, [d['alpha_x'] for d in dados])
+        alpha_y[sel] = np.interp(lam[sel], lams, [d['alpha_y'] for d in dados])
+    return lx ** 2 / alpha_x, lx ** 2 / alpha_y
+
+
+def peso_proprio(entrada: np.ndarray) -> np.ndarray:
+    """Peso próprio (kN/m²) de cada linha, calculado uma vez por combinação distinta de seção."""
+    if entrada.shape[0] == 0:
+        return np.zeros(0)
+    _, primeira, inversa = np.unique(entrada[:, _IDX_PP], axis=0, return_index=True, return_inverse=True)
+    pp = np.array([columnar.linha_para_laje(entrada[i]).get_peso_proprio() for i in primeira])
+    return pp[inversa.reshape(-1)]
+
+
+@dataclass
+class EnvoltoriaAlternancia:
+    """Momentos positivos (kNm/m) por laje (linhas) e combinação (colunas, ordem de `nomes`)."""
+    nomes: Tuple[str, ...]
+    mx_max: np.ndarray
+    mx_min: np.ndarray
+    my_max: np.ndarray
+    my_min: np.ndarray
+    mx_total: np.ndarray # Tudo carregado
+    my_total: np.ndarray
+
+    def coluna(self, nome: str) -> dict:
+        """Vetores de uma combinação: {'mx_max': ..., 'mx_min': ..., ...}."""
+        k = self.nomes.index(nome)
+        return {campo: getattr(self, campo)[:, k]
+                for campo in ('mx_max', 'mx_min', 'my_max', 'my_min', 'mx_total', 'my_total')}
+
+
+@dataclass
+class MatrizInfluencia:
+    """A em coordenadas (linha, coluna, valor), uma série de valores por direção."""
+    n: int
+    linhas: np.ndarray
+    colunas: np.ndarray
+    ax: np.ndarray
+    ay: np.ndarray
+
+    def momentos(self, cargas: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(mx, my) para as cargas (n) ou arranjos de cargas (n x m): A @ cargas."""
+        cargas = np.asarray(cargas, dtype=np.float64)
+        return self._produto(self.ax, cargas), self._produto(self.ay, cargas)
+
+    def _produto(self, valores: np.ndarray, cargas: np.ndarray) -> np.ndarray:
+        if cargas.ndim == 1:
+            return np.bincount(self.linhas, weights=valores * cargas[self.colunas], minlength=self.n)
+        parcelas = valores[:, None] * cargas[self.colunas]
+        return np.stack([np.bincount(self.linhas, weights=parcelas[:, k], minlength=self.n)
+                         for k in range(cargas.shape[1])], axis=1)
+
+    def coeficientes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(kx, ky) da análise laje a laje: soma de cada linha de A."""
+        return (np.bincount(self.linhas, weights=self.ax, minlength=self.n),
+                np.bincount(self.linhas, weights=self.ay, minlength=self.n))
+
+    def envoltoria(self, g: np.ndarray, q: np.ndarray, combinacoes: ConjuntoCombinacoes) -> EnvoltoriaAlternancia:
+        """Envoltória exata (modelo linear) sobre todos os arranjos da carga acidental."""
+        p = combinacoes.avaliar_lote(g, q) # (n x k), como AnalyticEngine.cargas_combinadas
+        coef_q = combinacoes.coeficientes()[1]
+        kx, ky = self.coeficientes()
+        saida = {}
+        for eixo, valores, k in (('mx', self.ax, kx), ('my', self.ay, ky)):
+            m_ref = k[:, None] * p
+            m_q_pos = self._produto(np.maximum(valores, 0.0), q)
+            m_q_neg = self._produto(np.minimum(valores, 0.0), q)
+            saida[f'{eixo}_total'] = m_ref
+            saida[f'{eixo}_max'] = m_ref - m_q_neg[:, None] * coef_q
+            saida[f'{eixo}_min'] = m_ref - m_q_pos[:, None] * coef_q
+        return EnvoltoriaAlternancia(combinacoes.nomes, **saida)
+
+    def padroes_xadrez(self) -> np.ndarray:
+        """
+        Arranjos (n x 3) de referência: tudo carregado e as duas cores de um
+        xadrez sobre o grafo de continuidade (busca em largura; em grafos não
+        bipartidos algumas vizinhas ficam com a mesma cor).
+        """
+        vizinhos = [[] for _ in range(self.n)]
+        for i, j in zip(self.linhas.tolist(), self.colunas.tolist()):
+            if i != j:
+                vizinhos[i].append(j)
+                vizinhos[j].append(i)
+        cor = np.full(self.n, -1, dtype=np.int8)
+        for inicio in range(self.n):
+            if cor[inicio] >= 0:
+                continue
+            cor[inicio] = 0
+            fila = deque([inicio])
+            while fila:
+                i = fila.popleft()
+                for j in vizinhos[i]:
+                    if cor[j] < 0:
+                        cor[j] = 1 - cor[i]
+                        fila.append(j)
+        return np.stack([np.ones(self.n, dtype=bool), cor == 0, cor == 1], axis=1)
+
+
+def matriz_influencia(entrada: np.ndarray, pares: Tuple[Tuple[np.ndarray, np.ndarray], ...]) -> MatrizInfluencia:
+    """
+    A para o pavimento: `entrada` = SlabTable.matriz_entrada(), `pares` =
+    GerenciadorPavimento.pares_continuidade() (vizinha à direita, vizinha acima).
+    """
+    n = entrada.shape[0]
+    lx, ly = entrada[:, 1], entrada[:, 2]
+    bordas = entrada[:, _IDX_BORDAS].astype(np.int8)
+    eng = bordas == _ENGASTADO
+    balanco = ((bordas == _LIVRE).sum(axis=1) == 3) & (eng.sum(axis=1) == 1)
+
+    # Bordas contínuas: os dois lados ainda engastados (vínculo manual pode ter liberado um deles)
+    (hi, hj), (vi, vj) = pares
+    h_ok = eng[hi, _DIR] & eng[hj, _ESQ]
+    v_ok = eng[vi, _TOPO] & eng[vj, _FUNDO]
+    hi, hj, vi, vj = hi[h_ok], hj[h_ok], vi[v_ok], vj[v_ok]
+    # (laje afetada, borda, vizinha) nos dois sentidos de cada par
+    afetada = np.concatenate([hi, hj, vi, vj]).astype(np.intp)
+    borda = np.concatenate([np.full(len(hi), _DIR), np.full(len(hj), _ESQ),
+                            np.full(len(vi), _TOPO), np.full(len(vj), _FUNDO)]).astype(np.intp)
+    vizinha = np.concatenate([hj, hi, vj, vi]).astype(np.intp)
+    sel = ~balanco[afetada]
+    afetada, borda, vizinha = afetada[sel], borda[sel], vizinha[sel]
+
+    continua = np.zeros((n, 4), dtype=bool)
+    continua[afetada, borda] = True
+    vizinhas_por_borda = np.zeros((n, 4))
+    np.add.at(vizinhas_por_borda, (afetada, borda), 1.0)
+
+    kx_c, ky_c = coeficientes_momento(lx, ly, eng)
+    kx_a, ky_a = coeficientes_momento(lx, ly, eng & ~continua) # Todas as contínuas apoiadas
+
+    diag, fora = [], []
+    for k_c, k_a, eixo in ((kx_c, kx_a, 0), (ky_c, ky_a, 1)):
+        # Efeito de liberar cada borda contínua isoladamente (peso da repartição)
+        delta = np.zeros((n, 4))
+        for b in range(4):
+            tem = continua[:, b]
+            if tem.any():
+                eng_b = eng.copy()
+                eng_b[:, b] = False
+                delta[tem, b] = (k_c - coeficientes_momento(lx, ly, eng_b)[eixo])[tem]
+        soma = delta.sum(axis=1)
+        total = (k_c - k_a) / 2.0 # Parcela das vizinhas com tudo carregado
+        pesos = np.divide(delta, soma[:, None], out=np.zeros_like(delta), where=np.abs(soma[:, None]) > 1e-12)
+        # Sem efeito isolado mensurável: repartição igual entre as bordas contínuas
+        iguais = continua / np.maximum(continua.sum(axis=1), 1)[:, None]
+        pesos = np.where((np.abs(soma) > 1e-12)[:, None], pesos, iguais)
+        por_borda = total[:, None] * pesos # Em geral < 0: vizinha carregada reduz o positivo
+        diag.append(np.where(balanco, _balanco(lx, ly, eng, eixo), k_c - por_borda.sum(axis=1)))
+        fora.append(por_borda[afetada, borda] / vizinhas_por_borda[afetada, borda])
+
+    idx = np.arange(n)
+    return MatrizInfluencia(n, np.concatenate([idx, afetada]), np.concatenate([idx, vizinha]),
+                            np.concatenate([diag[0], fora[0]]), np.concatenate([diag[1], fora[1]]))
+
+
+def _balanco(lx: np.ndarray, ly: np.ndarray, eng: np.ndarray, eixo: int) -> np.ndarray:
+    """Momento positivo de distribuição do balanço (20% de p·l²/2, como em _calcular_balanco_elu)."""
+    em_x = eng[:, _ESQ] | eng[:, _DIR]
+    if eixo == 0:
+        return np.where(em_x, 0.0, 0.2 * ly ** 2 / 2.0)
+    return np.where(em_x, 0.2 * lx ** 2 / 2.0, 0.0)
+
+
+def envoltoria(entrada: np.ndarray, pares, combinacoes: Optional[ConjuntoCombinacoes] = None,
+               influencia: Optional[MatrizInfluencia] = None) -> EnvoltoriaAlternancia:
+    """Envoltória de momentos positivos do pavimento com a carga acidental alternada."""
+    combinacoes = combinacoes or combinations.padrao()
+    influencia = influencia or matriz_influencia(entrada, pares)
+    g = entrada[:, _IDX_G_REV] + entrada[:, _IDX_G_PAR] + peso_proprio(entrada) # Como permanente_total
+    return influencia.envoltoria(g, entrada[:, _IDX_Q], combinacoes)
+
+
+# ==============================================================================
+# DIMENSIONAMENTO COM A ENVOLTÓRIA
+# ==============================================================================
+
+_COL_MX = columnar.COLUNAS_RESULTADO.index('momentos_kNm.mx')
+_COL_MY = columnar.COLUNAS_RESULTADO.index('momentos_kNm.my')
+
+
+class _MotorEnvoltoria(AnalyticEngine):
+    """AnalyticEngine com os momentos positivos de ELU de uma laje elevados aos da envoltória."""
+
+    def __init__(self, mx: float, my: float, combinacoes: Optional[ConjuntoCombinacoes] = None):
+        super().__init__(combinacoes)
+        self._mx, self._my = round(mx, 2), round(my, 2) # Mesmo arredondamento de calcular_esforcos_elu
+
+    def calcular_esforcos_elu(self, laje):
+        esforcos = super().calcular_esforcos_elu(laje)
+        esforcos['mx'] = max(esforcos['mx'], self._mx)
+        esforcos['my'] = max(esforcos['my'], self._my)
+        return esforcos
+
+
+def aplicar_envoltoria(entrada: np.ndarray, saida: np.ndarray, env: EnvoltoriaAlternancia,
+                       combinacoes: Optional[ConjuntoCombinacoes] = None) -> np.ndarray:
+    """
+    Reanalisa, sobre `saida` (matriz de resultados da análise laje a laje), as
+    lajes cujo momento positivo de ELU na envoltória supera o da análise:
+    armaduras, cortante, fissuração e detalhamento passam a usar M_max.
+    `combinacoes` deve ser o conjunto do motor que gerou `saida` e `env`.
+    Retorna os índices das lajes alteradas.
+    """
+    elu = env.coluna(ELU)
+    mx_max, my_max = np.round(elu['mx_max'], 2), np.round(elu['my_max'], 2)
+    alteradas = np.flatnonzero((mx_max > saida[:, _COL_MX]) | (my_max > saida[:, _COL_MY]))
+    for i in alteradas.tolist():
+        motor = _MotorEnvoltoria(mx_max[i], my_max[i], combinacoes)
+        res = SlabController(columnar.linha_para_laje(entrada[i]), motor).run_analysis()
+        columnar.resultado_para_linha(res, saida[i])
+    return alteradas
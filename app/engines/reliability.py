@@ -0,0 +1,270 @@
+"""
+Análise de confiabilidade por Monte Carlo (lajes maciças).
+
+Em vez do status determinístico, sorteia fck, fyk, cargas permanente e
+acidental, espessura e cobrimento e avalia as verificações do AnalyticEngine
+em numpy sobre todas as amostras de um bloco de uma vez:
+
+    flexao_<pos>   M_S > M_R com a armadura do projeto nominal (as_teorico)
+    cisalhamento   V_Sd > V_Rd1
+    flecha         flecha total > limite (combinação quase-permanente)
+    fissuracao     wk > 0,3 mm (combinação frequente)
+    sistema        qualquer uma das anteriores
+
+Nas verificações de ELU os coeficientes parciais valem 1: a incerteza que eles
+cobrem está nas próprias variáveis sorteadas. A armadura fica fixa (é a que
+seria executada). Para cada verificação: Pf, intervalo de Wilson para Pf e
+β = -Φ⁻¹(Pf) com o intervalo correspondente.
+
+    res = AnaliseConfiabilidade(laje).executar(amostras=10**6, semente=42)
+    print(res.relatorio())
+
+Mesma semente + mesmo bloco = mesmos números. Memória proporcional ao bloco,
+não ao total de amostras.
+"""
+import math
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.engines import combinations
+from app.engines.analytic import AnalyticEngine
+from app.engines.coefficients import TableSolver
+from app.engines.combinations import ConjuntoCombinacoes, FREQUENTE, QUASE_PERMANENTE
+from app.models.base import Laje
+from app.models.slab_spec import como_laje
+from app.models.solid import LajeMacica
+from config import settings
+
+NORMAL, LOGNORMAL, GUMBEL, FIXO = "normal", "lognormal", "gumbel", "fixo"
+_EULER = 0.5772156649015329
+_Z_5 = 1.6448536269514722 # Quantil de 95% da normal padrão (fck/fyk nominais = quantil de 5%)
+_POSICOES = ('mx', 'my', 'mx_neg', 'my_neg')
+
+
+@dataclass(frozen=True)
+class Distribuicao:
+    tipo: str
+    media: float
+    desvio: float = 0.0
+    minimo: Optional[float] = None # Truncamento inferior (ex: cobrimento > 0)
+
+    def amostrar(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        if self.tipo == FIXO or self.desvio == 0.0:
+            x = np.full(n, self.media)
+        elif self.tipo == NORMAL:
+            x = rng.normal(self.media, self.desvio, n)
+        elif self.tipo == LOGNORMAL:
+            s2 = math.log(1.0 + (self.desvio / self.media) ** 2)
+            x = rng.lognormal(math.log(self.media) - s2 / 2.0, math.sqrt(s2), n)
+        elif self.tipo == GUMBEL:
+            escala = self.desvio * math.sqrt(6.0) / math.pi
+            x = rng.gumbel(self.media - _EULER * escala, escala, n)
+        else:
+            raise ValueError(f"Distribuição desconhecida: {self.tipo}")
+        return x if self.minimo is None else np.maximum(x, self.minimo)
+
+    @classmethod
+    def lognormal_caracteristica(cls, valor_k: float, cv: float) -> "Distribuicao":
+        """Lognormal com coeficiente de variação cv cujo quantil de 5% é valor_k."""
+        s = math.sqrt(math.log(1.0 + cv ** 2))
+        media = valor_k * math.exp(_Z_5 * s + s ** 2 / 2.0)
+        return cls(LOGNORMAL, media, cv * media)
+
+
+def variaveis_padrao(laje: Laje) -> Dict[str, Distribuicao]:
+    """Distribuições das variáveis de entrada a partir dos valores nominais (ver settings, seção 11)."""
+    c = laje.carregamento
+    g_nom = c.g_revestimento + c.g_paredes
+    return {
+        "fck": Distribuicao.lognormal_caracteristica(laje.materiais.fck, settings.CV_FCK),
+        "fyk": Distribuicao.lognormal_caracteristica(laje.materiais.fyk, settings.CV_FYK),
+        "g": Distribuicao(NORMAL, g_nom, settings.CV_PERMANENTE * g_nom, minimo=0.0),
+        "q": Distribuicao(GUMBEL, c.q_acidental, settings.CV_ACIDENTAL * c.q_acidental, minimo=0.0),
+        "h": Distribuicao(NORMAL, laje.h, settings.DESVIO_H, minimo=0.01),
+        "cobrimento": Distribuicao(NORMAL, laje.cobrimento, settings.DESVIO_COBRIMENTO, minimo=0.0),
+    }
+
+
+@dataclass
+class ResultadoVerificacao:
+    nome: str
+    falhas: int
+    amostras: int
+    pf: float
+    pf_ic: Tuple[float, float]
+    beta: float
+    beta_ic: Tuple[float, float]
+
+
+@dataclass
+class ResultadoConfiabilidade:
+    amostras: int
+    semente: Optional[int]
+    nivel: float
+    verificacoes: Dict[str, ResultadoVerificacao] = field(default_factory=dict)
+
+    def relatorio(self) -> str:
+        pct = f"{self.nivel * 100:.0f}%"
+        linhas = [f"--- Confiabilidade ({self.amostras} amostras, semente {self.semente}) ---",
+                  f"{'verificação':<16} {'falhas':>9} {'Pf':>10} {'Pf IC ' + pct:>23} {'β':>6} {'β IC ' + pct:>15}"]
+        for r in self.verificacoes.values():
+            linhas.append(f"{r.nome:<16} {r.falhas:>9} {r.pf:>10.2e} {r.pf_ic[0]:>11.2e}-{r.pf_ic[1]:<11.2e} "
+                          f"{r.beta:>6.2f} {r.beta_ic[0]:>7.2f}-{r.beta_ic[1]:<7.2f}")
+        return "\n".join(linhas)
+
+
+def intervalo_wilson(falhas: int, n: int, nivel: float = settings.CONFIABILIDADE_NIVEL) -> Tuple[float, float]:
+    """Intervalo de Wilson para a proporção (válido também com 0 falhas)."""
+    if n == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + nivel / 2.0)
+    p = falhas / n
+    den = 1.0 + z ** 2 / n
+    centro = (p + z ** 2 / (2 * n)) / den
+    meia = z * math.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / den
+    inferior = 0.0 if falhas == 0 else max(0.0, centro - meia)
+    superior = 1.0 if falhas == n else min(1.0, centro + meia)
+    return inferior, superior
+
+
+def indice_beta(pf: float) -> float:
+    """β = -Φ⁻¹(Pf) (±inf nos extremos)."""
+    if pf <= 0.0:
+        return math.inf
+    if pf >= 1.0:
+        return -math.inf
+    return -NormalDist().inv_cdf(pf)
+
+
+class AnaliseConfiabilidade:
+    def __init__(self, laje: Laje, variaveis: Optional[Dict[str, Distribuicao]] = None,
+                 combinacoes: Optional[ConjuntoCombinacoes] = None):
+        laje = como_laje(laje)
+        if not isinstance(laje, LajeMacica):
+            raise ValueError("Análise de confiabilidade disponível apenas para lajes maciças.")
+        self.laje = laje
+        self.variaveis = {**variaveis_padrao(laje), **(variaveis or {})}
+        self.combinacoes = combinacoes or combinations.padrao()
+
+        # Projeto nominal: armadura executada e coeficientes da geometria (não variam entre amostras)
+        engine = AnalyticEngine(self.combinacoes)
+        esforcos = engine.calcular_esforcos_elu(laje)
+        as_teorico = engine.dimensionar_armaduras(laje, esforcos)
+        self.armadura = {p: (v if isinstance(v, (int, float)) else 0.0) for p, v in as_teorico.items()}
+        self._coeficientes_geometria()
+
+    def _coeficientes_geometria(self):
+        """Momento e cortante por unidade de carga (kNm/m e kN/m por kN/m²), como no AnalyticEngine."""
+        laje, b = self.laje, self.laje.bordas
+        livres = sum(1 for v in b.values() if v == 'livre')
+        engastes = sum(1 for v in b.values() if v == 'engastado')
+        self.balanco = livres == 3 and engastes == 1
+        self.k_momento = dict.fromkeys(_POSICOES, 0.0)
+        if self.balanco:
+            em_x = b.get('esquerda') == 'engastado' or b.get('direita') == 'engastado'
+            self.l_ref = laje.lx if em_x else laje.ly
+            k_neg = self.l_ref ** 2 / 2.0
+            self.k_momento['mx_neg' if em_x else 'my_neg'] = k_neg
+            self.k_momento['my' if em_x else 'mx'] = 0.2 * k_neg
+            self.k_cortante = self.l_ref
+            self.limite_flecha = self.l_ref / 125.0
+        else:
+            coeffs = TableSolver.get_coefficients(TableSolver.identificar_caso(b), laje.ly / laje.lx)
+            self.l_ref = laje.lx
+            self.k_momento['mx'] = laje.lx ** 2 / coeffs['alpha_x']
+            self.k_momento['my'] = laje.lx ** 2 / coeffs['alpha_y']
+            self.k_cortante = max(coeffs['mu_x'], coeffs['mu_y']) * laje.lx
+            self.limite_flecha = laje.lx / 250.0
+
+    def amostrar(self, rng: np.random.Generator, n: int) -> Dict[str, np.ndarray]:
+        return {nome: dist.amostrar(rng, n) for nome, dist in self.variaveis.items()}
+
+    def falhas(self, x: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Máscaras de falha (True = falhou) por verificação para as amostras `x`."""
+        laje = self.laje
+        fck, fyk, h, c = x["fck"], x["fyk"], x["h"], x["cobrimento"]
+        g = x["g"] + h * settings.PESO_ESPECIFICO_CONCRETO_ARMADO
+        q = x["q"]
+        p_elu = g + q # Coeficientes parciais = 1
+        psi = {nome: comb.coef_q for nome, comb in zip(self.combinacoes.nomes, self.combinacoes.combinacoes)}
+        d = h - c - 0.005
+        d_cm = d * 100.0
+        fctm = 0.3 * fck ** (2.0 / 3.0)
+        saida = {}
+
+        # Flexão: M_R da seção retangular (bw = 1 m) com a armadura do projeto
+        for pos in _POSICOES:
+            k = self.k_momento[pos]
+            if k <= 0.0:
+                continue
+            as_cm2 = self.armadura.get(pos, 0.0)
+            ms = p_elu * k
+            if as_cm2 <= 0.0:
+                saida[f"flexao_{pos}"] = ms > 0.0
+                continue
+            forca = as_cm2 * fyk / 10.0 # kN
+            x_ln = forca / (0.68 * 100.0 * fck / 10.0)
+            mr = forca * (d_cm - 0.4 * x_ln) / 100.0 # kNm/m
+            saida[f"flexao_{pos}"] = ms > mr
+
+        # Cisalhamento sem armadura transversal (VRd1)
+        as_max = max([v for v in self.armadura.values()], default=0.0)
+        rho1 = np.minimum((as_max / 10000.0) / d, 0.02)
+        tau_rd = 0.25 * (0.7 * fctm) * 1000.0
+        v_rd1 = tau_rd * np.maximum(1.0, 1.6 - d) * (1.2 + 40.0 * rho1) * d
+        saida["cisalhamento"] = p_elu * self.k_cortante > v_rd1
+
+        # Flecha (Branson simplificado, como verificar_els)
+        p_els = g + psi[QUASE_PERMANENTE] * q
+        ecs = laje.materiais.Ecs * 1e6 * np.sqrt(fck / laje.materiais.fck) # Ecs ∝ √fck
+        ic = h ** 3 / 12.0
+        mr_fiss = 1.2 * (fctm * 1000.0) * ic / (h / 2.0)
+        if self.balanco:
+            ma = p_els * self.l_ref ** 2 / 2.0
+        else:
+            ma = p_els * laje.lx ** 2 / 8.0
+        razao = np.divide(mr_fiss, ma, out=np.full_like(ma, np.inf), where=ma > 0) ** 3
+        ieq = np.where(ma > mr_fiss, razao * ic + (1.0 - razao) * ic * 0.25, ic)
+        if self.balanco:
+            flecha = p_els * self.l_ref ** 4 / (8.0 * ecs * ieq)
+        else:
+            lam = laje.ly / laje.lx
+            flecha = (5.0 / 384.0) * p_els * laje.lx ** 4 / (ecs * ieq) * (lam ** 4 / (1.0 + lam ** 4))
+        saida["flecha"] = flecha * (1.0 + settings.ALFA_T_INFINITO) > self.limite_flecha
+
+        # Fissuração (combinação frequente)
+        p_freq = g + psi[FREQUENTE] * q
+        wk_max = np.zeros_like(p_freq)
+        for pos in _POSICOES:
+            k, as_cm2 = self.k_momento[pos], self.armadura.get(pos, 0.0)
+            if k <= 0.0 or as_cm2 <= 0.0:
+                continue
+            sig_mpa = (p_freq * k * 100.0) / (0.85 * d_cm * as_cm2) * 10.0
+            wk_max = np.maximum(wk_max, (10.0 / (12.5 * 2.25)) * (sig_mpa / 210000.0) * (3.0 * sig_mpa / fctm))
+        saida["fissuracao"] = wk_max > 0.3
+
+        saida["sistema"] = np.logical_or.reduce(list(saida.values()))
+        return saida
+
+    def executar(self, amostras: int = settings.CONFIABILIDADE_AMOSTRAS, semente: Optional[int] = 0,
+                 bloco: int = settings.CONFIABILIDADE_BLOCO,
+                 nivel: float = settings.CONFIABILIDADE_NIVEL) -> ResultadoConfiabilidade:
+        rng = np.random.default_rng(semente)
+        contagem: Dict[str, int] = {}
+        feitas = 0
+        while feitas < amostras:
+            n = min(bloco, amostras - feitas)
+            for nome, mascara in self.falhas(self.amostrar(rng, n)).items():
+                contagem[nome] = contagem.get(nome, 0) + int(np.count_nonzero(mascara))
+            feitas += n
+
+        resultado = ResultadoConfiabilidade(amostras, semente, nivel)
+        for nome, falhas in contagem.items():
+            pf = falhas / amostras
+            pf_ic = intervalo_wilson(falhas, amostras, nivel)
+            resultado.verificacoes[nome] = ResultadoVerificacao(
+                nome, falhas, amostras, pf, pf_ic, indice_beta(pf), (indice_beta(pf_ic[1]), indice_beta(pf_ic[0])))
+        return resultado
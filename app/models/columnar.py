@@ -0,0 +1,221 @@
+"""
+Codificação colunar (linhas de float64) para lajes e resultados de análise.
+
+Permite trafegar entradas e saídas do motor em arrays contíguos (memória
+compartilhada, arquivos binários) sem serializar objetos Python item a item.
+Os textos do DTO são reconstruídos a partir de códigos numéricos, de forma que
+`linha_para_resultado(resultado_para_linha(r))` reproduz `r` campo a campo.
+"""
+import math
+from typing import Any, Dict, List, Sequence
+
+from app.models.base import Laje
+from app.models.solid import LajeMacica
+from app.models.ribbed import LajeTrelicada
+from app.models.value_objects import ClasseAgressividade, AnalysisResult
+from app.models.flyweights import internar_materiais, internar_carregamento, CarregamentoLaje
+
+# ==============================================================================
+# 1. TABELAS DE CÓDIGOS
+# ==============================================================================
+
+BORDAS = ('esquerda', 'direita', 'topo', 'fundo')
+POSICOES = ('mx', 'my', 'mx_neg', 'my_neg')
+CHAVES_MOMENTOS = ('mx', 'my', 'mx_neg', 'my_neg', 'v_sd_x', 'v_sd_y', 'reacao_viga_x', 'reacao_viga_y')
+
+# Qualquer valor fora da tabela (ex: CondicaoContorno vindo da calculadora)
+# se comporta como apoiado no motor, por isso é codificado como tal.
+CODIGOS_BORDA = {"apoiado": 0, "engastado": 1, "livre": 2}
+NOMES_BORDA = ("apoiado", "engastado", "livre")
+
+TIPOS_LAJE = ("LajeMacica", "LajeTrelicada")
+STATUS_ELS = ("OK", "FALHA", "ERRO")
+STATUS_CORTANTE = ("OK", "FALHA")
+STATUS_GERAL = ("APROVADO", "REPROVADO")
+
+TEXTO_DUCTILIDADE = "REPROVADO (Ductilidade)"
+# Bitolas sentinela para textos de detalhamento que não são "Ø c/"
+PHI_MINIMA = 0.0
+PHI_MUITO_ARMADO = -1.0
+PHI_DISPENSA = -2.0
+
+# ==============================================================================
+# 2. LAJE <-> LINHA
+# ==============================================================================
+
+COLUNAS_LAJE = (
+    'tipo', 'lx', 'ly', 'h', 'caa',
+    'borda_esquerda', 'borda_direita', 'borda_topo', 'borda_fundo',
+    'fck', 'fyk', 'Ecs', 'gamma_c', 'gamma_s',
+    'g_revestimento', 'q_acidental', 'g_paredes',
+    'h_capa', 'largura_sapata', 'ench_altura_h_cm', 'ench_largura_b_cm',
+    'ench_comprimento_cm', 'ench_peso_unitario_kg'
+)
+N_COLUNAS_LAJE = len(COLUNAS_LAJE)
+
+
+def laje_suportada(laje: Laje) -> bool:
+    """Indica se a laje pode ser representada sem perda pela codificação colunar."""
+    return type(laje) in (LajeMacica, LajeTrelicada)
+
+
+def laje_para_linha(laje: Laje, linha: Any = None) -> Any:
+    """Escreve a laje em `linha` (qualquer sequência mutável de floats) e a retorna."""
+    if linha is None:
+        linha = [0.0] * N_COLUNAS_LAJE
+
+    mat, carga = laje.materiais, laje.carregamento
+    linha[0] = float(TIPOS_LAJE.index(type(laje).__name__))
+    linha[1], linha[2], linha[3] = laje.lx, laje.ly, laje.h
+    linha[4] = float(laje.caa.value)
+    for i, borda in enumerate(BORDAS):
+        linha[5 + i] = float(CODIGOS_BORDA.get(laje.bordas.get(borda), 0))
+    linha[9], linha[10], linha[11] = mat.fck, mat.fyk, mat.Ecs
+    linha[12], linha[13] = mat.gamma_c, mat.gamma_s
+    linha[14], linha[15], linha[16] = carga.g_revestimento, carga.q_acidental, carga.g_paredes
+
+    if isinstance(laje, LajeTrelicada):
+        ench = laje.enchimento
+        linha[17], linha[18] = laje.h_capa, laje.largura_sapata
+        linha[19], linha[20] = ench['altura_h_cm'], ench['largura_b_cm']
+        linha[21] = ench.get('comprimento_cm', 30.0)
+        linha[22] = ench['peso_unitario_kg']
+    else:
+        for i in range(17, N_COLUNAS_LAJE):
+            linha[i] = 0.0
+    return linha
+
+
+def linha_para_laje(linha: Sequence[float]) -> Laje:
+    """Reconstrói um objeto Laje a partir de uma linha codificada."""
+    comum = dict(
+        lx=float(linha[1]), ly=float(linha[2]),
+        materiais=internar_materiais(float(linha[9]), float(linha[10]), float(linha[11]),
+                                     float(linha[12]), float(linha[13])),
+        caa=ClasseAgressividade(int(linha[4])),
+        bordas={b: NOMES_BORDA[int(linha[5 + i])] for i, b in enumerate(BORDAS)},
+        carregamento=CarregamentoLaje(internar_carregamento(float(linha[14]), float(linha[15])),
+                                      g_paredes=float(linha[16]))
+    )
+    h = float(linha[3])
+
+    if TIPOS_LAJE[int(linha[0])] == "LajeMacica":
+        return LajeMacica(h=h, **comum)
+
+    enchimento = {
+        'altura_h_cm': float(linha[19]), 'largura_b_cm': float(linha[20]),
+        'comprimento_cm': float(linha[21]), 'peso_unitario_kg': float(linha[22])
+    }
+    laje = LajeTrelicada(h_capa=float(linha[17]), largura_sapata=float(linha[18]),
+                         dados_enchimento=enchimento, **comum)
+    # O otimizador pode ter alterado h independentemente da geometria do enchimento
+    laje._h = h
+    laje.calcular_altura_util()
+    return laje
+
+# ==============================================================================
+# 3. ANALYSISRESULT <-> LINHA
+# ==============================================================================
+
+COLUNAS_RESULTADO = (
+    ('tipo_laje', 'lx', 'ly', 'h_cm', 'd_cm', 'peso_proprio', 'carga_total_distribuida')
+    + tuple(f'momentos_kNm.{k}' for k in CHAVES_MOMENTOS)
+    + tuple(f'as_teorico.{p}' for p in POSICOES)
+    + ('cortante.v_sd', 'cortante.v_rd1', 'cortante.ratio', 'cortante.status', 'cortante.bw')
+    + tuple(f'detalhamento.{p}.bitola' for p in POSICOES)
+    + tuple(f'detalhamento.{p}.espacamento' for p in POSICOES)
+    + ('volume_concreto', 'peso_aco_estimado', 'taxa_aco_m2', 'consumo_concreto_m2',
+       'cobrimento_mm', 'flecha_total_mm', 'flecha_limite_mm', 'contraflecha_mm',
+       'wk_max_mm', 'status_servico', 'status_geral')
+)
+N_COLUNAS_RESULTADO = len(COLUNAS_RESULTADO)
+
+_ESCALARES_FINAIS = ('volume_concreto', 'peso_aco_estimado', 'taxa_aco_m2', 'consumo_concreto_m2',
+                     'cobrimento_mm', 'flecha_total_mm', 'flecha_limite_mm', 'contraflecha_mm',
+                     'wk_max_mm')
+
+
+def _codificar_detalhe(texto: str):
+    if texto == "Mínima": return PHI_MINIMA, 0.0
+    if texto == "Erro: Muito Armado": return PHI_MUITO_ARMADO, 0.0
+    if texto == "Dispensa": return PHI_DISPENSA, 0.0
+    # Formato do SteelDetailer: "Ø{phi} c/{s:g}"
+    phi, s = texto[1:].split(" c/")
+    return float(phi), float(s)
+
+
+def _decodificar_detalhe(phi: float, s: float) -> str:
+    if phi == PHI_MINIMA: return "Mínima"
+    if phi == PHI_MUITO_ARMADO: return "Erro: Muito Armado"
+    if phi == PHI_DISPENSA: return "Dispensa"
+    return f"Ø{phi} c/{s:g}"
+
+
+def resultado_para_linha(res: AnalysisResult, linha: Any = None) -> Any:
+    """Escreve o resultado em `linha` (sequência mutável de floats) e a retorna."""
+    if linha is None:
+        linha = [0.0] * N_COLUNAS_RESULTADO
+
+    valores: List[float] = [
+        float(TIPOS_LAJE.index(res.tipo_laje)), res.lx, res.ly, res.h_cm, res.d_cm,
+        res.peso_proprio, res.carga_total_distribuida
+    ]
+    valores.extend(res.momentos_kNm.get(k, 0.0) for k in CHAVES_MOMENTOS)
+    for p in POSICOES:
+        v = res.as_teorico.get(p, 0.0)
+        valores.append(v if isinstance(v, (int, float)) else math.nan)
+
+    c = res.cortante
+    bw = float(c.get('detalhes', 'bw=1.00m')[3:-1])
+    valores.extend([c['v_sd'], c['v_rd1'], c['ratio'], float(STATUS_CORTANTE.index(c['status'])), bw])
+
+    detalhes = [_codificar_detalhe(res.detalhamento.get(p, "Mínima")) for p in POSICOES]
+    valores.extend(d[0] for d in detalhes)
+    valores.extend(d[1] for d in detalhes)
+
+    valores.extend(getattr(res, nome) for nome in _ESCALARES_FINAIS)
+    valores.append(float(STATUS_ELS.index(res.status_servico)))
+    valores.append(float(STATUS_GERAL.index(res.status_geral)))
+
+    for i, v in enumerate(valores):
+        linha[i] = v
+    return linha
+
+
+def linha_para_resultado(linha: Sequence[float]) -> AnalysisResult:
+    """Reconstrói o AnalysisResult (com dicionários e textos) a partir de uma linha."""
+    v = [float(x) for x in linha]
+
+    momentos = {k: v[7 + i] for i, k in enumerate(CHAVES_MOMENTOS)}
+    as_teorico: Dict[str, Any] = {}
+    for i, p in enumerate(POSICOES):
+        as_teorico[p] = TEXTO_DUCTILIDADE if math.isnan(v[15 + i]) else v[15 + i]
+
+    v_rd1 = v[20]
+    cortante = {
+        "v_sd": v[19], "v_rd1": v_rd1,
+        # O motor retorna o inteiro 0 quando V_Rd1 não é positivo
+        "ratio": v[21] if v_rd1 > 0 else 0,
+        "status": STATUS_CORTANTE[int(v[22])],
+        "detalhes": f"bw={v[23]:.2f}m"
+    }
+    detalhamento = {p: _decodificar_detalhe(v[24 + i], v[28 + i]) for i, p in enumerate(POSICOES)}
+    reacoes = {
+        "Esquerda": momentos['reacao_viga_y'], "Direita": momentos['reacao_viga_y'],
+        "Topo": momentos['reacao_viga_x'], "Fundo": momentos['reacao_viga_x']
+    }
+    finais = dict(zip(_ESCALARES_FINAIS, v[32:41]))
+
+    return AnalysisResult(
+        tipo_laje=TIPOS_LAJE[int(v[0])],
+        lx=v[1], ly=v[2], h_cm=v[3], d_cm=v[4],
+        peso_proprio=v[5], carga_total_distribuida=v[6],
+        momentos_kNm=momentos,
+        as_teorico=as_teorico,
+        cortante=cortante,
+        detalhamento=detalhamento,
+        reacoes_apoio=reacoes,
+        status_servico=STATUS_ELS[int(v[41])],
+        status_geral=STATUS_GERAL[int(v[42])],
+        **finais
+    )
@@ -1,13 +1,33 @@
 from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 import math
 import json
+
+import numpy as np
+
 from app.models.base import Laje
 from app.models.value_objects import CondicaoContorno, CargaLinear
+from app.models.slab_table import SlabTable, WallTable, BORDAS, CODIGOS_BORDA, SEM_VINCULO_MANUAL
+from app.models import columnar
+from app.services.tracing import rastrear, trecho
+from app.services import metrics
 
 # Imports para cálculo em lote
 from app.engines.analytic import AnalyticEngine
-from app.controllers.slab_controller import SlabController
+from app.engines.batch import BatchExecutor
+from app.engines import pattern_loading
+from app.engines.combinations import ConjuntoCombinacoes
+from config import settings
+
+_ESQ, _DIR, _TOPO, _FUNDO = (BORDAS.index(b) for b in ('esquerda', 'direita', 'topo', 'fundo'))
+_ENGASTADO = CODIGOS_BORDA["engastado"]
+_LIVRE = CODIGOS_BORDA["livre"]
+
+_LAJES = metrics.contador("pylaje_lajes_processadas_total", "Lajes processadas por etapa do pavimento", rotulos=("etapa",))
+_LAJES_VINCULOS = _LAJES.com(etapa="vinculos")
+_LAJES_PAREDES = _LAJES.com(etapa="paredes")
+_PAREDES = metrics.contador("pylaje_paredes_processadas_total", "Paredes distribuídas sobre as lajes")
+_LAJES_PAVIMENTO = metrics.medidor("pylaje_pavimento_lajes", "Lajes no último pavimento analisado")
 
 @dataclass
 class LajePosicionada:
@@ -34,21 +54,170 @@ class LajePosicionada:
     @property
     def y_fim(self): return self.y + self.laje.ly
 
+
+def _pares_proximos(fim: np.ndarray, inicio: np.ndarray, tol: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Retorna os pares (i, j), i != j, com |fim[i] - inicio[j]| < tol.
+    Usa ordenação + busca binária em vez de comparar todos contra todos.
+    """
+    ordem = np.argsort(inicio, kind='stable')
+    ordenado = inicio[ordem]
+    # Janela com folga; o critério exato é reaplicado abaixo
+    lo = np.searchsorted(ordenado, fim - 2 * tol, side='left')
+    hi = np.searchsorted(ordenado, fim + 2 * tol, side='right')
+    cont = hi - lo
+    i = np.repeat(np.arange(fim.size), cont)
+    desloc = np.arange(cont.sum()) - np.repeat(np.cumsum(cont) - cont, cont)
+    j = ordem[np.repeat(lo, cont) + desloc]
+    ok = (i != j) & (np.abs(fim[i] - inicio[j]) < tol)
+    return i[ok], j[ok]
+
+
+def _intersecoes_paredes(paredes: WallTable, lajes: SlabTable) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Comprimento de cada parede dentro de cada laje (clipping Liang-Barsky vetorizado).
+    Retorna (idx_parede, idx_laje, comprimento) apenas para pares com interseção,
+    ordenados por parede.
+    """
+    vazio = (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0))
+    if paredes.n == 0 or lajes.n == 0:
+        return vazio
+
+    x1, y1, x2, y2 = paredes.x_inicio, paredes.y_inicio, paredes.x_fim, paredes.y_fim
+    xmin_l, ymin_l = lajes.x, lajes.y
+    xmax_l, ymax_l = lajes.x_fim, lajes.y_fim
+
+    # 1. Candidatas: lajes cuja origem X cai na faixa [min(x) - maior_vão, max(x)] da parede
+    ordem = np.argsort(xmin_l, kind='stable')
+    ordenado = xmin_l[ordem]
+    folga = float(lajes.lx.max()) + 0.02
+    lo = np.searchsorted(ordenado, np.minimum(x1, x2) - folga, side='left')
+    hi = np.searchsorted(ordenado, np.maximum(x1, x2), side='right')
+    cont = hi - lo
+    ip = np.repeat(np.arange(paredes.n), cont)
+    desloc = np.arange(cont.sum()) - np.repeat(np.cumsum(cont) - cont, cont)
+    il = ordem[np.repeat(lo, cont) + desloc]
+
+    # 2. Rejeição por bounding box (mesmo critério do algoritmo escalar)
+    px1, py1, px2, py2 = x1[ip], y1[ip], x2[ip], y2[ip]
+    xmin, xmax, ymin, ymax = xmin_l[il], xmax_l[il], ymin_l[il], ymax_l[il]
+    dentro = ~((np.maximum(px1, px2) < xmin) | (np.minimum(px1, px2) > xmax) |
+               (np.maximum(py1, py2) < ymin) | (np.minimum(py1, py2) > ymax))
+    ip, il = ip[dentro], il[dentro]
+    px1, py1, px2, py2 = px1[dentro], py1[dentro], px2[dentro], py2[dentro]
+    xmin, xmax, ymin, ymax = xmin[dentro], xmax[dentro], ymin[dentro], ymax[dentro]
+
+    # 3. Liang-Barsky: t0 = max dos t de entrada, t1 = min dos t de saída
+    dx, dy = px2 - px1, py2 - py1
+    t0 = np.zeros(ip.size)
+    t1 = np.ones(ip.size)
+    fora = np.zeros(ip.size, dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for p, q in ((-dx, px1 - xmin), (dx, xmax - px1), (-dy, py1 - ymin), (dy, ymax - py1)):
+            fora |= (p == 0) & (q < 0)  # Paralela e fora
+            t = q / p
+            t0 = np.where(p < 0, np.maximum(t0, t), t0)
+            t1 = np.where(p > 0, np.minimum(t1, t), t1)
+
+    valido = ~fora & (t0 < t1)
+    dt = (t1[valido] - t0[valido]).tolist()
+    # Comprimento do segmento clipado. Calculado com math (só nos pares válidos)
+    # para reproduzir bit a bit o resultado do x**2 escalar do Python.
+    comp = np.array([math.sqrt((a * d) ** 2 + (b * d) ** 2)
+                     for a, b, d in zip(dx[valido].tolist(), dy[valido].tolist(), dt)], dtype=np.float64)
+    return ip[valido], il[valido], comp
+
+
 class GerenciadorPavimento:
+    """
+    Pavimento: lajes e paredes em armazenamento colunar (SlabTable/WallTable).
+    `lajes` e `paredes` continuam disponíveis como listas de objetos (vistas),
+    reconstruídas apenas quando a tabela muda.
+    """
     def __init__(self):
-        self.lajes: List[LajePosicionada] = []
-        self.paredes: List[CargaLinear] = []
+        self.tabela = SlabTable()
+        self.tabela_paredes = WallTable()
+        self._vista_lajes: List[LajePosicionada] = []
+        self._vista_lajes_versao = -1
+        self._vista_paredes: List[CargaLinear] = []
+        self._vista_paredes_versao = -1
+
+    # --- Vistas orientadas a objeto (GUI / SlabController) ---
+
+    @property
+    def lajes(self) -> List[LajePosicionada]:
+        """
+        Cópias somente leitura das lajes, refeitas quando a tabela muda. Alterar
+        estes objetos não altera o pavimento: edições passam por SlabTable
+        (ou SlabTableModel, na interface).
+        """
+        t = self.tabela
+        if self._vista_lajes_versao != t.versao:
+            xs, ys = t.x.tolist(), t.y.tolist()
+            self._vista_lajes = [
+                LajePosicionada(
+                    t.ids[i], t.criar_laje(i), xs[i], ys[i],
+                    vigas=dict(zip(BORDAS, t.vigas[i])),
+                    dim_vigas=t.dim_vigas[i],
+                    vinculos_manuais=t.vinculos_manuais_dict(i)
+                )
+                for i in range(t.n)
+            ]
+            self._vista_lajes_versao = t.versao
+        return self._vista_lajes
+
+    @property
+    def paredes(self) -> List[CargaLinear]:
+        """Cópias somente leitura das paredes; edições passam por WallTable (ou WallTableModel)."""
+        t = self.tabela_paredes
+        if self._vista_paredes_versao != t.versao:
+            self._vista_paredes = [t.criar_parede(i) for i in range(t.n)]
+            self._vista_paredes_versao = t.versao
+        return self._vista_paredes
+
+    # --- Edição ---
 
     def limpar(self):
-        self.lajes = []
-        self.paredes = []
+        self.tabela.limpar()
+        self.tabela_paredes.limpar()
 
     def adicionar_laje(self, laje_pos: LajePosicionada):
-        self.lajes.append(laje_pos)
+        self._inserir(laje_pos)
+        self.recalcular_vinculos()
+
+    @rastrear("construcao_pavimento")
+    def adicionar_lajes(self, lajes_pos: List[LajePosicionada]):
+        """Inclusão em bloco: recalcula os vínculos uma única vez ao final."""
+        for laje_pos in lajes_pos:
+            self._inserir(laje_pos)
         self.recalcular_vinculos()
 
+    def _inserir(self, laje_pos: LajePosicionada):
+        self.tabela.adicionar(laje_pos.id, laje_pos.laje, laje_pos.x, laje_pos.y,
+                              vigas=laje_pos.vigas, dim_vigas=laje_pos.dim_vigas,
+                              vinculos_manuais=laje_pos.vinculos_manuais)
+
     def adicionar_parede(self, parede: CargaLinear):
-        self.paredes.append(parede)
+        self.tabela_paredes.adicionar(parede)
+
+    # --- Edição incremental (editor ao vivo) ---
+    # Não recalculam vínculos/cargas: o chamador agrupa várias alterações e
+    # chama recalcular_vinculos() / distribuir_cargas_paredes() uma vez ao final.
+
+    def substituir_laje(self, idx: int, laje_pos: LajePosicionada):
+        self.tabela.substituir(idx, laje_pos.id, laje_pos.laje, laje_pos.x, laje_pos.y,
+                               vigas=laje_pos.vigas, dim_vigas=laje_pos.dim_vigas,
+                               vinculos_manuais=laje_pos.vinculos_manuais)
+
+    def substituir_parede(self, idx: int, parede: CargaLinear):
+        self.tabela_paredes.substituir(idx, parede)
+
+    def copiar(self) -> "GerenciadorPavimento":
+        """Snapshot independente (ex: exportação em segundo plano enquanto o usuário edita)."""
+        novo = GerenciadorPavimento()
+        novo.tabela = self.tabela.copiar()
+        novo.tabela_paredes = self.tabela_paredes.copiar()
+        return novo
 
     def definir_vinculo_manual(self, laje_id: str, borda: str, tipo: str):
         """
@@ -56,12 +225,33 @@ class GerenciadorPavimento:
         borda: 'esquerda', 'direita', 'topo', 'fundo'
         tipo: 'apoiado', 'engastado', 'livre'
         """
-        for l in self.lajes:
-            if l.id == laje_id:
-                l.vinculos_manuais[borda] = tipo
-                self.recalcular_vinculos() # Atualiza todo o sistema
-                return
+        idx = self.tabela.indice(laje_id)
+        if idx < 0: return
+        vinculos = self.tabela.vinculos_manuais_dict(idx)
+        vinculos[borda] = tipo
+        self.tabela.definir_vinculos_manuais(idx, vinculos)
+        self.recalcular_vinculos() # Atualiza todo o sistema
+
+    def pares_continuidade(self, tol: float = 0.02):
+        """
+        Pares de lajes vizinhas com trecho comum maior que 10cm.
+        Retorna ((i, j) com j à DIREITA de i, (i, j) com j ACIMA de i).
+        """
+        t = self.tabela
+        x, y, x_fim, y_fim = t.x, t.y, t.x_fim, t.y_fim
+
+        # CASO 1: L2 está à DIREITA de L1
+        i, j = _pares_proximos(x_fim, x, tol)
+        comum = np.minimum(y_fim[i], y_fim[j]) - np.maximum(y[i], y[j])
+        horiz = (i[comum > 0.10], j[comum > 0.10])
 
+        # CASO 2: L2 está ACIMA de L1
+        i, j = _pares_proximos(y_fim, y, tol)
+        comum = np.minimum(x_fim[i], x_fim[j]) - np.maximum(x[i], x[j])
+        vert = (i[comum > 0.10], j[comum > 0.10])
+        return horiz, vert
+
+    @rastrear()
     def recalcular_vinculos(self):
         """
         Algoritmo Híbrido:
@@ -69,135 +259,141 @@ class GerenciadorPavimento:
         2. Detecta continuidade geométrica (Automático).
         3. Aplica restrições manuais do usuário (Manual Overrides).
         """
-        # 1. Resetar todas bordas para APOIADO
-        for item in self.lajes:
-            item.laje.bordas = {
-                'esquerda': "apoiado", 'direita': "apoiado",
-                'topo': "apoiado", 'fundo': "apoiado"
-            }
+        t = self.tabela
+        if t.n == 0: return
+        _LAJES_VINCULOS.inc(t.n)
 
-        tol = 0.02 # Tolerância de 2cm
+        # 1. Resetar todas bordas para APOIADO
+        bordas = np.zeros((t.n, 4), dtype=np.int8)
 
         # 2. Detecção Automática de Continuidade (Lajes Vizinhas)
-        for i, l1 in enumerate(self.lajes):
-            for j, l2 in enumerate(self.lajes):
-                if i == j: continue
-
-                # CASO 1: L2 está à DIREITA de L1
-                if abs(l1.x_fim - l2.x) < tol:
-                    y_start = max(l1.y, l2.y)
-                    y_end = min(l1.y_fim, l2.y_fim)
-                    if (y_end - y_start) > 0.10: 
-                        l1.laje.bordas['direita'] = "engastado"
-                        l2.laje.bordas['esquerda'] = "engastado"
-
-                # CASO 2: L2 está ACIMA de L1
-                if abs(l1.y_fim - l2.y) < tol:
-                    x_start = max(l1.x, l2.x)
-                    x_end = min(l1.x_fim, l2.x_fim)
-                    if (x_end - x_start) > 0.10:
-                        l1.laje.bordas['topo'] = "engastado"
-                        l2.laje.bordas['fundo'] = "engastado"
+        (hi, hj), (vi, vj) = self.pares_continuidade()
+        bordas[hi, _DIR] = _ENGASTADO
+        bordas[hj, _ESQ] = _ENGASTADO
+        bordas[vi, _TOPO] = _ENGASTADO
+        bordas[vj, _FUNDO] = _ENGASTADO
 
         # 3. Aplicação de Vínculos Manuais (Soberania do Usuário)
-        for item in self.lajes:
-            for borda, tipo_manual in item.vinculos_manuais.items():
-                if tipo_manual: # Se não for string vazia
-                    item.laje.bordas[borda] = tipo_manual
+        manuais = t.vinculos_manuais
+        mascara = manuais != SEM_VINCULO_MANUAL
+        bordas[mascara] = manuais[mascara]
 
-    def _calcular_comprimento_intersecao(self, parede: CargaLinear, laje: LajePosicionada) -> float:
-        """
-        Calcula quanto da parede está dentro da laje usando algoritmo de Cohen-Sutherland ou Clipping simples.
-        """
-        # Limites da laje (Retângulo)
-        xmin, xmax = laje.x, laje.x_fim
-        ymin, ymax = laje.y, laje.y_fim
-        
-        p1 = (parede.x_inicio, parede.y_inicio)
-        p2 = (parede.x_fim, parede.y_fim)
-
-        # Verifica se a linha está totalmente fora (bounding box check)
-        if max(p1[0], p2[0]) < xmin or min(p1[0], p2[0]) > xmax: return 0.0
-        if max(p1[1], p2[1]) < ymin or min(p1[1], p2[1]) > ymax: return 0.0
-
-        # Algoritmo de Clipping Liang-Barsky (Simplificado para segmento)
-        t0, t1 = 0.0, 1.0
-        dx = p2[0] - p1[0]
-        dy = p2[1] - p1[1]
-        
-        pq = [(-dx, p1[0] - xmin), (dx, xmax - p1[0]), 
-              (-dy, p1[1] - ymin), (dy, ymax - p1[1])]
-        
-        for p, q in pq:
-            if p == 0:
-                if q < 0: return 0.0 # Paralela e fora
-            else:
-                t = q / p
-                if p < 0:
-                    if t > t1: return 0.0
-                    if t > t0: t0 = t
-                else:
-                    if t < t0: return 0.0
-                    if t < t1: t1 = t
-        
-        if t0 < t1:
-            # Comprimento do segmento clipado
-            clip_len = math.sqrt((dx*(t1-t0))**2 + (dy*(t1-t0))**2)
-            return clip_len
-            
-        return 0.0
+        # Só conta como alteração se algo mudou (não invalida resultados nem blocos já gravados)
+        if not np.array_equal(t.bordas, bordas):
+            t.bordas[:] = bordas
+            t.marcar_alteracao()
 
+    @rastrear()
     def distribuir_cargas_paredes(self):
         """Distribui as cargas lineares como carga de área nas lajes afetadas."""
-        # Resetar cargas de parede
-        for item in self.lajes:
-            item.laje.carregamento.g_paredes = 0.0
-
-        for parede in self.paredes:
-            for item in self.lajes:
-                comp = self._calcular_comprimento_intersecao(parede, item)
-                if comp > 0.01: # Se tiver mais de 1cm dentro da laje
-                    peso_total = comp * parede.carga_kn_m # kN
-                    area = item.laje.lx * item.laje.ly
-                    q_eq = peso_total / area # kN/m²
-                    
-                    # Acumula na laje
-                    item.laje.carregamento.g_paredes += q_eq
+        t = self.tabela
+        _LAJES_PAREDES.inc(t.n)
+        _PAREDES.inc(self.tabela_paredes.n)
+        ip, il, comp = _intersecoes_paredes(self.tabela_paredes, t)
+
+        # Se tiver mais de 1cm dentro da laje
+        sel = comp > 0.01
+        ip, il, comp = ip[sel], il[sel], comp[sel]
+        peso_total = comp * self.tabela_paredes.carga_kn_m[ip] # kN
+        area = t.lx[il] * t.ly[il]
+        q_eq = peso_total / area # kN/m²
+
+        # Acumula na laje (bincount soma na ordem das paredes, como o laço original)
+        g_paredes = np.bincount(il, weights=q_eq, minlength=t.n)
+        if not np.array_equal(t.g_paredes, g_paredes):
+            t.g_paredes[:] = g_paredes
+            t.marcar_alteracao()
 
-    def calcular_e_exportar_vigas(self, filepath: str):
+    @rastrear()
+    def analisar(self, progresso: Optional[Callable[[int, int], None]] = None,
+                 alternancia: Optional[bool] = None) -> np.ndarray:
+        """
+        Distribui as paredes e analisa todas as lajes. Retorna a matriz de
+        resultados (n x columnar.COLUNAS_RESULTADO), na ordem da tabela.
+        `alternancia` (padrão: settings.ALTERNANCIA_CARGA_ACIDENTAL): dimensiona os
+        momentos positivos pela envoltória da carga acidental alternada.
+        """
+        if alternancia is None:
+            alternancia = settings.ALTERNANCIA_CARGA_ACIDENTAL
+        self.distribuir_cargas_paredes()
+        _LAJES_PAVIMENTO.definir(self.tabela.n)
+        entrada = self.tabela.matriz_entrada()
+        # Análise em lote direto das colunas (pool de memória compartilhada em pavimentos grandes)
+        saida = BatchExecutor(engine_factory=AnalyticEngine).analisar_colunas(entrada, progresso)
+        if alternancia:
+            env = pattern_loading.envoltoria(entrada, self.pares_continuidade())
+            pattern_loading.aplicar_envoltoria(entrada, saida, env)
+        return saida
+
+    @rastrear()
+    def envoltoria_alternancia(self, combinacoes: Optional[ConjuntoCombinacoes] = None
+                               ) -> pattern_loading.EnvoltoriaAlternancia:
+        """
+        Modo de alternância da carga acidental: envoltória dos momentos positivos
+        de cada laje sobre todos os arranjos de q (por superposição, ver
+        app.engines.pattern_loading), para cada combinação de ações. A coluna
+        "tudo carregado" coincide com os momentos de analisar().
+        """
+        self.distribuir_cargas_paredes()
+        return pattern_loading.envoltoria(self.tabela.matriz_entrada(), self.pares_continuidade(), combinacoes)
+
+    @rastrear()
+    def calcular_e_exportar_vigas(self, filepath: str, progresso: Optional[Callable[[int, int], None]] = None):
         """
         Calcula todas as lajes, agrupa as reações e determina coordenadas das Vigas.
         Gera um JSON consolidado para o software de pórtico/vigas.
+        `progresso(concluidas, total)` é repassado à análise em lote (ver BatchExecutor).
         """
-        # 1. Preparação
-        self.distribuir_cargas_paredes()
-        engine = AnalyticEngine()
+        # 1. Preparação e análise
+        saida = self.analisar(progresso)
+        final_export = self._agregar_vigas(saida)
+
+        # 4. Escrita
+        try:
+            with trecho("gravacao"):
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(final_export, f, indent=4, ensure_ascii=False)
+            return True, f"Exportado com sucesso: {len(final_export)} vigas processadas."
+        except Exception as e:
+            return False, str(e)
+
+    @rastrear("agregacao_vigas")
+    def _agregar_vigas(self, saida: np.ndarray) -> Dict[str, dict]:
+        """Agrupa as reações das lajes por viga e converte as cargas para coordenadas da viga."""
+        t = self.tabela
+        col = {nome: saida[:, k].tolist() for k, nome in enumerate(columnar.COLUNAS_RESULTADO)}
+        reacao_x, reacao_y = col['momentos_kNm.reacao_viga_x'], col['momentos_kNm.reacao_viga_y']
+        m_neg_por_chave = {'mx_neg': col['momentos_kNm.mx_neg'], 'my_neg': col['momentos_kNm.my_neg']}
+        q_total = col['carga_total_distribuida']
+
+        xs, ys, lxs, lys = t.x.tolist(), t.y.tolist(), t.lx.tolist(), t.ly.tolist()
+        bordas = t.bordas.tolist()
         
         # Estrutura temporária: vigas_data[nome] = { geometria, cargas_raw: [] }
         # cargas_raw guardará os dados brutos + coordenadas globais do trecho
         vigas_data = {}
 
         # 2. Coleta de Cargas e Geometria Global
-        for item in self.lajes:
-            controller = SlabController(item.laje, engine)
-            result = controller.run_analysis()
-            
+        for i in range(t.n):
+            x, y, lx, ly = xs[i], ys[i], lxs[i], lys[i]
+            x_fim, y_fim = x + lx, y + ly
+
             mapa = {
-                'esquerda': {'nome': 'Esquerda', 'p1': (item.x, item.y), 'p2': (item.x, item.y_fim), 'k_m': 'mx_neg'},
-                'direita':  {'nome': 'Direita',  'p1': (item.x_fim, item.y), 'p2': (item.x_fim, item.y_fim), 'k_m': 'mx_neg'},
-                'topo':     {'nome': 'Topo',     'p1': (item.x, item.y_fim), 'p2': (item.x_fim, item.y_fim), 'k_m': 'my_neg'},
-                'fundo':    {'nome': 'Fundo',    'p1': (item.x, item.y), 'p2': (item.x_fim, item.y), 'k_m': 'my_neg'}
+                'esquerda': {'p1': (x, y), 'p2': (x, y_fim), 'k_m': 'mx_neg', 'reac': reacao_y},
+                'direita':  {'p1': (x_fim, y), 'p2': (x_fim, y_fim), 'k_m': 'mx_neg', 'reac': reacao_y},
+                'topo':     {'p1': (x, y_fim), 'p2': (x_fim, y_fim), 'k_m': 'my_neg', 'reac': reacao_x},
+                'fundo':    {'p1': (x, y), 'p2': (x_fim, y), 'k_m': 'my_neg', 'reac': reacao_x}
             }
 
-            for b_model, b_data in mapa.items():
-                nome_viga = item.vigas.get(b_model, "").strip()
+            for k, (b_model, b_data) in enumerate(mapa.items()):
+                nome_viga = t.vigas[i][k].strip()
                 # Se borda livre, não exporta carga para viga (pois não há viga)
-                if not nome_viga or item.laje.bordas.get(b_model) == "livre": continue
+                if not nome_viga or bordas[i][k] == _LIVRE: continue
 
                 if nome_viga not in vigas_data:
                     vigas_data[nome_viga] = {
                         "id": nome_viga, 
-                        "geometria_estimada": item.dim_vigas,
+                        "geometria_estimada": t.dim_vigas[i],
                         "cargas_raw": [], 
                         "coords_globais": [] # Lista de todos os pontos (p1, p2) encontrados
                     }
@@ -205,33 +401,30 @@ class GerenciadorPavimento:
                 # Guarda pontos para bounding box
                 vigas_data[nome_viga]["coords_globais"].extend([b_data['p1'], b_data['p2']])
                 
-                # Dados básicos da carga
-                comp_atuacao = item.laje.ly if b_model in ['esquerda', 'direita'] else item.laje.lx
-                
                 # Carga Vertical
-                reac = result.reacoes_apoio.get(b_data['nome'], 0.0)
+                reac = b_data['reac'][i]
                 if reac > 0:
                     vigas_data[nome_viga]["cargas_raw"].append({
                         "tipo": "vertical",
                         "valor": round(reac, 2),
-                        "origem": item.id,
+                        "origem": t.ids[i],
                         # Guarda as coordenadas GLOBAIS deste trecho de carga
                         "p_inicio": b_data['p1'],
                         "p_fim": b_data['p2']
                     })
                 
                 # Torção (Se engastado)
-                if item.laje.bordas.get(b_model) == "engastado":
-                    m_neg = result.momentos_kNm.get(b_data['k_m'], 0.0)
+                if bordas[i][k] == _ENGASTADO:
+                    m_neg = m_neg_por_chave[b_data['k_m']][i]
                     if m_neg == 0: 
-                        q = result.carga_total_distribuida
-                        l = (item.laje.lx**2) if b_model in ['esquerda', 'direita'] else (item.laje.ly**2)
+                        q = q_total[i]
+                        l = (lx**2) if b_model in ['esquerda', 'direita'] else (ly**2)
                         m_neg = (q * l) / 12.0
                     
                     vigas_data[nome_viga]["cargas_raw"].append({
                         "tipo": "torsor",
                         "valor": round(m_neg, 2),
-                        "origem": item.id,
+                        "origem": t.ids[i],
                         "p_inicio": b_data['p1'],
                         "p_fim": b_data['p2']
                     })
@@ -305,11 +498,4 @@ class GerenciadorPavimento:
                 },
                 "cargas_distribuidas": cargas_processadas
             }
-
-        # 4. Escrita
-        try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(final_export, f, indent=4, ensure_ascii=False)
-            return True, f"Exportado com sucesso: {len(final_export)} vigas processadas."
-        except Exception as e:
-            return False, str(e)
\ No newline at end of file
+        return final_export
\ No newline at end of file
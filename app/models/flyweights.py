@@ -0,0 +1,137 @@
+"""
+Flyweights: especificações imutáveis compartilhadas entre lajes.
+
+Num pavimento grande quase todas as lajes usam o mesmo concreto, o mesmo aço,
+o mesmo modelo de enchimento e poucas combinações de carga de revestimento e
+acidental. Em vez de um objeto por laje, cada combinação distinta é criada uma
+única vez e reutilizada (comparação por identidade e hash baratos).
+
+O estado que varia por laje (g_paredes, acumulado pela distribuição de paredes)
+fica fora dos objetos compartilhados: na coluna g_paredes da SlabTable e, nas
+vistas, em CarregamentoLaje.
+
+As tabelas de internação crescem com cada combinação nova; limpar() as esvazia
+quando o pavimento/projeto em uso é substituído (os objetos já distribuídos
+continuam válidos, só deixam de ser reaproveitados).
+"""
+from typing import Any, Dict, Mapping, Tuple
+
+from app.models.value_objects import MateriaisSpec, CarregamentoSpec
+from config import settings
+
+_materiais: Dict[Tuple[float, ...], MateriaisSpec] = {}
+_carregamentos: Dict[Tuple[float, float], CarregamentoSpec] = {}
+_enchimentos: Dict[Tuple[Tuple[str, str], ...], "RegistroEnchimento"] = {}
+
+
+def internar_materiais(fck: float, fyk: float, Ecs: float,
+                       gamma_c: float = settings.GAMMA_C, gamma_s: float = settings.GAMMA_S) -> MateriaisSpec:
+    """Retorna a instância única de MateriaisSpec para os parâmetros informados."""
+    chave = (fck, fyk, Ecs, gamma_c, gamma_s)
+    spec = _materiais.get(chave)
+    if spec is None:
+        spec = _materiais.setdefault(chave, MateriaisSpec(*chave))
+    return spec
+
+
+def internar_materiais_de(mat: Any) -> MateriaisSpec:
+    """Versão que aceita Materiais/MateriaisSpec (ou qualquer objeto com os mesmos atributos)."""
+    return internar_materiais(mat.fck, mat.fyk, mat.Ecs, mat.gamma_c, mat.gamma_s)
+
+
+def internar_carregamento(g_revestimento: float, q_acidental: float) -> CarregamentoSpec:
+    """Parcela compartilhável do carregamento (sem g_paredes, que é por laje)."""
+    chave = (g_revestimento, q_acidental)
+    spec = _carregamentos.get(chave)
+    if spec is None:
+        spec = _carregamentos.setdefault(chave, CarregamentoSpec(g_revestimento, q_acidental))
+    return spec
+
+
+class RegistroEnchimento(dict):
+    """
+    Registro de enchimento do catálogo, somente leitura. É um dict (json.dump,
+    dict(...) e comparação funcionam como antes), mas recusa alterações, pois a
+    mesma instância é compartilhada por todas as lajes com o mesmo modelo.
+    Cópia devolve o próprio objeto; pickle reinterna ao carregar.
+    """
+    __slots__ = ('_hash',)
+
+    def _somente_leitura(self, *args, **kwargs):
+        raise TypeError("RegistroEnchimento é compartilhado e não pode ser alterado.")
+
+    __setitem__ = __delitem__ = __ior__ = _somente_leitura
+    clear = pop = popitem = setdefault = update = _somente_leitura
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(_chave_enchimento(self))
+            return self._hash
+
+    def __reduce__(self):
+        return (internar_enchimento, (dict(self),))
+
+    def __copy__(self) -> "RegistroEnchimento":
+        return self
+
+    def __deepcopy__(self, memo) -> "RegistroEnchimento":
+        return self
+
+
+def _chave_enchimento(dados: Mapping[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, repr(v)) for k, v in dados.items()))
+
+
+def internar_enchimento(dados: Mapping[str, Any]) -> RegistroEnchimento:
+    """
+    Retorna o registro somente-leitura compartilhado de enchimento (mesmas
+    chaves do catálogo). Registros iguais resultam no mesmo objeto.
+    """
+    chave = _chave_enchimento(dados)
+    registro = _enchimentos.get(chave)
+    if registro is None:
+        registro = _enchimentos.setdefault(chave, RegistroEnchimento(dados))
+    return registro
+
+
+class CarregamentoLaje:
+    """
+    Carregamento de uma laje: base compartilhada (revestimento + acidental)
+    mais o estado próprio da laje (g_paredes). Mesma interface de Carregamento.
+    """
+    __slots__ = ('base', 'g_paredes')
+
+    def __init__(self, base: CarregamentoSpec, g_paredes: float = 0.0):
+        self.base = base
+        self.g_paredes = g_paredes
+
+    @property
+    def g_revestimento(self) -> float:
+        return self.base.g_revestimento
+
+    @property
+    def q_acidental(self) -> float:
+        return self.base.q_acidental
+
+    def permanente_total(self, peso_proprio: float) -> float:
+        """Soma: Revestimento + Paredes Distribuídas + Peso Próprio"""
+        return self.g_revestimento + self.g_paredes + peso_proprio
+
+    def __repr__(self) -> str:
+        return (f"CarregamentoLaje(g_revestimento={self.g_revestimento}, "
+                f"q_acidental={self.q_acidental}, g_paredes={self.g_paredes})")
+
+
+def limpar():
+    """Esvazia as tabelas de internação (chamar quando o pavimento/projeto em uso é substituído)."""
+    _materiais.clear()
+    _carregamentos.clear()
+    _enchimentos.clear()
+
+
+def estatisticas() -> Dict[str, int]:
+    """Quantidade de especificações distintas internadas (diagnóstico)."""
+    return {"materiais": len(_materiais), "carregamentos": len(_carregamentos),
+            "enchimentos": len(_enchimentos)}
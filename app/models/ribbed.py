@@ -1,5 +1,6 @@
 from typing import Dict, Any
 from app.models.base import Laje
+from app.models.flyweights import internar_enchimento
 from config import settings
 
 class LajeTrelicada(Laje):
@@ -15,7 +16,8 @@ class LajeTrelicada(Laje):
         super().__init__(**kwargs)
         self.h_capa = h_capa
         self.largura_sapata = largura_sapata
-        self.enchimento = dados_enchimento
+        # Registro do catálogo compartilhado (somente leitura) entre todas as lajes
+        self.enchimento = internar_enchimento(dados_enchimento)
         
         # Geometria
         self.h_enchimento = self.enchimento['altura_h_cm'] / 100.0
@@ -0,0 +1,93 @@
+"""
+Especificação imutável de laje (SlabSpec).
+
+Value object congelado e hashable com tudo o que o motor precisa para analisar
+uma laje. Derivações são feitas com `replace(h=...)` em vez de alterar objetos
+existentes, o que torna seguro memorizar resultados, analisar em paralelo e
+guardar estados anteriores (desfazer) sem cópias defensivas.
+"""
+import hashlib
+from dataclasses import dataclass, replace as _replace
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from app.models.base import Laje
+from app.models.solid import LajeMacica
+from app.models.ribbed import LajeTrelicada
+from app.models.value_objects import ClasseAgressividade, MateriaisSpec, CarregamentoSpec
+from app.models.flyweights import internar_materiais_de, internar_enchimento
+
+BORDAS = ('esquerda', 'direita', 'topo', 'fundo')
+
+
+@dataclass(frozen=True, slots=True)
+class SlabSpec:
+    tipo: str  # "LajeMacica" ou "LajeTrelicada"
+    lx: float
+    ly: float
+    h: float
+    materiais: MateriaisSpec
+    caa: ClasseAgressividade
+    bordas: Tuple[Any, Any, Any, Any]  # Valores na ordem de BORDAS
+    carregamento: CarregamentoSpec
+    # Apenas para LajeTrelicada
+    h_capa: float = 0.0
+    largura_sapata: float = 0.0
+    enchimento: Optional[Tuple[Tuple[str, Any], ...]] = None
+
+    # --- Construção / derivação ---
+
+    @classmethod
+    def from_laje(cls, laje: Laje) -> "SlabSpec":
+        """Congela o estado atual de uma Laje."""
+        comum = dict(
+            lx=laje.lx, ly=laje.ly, h=laje.h,
+            materiais=internar_materiais_de(laje.materiais),
+            caa=laje.caa,
+            bordas=tuple(laje.bordas.get(b) for b in BORDAS),
+            carregamento=CarregamentoSpec.from_carregamento(laje.carregamento)
+        )
+        if isinstance(laje, LajeTrelicada):
+            return cls(tipo="LajeTrelicada", h_capa=laje.h_capa, largura_sapata=laje.largura_sapata,
+                       enchimento=tuple(sorted(laje.enchimento.items())), **comum)
+        return cls(tipo="LajeMacica", **comum)
+
+    def replace(self, **campos) -> "SlabSpec":
+        """Nova especificação com os campos alterados (ex: spec.replace(h=0.12))."""
+        return _replace(self, **campos)
+
+    # --- Acesso ---
+
+    @property
+    def bordas_dict(self) -> Dict[str, Any]:
+        return {b: v for b, v in zip(BORDAS, self.bordas) if v is not None}
+
+    @property
+    def dados_enchimento(self) -> Optional[Mapping[str, Any]]:
+        return internar_enchimento(dict(self.enchimento)) if self.enchimento is not None else None
+
+    def to_laje(self) -> Laje:
+        """Cria um objeto Laje novo (exclusivo do chamador) com estes dados."""
+        comum = dict(lx=self.lx, ly=self.ly, materiais=self.materiais, caa=self.caa,
+                     bordas=self.bordas_dict, carregamento=self.carregamento)
+        if self.tipo == "LajeMacica":
+            return LajeMacica(h=self.h, **comum)
+
+        laje = LajeTrelicada(h_capa=self.h_capa, largura_sapata=self.largura_sapata,
+                             dados_enchimento=self.dados_enchimento, **comum)
+        if laje.h != self.h:
+            # Espessura derivada (ex: otimizador) independente da geometria do enchimento
+            laje._h = self.h
+            laje.calcular_altura_util()
+        return laje
+
+    def chave_estavel(self) -> str:
+        """
+        Assinatura determinística (igual entre processos e execuções), para caches
+        persistentes. O __hash__ do Python varia por processo para strings/enums.
+        """
+        return hashlib.sha1(repr(self).encode('utf-8')).hexdigest()
+
+
+def como_laje(obj: Any) -> Laje:
+    """Aceita Laje ou SlabSpec e devolve um objeto Laje para o motor."""
+    return obj.to_laje() if isinstance(obj, SlabSpec) else obj
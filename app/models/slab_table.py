@@ -0,0 +1,476 @@
+"""
+Armazenamento colunar (struct-of-arrays) das lajes e paredes de um pavimento.
+
+Cada atributo geométrico/carga é um array contíguo do NumPy; materiais e
+enchimentos são internados em tabelas próprias e referenciados por índice.
+Os algoritmos do pavimento trabalham diretamente sobre essas colunas e os
+objetos Laje/CargaLinear são apenas vistas montadas sob demanda.
+"""
+import copy
+import json
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.models.base import Laje
+from app.models.solid import LajeMacica
+from app.models.ribbed import LajeTrelicada
+from app.models.value_objects import (Materiais, MateriaisSpec, CarregamentoSpec,
+                                      ClasseAgressividade, CargaLinear)
+from app.models.slab_spec import SlabSpec
+from app.models.flyweights import (internar_materiais, internar_materiais_de, internar_carregamento,
+                                   internar_enchimento, CarregamentoLaje)
+from app.models import columnar
+
+BORDAS = columnar.BORDAS
+CODIGOS_BORDA = columnar.CODIGOS_BORDA
+NOMES_BORDA = columnar.NOMES_BORDA
+SEM_VINCULO_MANUAL = -1  # Código de 'automático' em vinculos_manuais
+
+TIPO_MACICA = 0
+TIPO_TRELICADA = 1
+
+
+class LinhaTabela(NamedTuple):
+    """Conteúdo completo de uma linha, compactado (registro do histórico de edições)."""
+    id: str
+    dados: bytes          # Valores de todas as colunas do buffer, concatenados
+    extras: Tuple = ()    # Colunas em listas Python (ex: vigas, dim_vigas)
+
+    def tamanho(self) -> int:
+        """Estimativa de memória ocupada (bytes)."""
+        return 64 + len(self.dados) + len(self.id) + sum(len(str(e)) for e in self.extras)
+
+
+class _TabelaColunar:
+    """Base: colunas com capacidade crescente (dobra quando enche)."""
+
+    _FLOATS: Tuple[str, ...] = ()
+    _INTEIROS: Dict[str, Any] = {}
+    _MATRIZES: Dict[str, Tuple[int, Any]] = {}  # nome -> (largura, dtype)
+
+    def __init__(self, capacidade: int = 16):
+        self.n = 0
+        self.ids: List[str] = []
+        self._indice_id: Dict[str, int] = {}
+        self.versao = 0  # Incrementada a cada alteração (invalida vistas)
+        self._buf: Dict[str, np.ndarray] = {}
+        for nome in self._FLOATS:
+            self._buf[nome] = np.zeros(capacidade, dtype=np.float64)
+        for nome, dtype in self._INTEIROS.items():
+            self._buf[nome] = np.zeros(capacidade, dtype=dtype)
+        for nome, (largura, dtype) in self._MATRIZES.items():
+            self._buf[nome] = np.zeros((capacidade, largura), dtype=dtype)
+
+    def __getattr__(self, nome: str) -> np.ndarray:
+        # Acesso às colunas como atributos: tabela.x, tabela.lx, tabela.bordas...
+        buf = self.__dict__.get('_buf')
+        if buf is not None and nome in buf:
+            return buf[nome][:self.n]
+        raise AttributeError(nome)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _garantir_capacidade(self, n: int):
+        cap = next(iter(self._buf.values())).shape[0] if self._buf else 0
+        if n <= cap:
+            return
+        nova = max(n, cap * 2, 16)
+        for nome, arr in self._buf.items():
+            novo = np.zeros((nova,) + arr.shape[1:], dtype=arr.dtype)
+            novo[:self.n] = arr[:self.n]
+            self._buf[nome] = novo
+
+    def _nova_linha(self, id_: str) -> int:
+        self._garantir_capacidade(self.n + 1)
+        idx = self.n
+        self.n += 1
+        self.ids.append(id_)
+        self._indice_id.setdefault(id_, idx)
+        self.versao += 1
+        return idx
+
+    def indice(self, id_: str) -> int:
+        """Índice da linha com o id informado (-1 se não existir)."""
+        return self._indice_id.get(id_, -1)
+
+    def remover(self, idx: int):
+        for arr in self._buf.values():
+            arr[idx:self.n - 1] = arr[idx + 1:self.n]
+        self.n -= 1
+        del self.ids[idx]
+        self._remover_listas(idx)
+        self._reindexar()
+        self.versao += 1
+
+    def _reindexar(self):
+        # Em ids repetidos prevalece a primeira ocorrência
+        self._indice_id = {}
+        for i, id_ in enumerate(self.ids):
+            self._indice_id.setdefault(id_, i)
+
+    def _remover_listas(self, idx: int):
+        pass
+
+    # --- Linhas completas (histórico de edições) ---
+
+    def ler_linha(self, idx: int) -> LinhaTabela:
+        dados = b"".join(arr[idx].tobytes() for arr in self._buf.values())
+        return LinhaTabela(self.ids[idx], dados, self._extras(idx))
+
+    def escrever_linha(self, idx: int, linha: LinhaTabela):
+        """Restaura a linha idx a partir de ler_linha (índices internados continuam válidos)."""
+        pos = 0
+        for arr in self._buf.values():
+            tam = arr[idx].nbytes
+            arr[idx] = np.frombuffer(linha.dados, dtype=arr.dtype, count=tam // arr.itemsize, offset=pos) \
+                .reshape(arr.shape[1:])
+            pos += tam
+        self._escrever_extras(idx, linha.extras)
+        if self.ids[idx] != linha.id:
+            self.renomear(idx, linha.id)
+        self.versao += 1
+
+    def inserir_linha(self, idx: int, linha: LinhaTabela):
+        """Insere a linha na posição idx, deslocando as seguintes."""
+        self._garantir_capacidade(self.n + 1)
+        for arr in self._buf.values():
+            arr[idx + 1:self.n + 1] = arr[idx:self.n]
+        self.n += 1
+        self.ids.insert(idx, linha.id)
+        self._inserir_extras(idx, linha.extras)
+        self.escrever_linha(idx, linha)
+        self._reindexar()
+
+    def _extras(self, idx: int) -> Tuple:
+        return ()
+
+    def _escrever_extras(self, idx: int, extras: Tuple):
+        pass
+
+    def _inserir_extras(self, idx: int, extras: Tuple):
+        pass
+
+    def renomear(self, idx: int, novo_id: str):
+        self.ids[idx] = novo_id
+        self._reindexar()
+        self.versao += 1
+
+    def copiar(self) -> "_TabelaColunar":
+        """Cópia independente (snapshot para processamento em outra thread)."""
+        nova = copy.copy(self)
+        nova._buf = {nome: arr.copy() for nome, arr in self._buf.items()}
+        nova.ids = list(self.ids)
+        nova._indice_id = dict(self._indice_id)
+        nova._copiar_listas()
+        return nova
+
+    def _copiar_listas(self):
+        pass
+
+    def marcar_alteracao(self):
+        """Registra alteração feita diretamente nas colunas (ex: tabela.g_paredes[:] = ...)."""
+        self.versao += 1
+
+    def limpar(self):
+        self.n = 0
+        self.ids = []
+        self._indice_id = {}
+        self._remover_listas(None)
+        self.versao += 1
+
+    # --- Serialização (arquivo de projeto) ---
+
+    def para_arrays(self) -> Dict[str, np.ndarray]:
+        """Colunas (só as n linhas ocupadas) e listas como arrays do NumPy, sem objetos Python."""
+        dados = {nome: arr[:self.n].copy() for nome, arr in self._buf.items()}
+        dados['ids'] = np.array(self.ids, dtype=str)
+        dados.update(self._listas_para_arrays())
+        return dados
+
+    @classmethod
+    def de_arrays(cls, dados: Mapping[str, np.ndarray]) -> "_TabelaColunar":
+        tabela = cls()
+        n = len(dados['ids'])
+        tabela._garantir_capacidade(n)
+        for nome, arr in tabela._buf.items():
+            if nome in dados: # Colunas novas ficam zeradas em arquivos antigos
+                arr[:n] = dados[nome]
+        tabela.n = n
+        tabela.ids = [str(i) for i in dados['ids']]
+        tabela._reindexar()
+        tabela._listas_de_arrays(dados)
+        return tabela
+
+    def _listas_para_arrays(self) -> Dict[str, np.ndarray]:
+        return {}
+
+    def _listas_de_arrays(self, dados: Mapping[str, np.ndarray]):
+        pass
+
+
+class SlabTable(_TabelaColunar):
+    """
+    Lajes do pavimento em colunas. Cada linha corresponde a uma LajePosicionada.
+    bordas/vinculos_manuais são matrizes (n x 4) na ordem de BORDAS, com códigos
+    de CODIGOS_BORDA (vinculos_manuais usa -1 para 'automático').
+    """
+
+    _FLOATS = ('x', 'y', 'lx', 'ly', 'h', 'g_revestimento', 'q_acidental', 'g_paredes',
+               'h_capa', 'largura_sapata')
+    _INTEIROS = {'tipo': np.int8, 'caa': np.int8, 'material': np.int32, 'enchimento': np.int32}
+    _MATRIZES = {'bordas': (4, np.int8), 'vinculos_manuais': (4, np.int8)}
+
+    def __init__(self, capacidade: int = 16):
+        super().__init__(capacidade)
+        self.vigas: List[Tuple[str, str, str, str]] = []
+        self.dim_vigas: List[str] = []
+        # Tabelas internadas (flyweight): cada combinação distinta aparece uma vez
+        # e os objetos são os mesmos compartilhados por todo o programa.
+        self.materiais: List[MateriaisSpec] = []
+        self._indice_material: Dict[int, int] = {}
+        self.enchimentos: List[Mapping[str, Any]] = []
+        self._indice_enchimento: Dict[int, int] = {}
+
+    # --- Tabelas internadas ---
+
+    def internar_material(self, mat: Materiais) -> int:
+        spec = internar_materiais_de(mat)
+        idx = self._indice_material.get(id(spec))
+        if idx is None:
+            idx = len(self.materiais)
+            self.materiais.append(spec)
+            self._indice_material[id(spec)] = idx
+        return idx
+
+    def internar_enchimento(self, dados: Mapping[str, Any]) -> int:
+        registro = internar_enchimento(dados)
+        idx = self._indice_enchimento.get(id(registro))
+        if idx is None:
+            idx = len(self.enchimentos)
+            self.enchimentos.append(registro)
+            self._indice_enchimento[id(registro)] = idx
+        return idx
+
+    # --- Inclusão / alteração ---
+
+    def adicionar(self, id_: str, laje: Laje, x: float, y: float,
+                  vigas: Optional[Dict[str, str]] = None, dim_vigas: str = "15x40",
+                  vinculos_manuais: Optional[Dict[str, str]] = None) -> int:
+        """Acrescenta a laje (copiando seus dados para as colunas) e retorna o índice."""
+        idx = self._nova_linha(id_)
+        self._buf['x'][idx], self._buf['y'][idx] = x, y
+        self.escrever_laje(idx, laje)
+        vigas = vigas or {}
+        self.vigas.append(tuple(vigas.get(k, "") for k in BORDAS))
+        self.dim_vigas.append(dim_vigas)
+        self.definir_vinculos_manuais(idx, vinculos_manuais or {})
+        return idx
+
+    def substituir(self, idx: int, id_: str, laje: Laje, x: float, y: float,
+                   vigas: Optional[Dict[str, str]] = None, dim_vigas: str = "15x40",
+                   vinculos_manuais: Optional[Dict[str, str]] = None):
+        """Sobrescreve a linha idx com os mesmos dados aceitos por adicionar()."""
+        if self.ids[idx] != id_:
+            self.renomear(idx, id_)
+        self._buf['x'][idx], self._buf['y'][idx] = x, y
+        self.escrever_laje(idx, laje)
+        vigas = vigas or {}
+        self.vigas[idx] = tuple(vigas.get(k, "") for k in BORDAS)
+        self.dim_vigas[idx] = dim_vigas
+        self.definir_vinculos_manuais(idx, vinculos_manuais or {})
+
+    def escrever_laje(self, idx: int, laje: Laje):
+        """Copia geometria, cargas, materiais e bordas da laje para a linha idx."""
+        b = self._buf
+        b['lx'][idx], b['ly'][idx], b['h'][idx] = laje.lx, laje.ly, laje.h
+        b['g_revestimento'][idx] = laje.carregamento.g_revestimento
+        b['q_acidental'][idx] = laje.carregamento.q_acidental
+        b['g_paredes'][idx] = laje.carregamento.g_paredes
+        b['caa'][idx] = laje.caa.value
+        b['material'][idx] = self.internar_material(laje.materiais)
+        b['bordas'][idx] = [CODIGOS_BORDA.get(laje.bordas.get(k), 0) for k in BORDAS]
+
+        if isinstance(laje, LajeTrelicada):
+            b['tipo'][idx] = TIPO_TRELICADA
+            b['h_capa'][idx], b['largura_sapata'][idx] = laje.h_capa, laje.largura_sapata
+            b['enchimento'][idx] = self.internar_enchimento(laje.enchimento)
+        else:
+            b['tipo'][idx] = TIPO_MACICA
+            b['h_capa'][idx] = b['largura_sapata'][idx] = 0.0
+            b['enchimento'][idx] = -1
+        self.versao += 1
+
+    def definir_vinculos_manuais(self, idx: int, vinculos: Dict[str, str]):
+        # Strings vazias equivalem a 'automático' (mesma regra do algoritmo original)
+        self._buf['vinculos_manuais'][idx] = [
+            CODIGOS_BORDA.get(vinculos.get(k) or "", SEM_VINCULO_MANUAL) for k in BORDAS
+        ]
+        self.versao += 1
+
+    def atualizar(self, idx: int, **campos):
+        """Atualiza colunas escalares de uma linha (ex: atualizar(3, h=0.12, lx=4.5))."""
+        for nome, valor in campos.items():
+            self._buf[nome][idx] = valor
+        self.versao += 1
+
+    def _remover_listas(self, idx: Optional[int]):
+        if idx is None:
+            self.vigas = []
+            self.dim_vigas = []
+        else:
+            del self.vigas[idx]
+            del self.dim_vigas[idx]
+
+    def _extras(self, idx: int) -> Tuple:
+        return (self.vigas[idx], self.dim_vigas[idx])
+
+    def _escrever_extras(self, idx: int, extras: Tuple):
+        self.vigas[idx], self.dim_vigas[idx] = extras
+
+    def _inserir_extras(self, idx: int, extras: Tuple):
+        self.vigas.insert(idx, extras[0])
+        self.dim_vigas.insert(idx, extras[1])
+
+    def _listas_para_arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            'vigas': np.array(self.vigas, dtype=str).reshape(self.n, len(BORDAS)),
+            'dim_vigas': np.array(self.dim_vigas, dtype=str),
+            'materiais': np.array([[m.fck, m.fyk, m.Ecs, m.gamma_c, m.gamma_s] for m in self.materiais],
+                                  dtype=np.float64).reshape(-1, 5),
+            # Registros de catálogo (chaves variáveis): JSON, um por enchimento
+            'enchimentos': np.array([json.dumps(dict(e), sort_keys=True) for e in self.enchimentos], dtype=str),
+        }
+
+    def _listas_de_arrays(self, dados: Mapping[str, np.ndarray]):
+        self.vigas = [tuple(str(v) for v in linha) for linha in dados['vigas']]
+        self.dim_vigas = [str(d) for d in dados['dim_vigas']]
+        # Reinterna: as linhas continuam apontando para os mesmos índices
+        for fck, fyk, Ecs, gc, gs in dados['materiais'].tolist():
+            spec = internar_materiais(fck, fyk, Ecs, gc, gs)
+            self._indice_material.setdefault(id(spec), len(self.materiais))
+            self.materiais.append(spec)
+        for texto in dados['enchimentos']:
+            registro = internar_enchimento(json.loads(str(texto)))
+            self._indice_enchimento.setdefault(id(registro), len(self.enchimentos))
+            self.enchimentos.append(registro)
+
+    def _copiar_listas(self):
+        self.vigas = list(self.vigas)
+        self.dim_vigas = list(self.dim_vigas)
+        # Materiais/enchimentos internados são imutáveis: basta copiar os índices
+        self.materiais = list(self.materiais)
+        self._indice_material = dict(self._indice_material)
+        self.enchimentos = list(self.enchimentos)
+        self._indice_enchimento = dict(self._indice_enchimento)
+
+    # --- Colunas derivadas ---
+
+    @property
+    def x_fim(self) -> np.ndarray:
+        return self.x + self.lx
+
+    @property
+    def y_fim(self) -> np.ndarray:
+        return self.y + self.ly
+
+    # --- Vistas (objetos de domínio) ---
+
+    def bordas_dict(self, idx: int) -> Dict[str, str]:
+        return {k: NOMES_BORDA[c] for k, c in zip(BORDAS, self._buf['bordas'][idx])}
+
+    def vinculos_manuais_dict(self, idx: int) -> Dict[str, str]:
+        return {k: NOMES_BORDA[c] for k, c in zip(BORDAS, self._buf['vinculos_manuais'][idx])
+                if c != SEM_VINCULO_MANUAL}
+
+    def criar_laje(self, idx: int) -> Laje:
+        """Monta um objeto Laje (vista) com os valores atuais da linha."""
+        b = self._buf
+        comum = dict(
+            lx=float(b['lx'][idx]), ly=float(b['ly'][idx]),
+            materiais=self.materiais[b['material'][idx]],
+            caa=ClasseAgressividade(int(b['caa'][idx])),
+            bordas=self.bordas_dict(idx),
+            carregamento=CarregamentoLaje(
+                internar_carregamento(float(b['g_revestimento'][idx]), float(b['q_acidental'][idx])),
+                g_paredes=float(b['g_paredes'][idx]))
+        )
+        h = float(b['h'][idx])
+        if b['tipo'][idx] == TIPO_MACICA:
+            return LajeMacica(h=h, **comum)
+
+        laje = LajeTrelicada(h_capa=float(b['h_capa'][idx]), largura_sapata=float(b['largura_sapata'][idx]),
+                             dados_enchimento=self.enchimentos[b['enchimento'][idx]], **comum)
+        if laje.h != h:
+            laje._h = h
+            laje.calcular_altura_util()
+        return laje
+
+    def criar_spec(self, idx: int) -> SlabSpec:
+        """Especificação imutável (hashable) da linha, para análises memorizadas."""
+        b = self._buf
+        spec = SlabSpec(
+            tipo=columnar.TIPOS_LAJE[b['tipo'][idx]],
+            lx=float(b['lx'][idx]), ly=float(b['ly'][idx]), h=float(b['h'][idx]),
+            materiais=self.materiais[b['material'][idx]],
+            caa=ClasseAgressividade(int(b['caa'][idx])),
+            bordas=tuple(NOMES_BORDA[c] for c in b['bordas'][idx]),
+            carregamento=CarregamentoSpec(float(b['g_revestimento'][idx]), float(b['q_acidental'][idx]),
+                                          float(b['g_paredes'][idx]))
+        )
+        if b['tipo'][idx] == TIPO_TRELICADA:
+            spec = spec.replace(h_capa=float(b['h_capa'][idx]), largura_sapata=float(b['largura_sapata'][idx]),
+                                enchimento=tuple(sorted(self.enchimentos[b['enchimento'][idx]].items())))
+        return spec
+
+    def matriz_entrada(self) -> np.ndarray:
+        """Matriz (n x COLUNAS_LAJE) para o caminho em lote, montada coluna a coluna."""
+        m = np.zeros((self.n, columnar.N_COLUNAS_LAJE), dtype=np.float64)
+        if self.n == 0:
+            return m
+        mats = np.array([[mt.fck, mt.fyk, mt.Ecs, mt.gamma_c, mt.gamma_s] for mt in self.materiais],
+                        dtype=np.float64)
+        m[:, 0] = self.tipo
+        m[:, 1], m[:, 2], m[:, 3] = self.lx, self.ly, self.h
+        m[:, 4] = self.caa
+        m[:, 5:9] = self.bordas
+        m[:, 9:14] = mats[self.material]
+        m[:, 14], m[:, 15], m[:, 16] = self.g_revestimento, self.q_acidental, self.g_paredes
+
+        trel = np.nonzero(self.tipo == TIPO_TRELICADA)[0]
+        if trel.size:
+            ench = np.array([[e['altura_h_cm'], e['largura_b_cm'], e.get('comprimento_cm', 30.0),
+                              e['peso_unitario_kg']] for e in self.enchimentos], dtype=np.float64)
+            m[trel, 17] = self.h_capa[trel]
+            m[trel, 18] = self.largura_sapata[trel]
+            m[trel, 19:23] = ench[self.enchimento[trel]]
+        return m
+
+
+class WallTable(_TabelaColunar):
+    """Paredes (cargas lineares) do pavimento em colunas."""
+
+    _FLOATS = ('x_inicio', 'y_inicio', 'x_fim', 'y_fim', 'carga_kn_m')
+
+    def adicionar(self, parede: CargaLinear) -> int:
+        idx = self._nova_linha(parede.id)
+        self.atualizar(idx, x_inicio=parede.x_inicio, y_inicio=parede.y_inicio,
+                       x_fim=parede.x_fim, y_fim=parede.y_fim, carga_kn_m=parede.carga_kn_m)
+        return idx
+
+    def atualizar(self, idx: int, **campos):
+        for nome, valor in campos.items():
+            self._buf[nome][idx] = valor
+        self.versao += 1
+
+    def substituir(self, idx: int, parede: CargaLinear):
+        if self.ids[idx] != parede.id:
+            self.renomear(idx, parede.id)
+        self.atualizar(idx, x_inicio=parede.x_inicio, y_inicio=parede.y_inicio,
+                       x_fim=parede.x_fim, y_fim=parede.y_fim, carga_kn_m=parede.carga_kn_m)
+
+    def criar_parede(self, idx: int) -> CargaLinear:
+        b = self._buf
+        return CargaLinear(self.ids[idx], float(b['x_inicio'][idx]), float(b['y_inicio'][idx]),
+                           float(b['x_fim'][idx]), float(b['y_fim'][idx]), float(b['carga_kn_m'][idx]))
@@ -1,6 +1,6 @@
 from enum import Enum
-from dataclasses import dataclass, field
-from typing import Dict, List, Any
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Any, ClassVar, Tuple, Union
 from config import settings
 
 class ClasseAgressividade(Enum):
@@ -70,4 +70,163 @@ class AnalysisResult:
     contraflecha_mm: float
     wk_max_mm: float
     status_servico: str
-    status_geral: str
\ No newline at end of file
+    status_geral: str
+
+# ==============================================================================
+# VARIANTES COMPACTAS (__slots__ + frozen)
+# Para manter dezenas de milhares de resultados em memória sem um dict por
+# instância. Os sub-registros imitam a leitura de dict (get/items/[]), então
+# ReportFormatter e MemorialService funcionam com qualquer das duas versões.
+# ==============================================================================
+
+@dataclass(frozen=True, slots=True)
+class MateriaisSpec:
+    """Versão imutável de Materiais (compatível com o motor por atributos)."""
+    fck: float
+    fyk: float
+    Ecs: float
+    gamma_c: float = settings.GAMMA_C
+    gamma_s: float = settings.GAMMA_S
+
+    @classmethod
+    def from_materiais(cls, m: Materiais) -> "MateriaisSpec":
+        return cls(m.fck, m.fyk, m.Ecs, m.gamma_c, m.gamma_s)
+
+
+@dataclass(frozen=True, slots=True)
+class CarregamentoSpec:
+    """Versão imutável de Carregamento. g_paredes é fixado no momento da cópia."""
+    g_revestimento: float
+    q_acidental: float
+    g_paredes: float = 0.0
+
+    def permanente_total(self, peso_proprio: float) -> float:
+        return self.g_revestimento + self.g_paredes + peso_proprio
+
+    @classmethod
+    def from_carregamento(cls, c: Carregamento) -> "CarregamentoSpec":
+        return cls(c.g_revestimento, c.q_acidental, c.g_paredes)
+
+
+class _RegistroFixo:
+    """Mixin para sub-registros de campos fixos com interface de leitura de dict."""
+    __slots__ = ()
+    _CHAVES: ClassVar[Tuple[str, ...]] = ()
+
+    def _chaves(self) -> Tuple[str, ...]:
+        return self._CHAVES or tuple(f.name for f in fields(self))
+
+    @classmethod
+    def _campo_por_chave(cls) -> Dict[str, str]:
+        """Chave de leitura -> nome do campo (montado uma vez por classe)."""
+        mapa = cls.__dict__.get('_MAPA_CAMPOS')
+        if mapa is None:
+            nomes = tuple(f.name for f in fields(cls))
+            mapa = dict(zip(cls._CHAVES or nomes, nomes))
+            cls._MAPA_CAMPOS = mapa
+        return mapa
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: getattr(self, campo) for k, campo in self._campo_por_chave().items()}
+
+    def items(self):
+        return self.to_dict().items()
+
+    def get(self, chave: str, padrao: Any = None) -> Any:
+        campo = self._campo_por_chave().get(chave)
+        return padrao if campo is None else getattr(self, campo)
+
+    def __getitem__(self, chave: str) -> Any:
+        return getattr(self, self._campo_por_chave()[chave])
+
+
+@dataclass(frozen=True, slots=True)
+class MomentosELU(_RegistroFixo):
+    mx: float
+    my: float
+    mx_neg: float
+    my_neg: float
+    v_sd_x: float
+    v_sd_y: float
+    reacao_viga_x: float
+    reacao_viga_y: float
+
+
+@dataclass(frozen=True, slots=True)
+class ValoresPorPosicao(_RegistroFixo):
+    """As teórico (cm²/m ou texto de reprovação) ou detalhamento por posição."""
+    mx: Union[float, str]
+    my: Union[float, str]
+    mx_neg: Union[float, str]
+    my_neg: Union[float, str]
+
+
+@dataclass(frozen=True, slots=True)
+class VerificacaoCortante(_RegistroFixo):
+    v_sd: float
+    v_rd1: float
+    ratio: float
+    status: str
+    detalhes: str
+
+
+@dataclass(frozen=True, slots=True)
+class ReacoesApoio(_RegistroFixo):
+    _CHAVES: ClassVar[Tuple[str, ...]] = ("Esquerda", "Direita", "Topo", "Fundo")
+    esquerda: float
+    direita: float
+    topo: float
+    fundo: float
+
+
+@dataclass(frozen=True, slots=True)
+class CompactAnalysisResult:
+    """
+    Equivalente imutável e sem dicts de AnalysisResult.
+    to_dict() produz exatamente o mesmo conteúdo de dataclasses.asdict(AnalysisResult).
+    """
+    tipo_laje: str
+    lx: float
+    ly: float
+    h_cm: float
+    d_cm: float
+    peso_proprio: float
+    carga_total_distribuida: float
+    momentos_kNm: MomentosELU
+    as_teorico: ValoresPorPosicao
+    cortante: VerificacaoCortante
+    detalhamento: ValoresPorPosicao
+    reacoes_apoio: ReacoesApoio
+    volume_concreto: float
+    peso_aco_estimado: float
+    taxa_aco_m2: float
+    consumo_concreto_m2: float
+    cobrimento_mm: float
+    flecha_total_mm: float
+    flecha_limite_mm: float
+    contraflecha_mm: float
+    wk_max_mm: float
+    status_servico: str
+    status_geral: str
+
+    @classmethod
+    def from_result(cls, res: AnalysisResult) -> "CompactAnalysisResult":
+        r = res.reacoes_apoio
+        dados = {f.name: getattr(res, f.name) for f in fields(res)}
+        dados.update(
+            momentos_kNm=MomentosELU(**res.momentos_kNm),
+            as_teorico=ValoresPorPosicao(**res.as_teorico),
+            cortante=VerificacaoCortante(**res.cortante),
+            detalhamento=ValoresPorPosicao(**res.detalhamento),
+            reacoes_apoio=ReacoesApoio(r["Esquerda"], r["Direita"], r["Topo"], r["Fundo"])
+        )
+        return cls(**dados)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            f.name: (v.to_dict() if isinstance(v, _RegistroFixo) else v)
+            for f in fields(self) for v in (getattr(self, f.name),)
+        }
+
+    def to_result(self) -> AnalysisResult:
+        return AnalysisResult(**self.to_dict())
@@ -0,0 +1,238 @@
+"""
+Exportação em lote de resultados (CSV plano ou JSON Lines) e leitura de volta.
+
+Diferente de ReportFormatter.save_json (um arquivo indentado por resultado),
+aqui milhares de resultados vão para um único arquivo, em uma passada e sem
+montar o documento inteiro na memória:
+
+    CSV:   uma linha por laje; os dicts aninhados viram colunas "grupo.chave"
+           (ex: momentos_kNm.mx, cortante.status, detalhamento.mx_neg)
+    JSONL: um objeto JSON compacto por linha, com a mesma estrutura de
+           dataclasses.asdict(AnalysisResult)
+
+A leitura também é incremental: iterar_resultados() devolve um resultado por
+vez e iterar_blocos() monta matrizes (n x COLUNAS_RESULTADO, ver
+app.models.columnar) de tamanho fixo. Os números são gravados com repr(),
+então ler o arquivo reproduz os resultados campo a campo (inclusive int x float).
+
+Uso típico:
+    ExportacaoLote.escrever(manager.analisar(), "pav.csv", ids=manager.tabela.ids)
+    ids, saida = ExportacaoLote.carregar_matriz("pav.csv")
+"""
+import csv
+import json
+from dataclasses import fields
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.models import columnar
+from app.models.value_objects import AnalysisResult
+
+CSV, JSONL = "csv", "jsonl"
+COLUNA_ID = "laje_id"
+TAMANHO_BLOCO = 4096
+
+_CAMPOS = tuple(f.name for f in fields(AnalysisResult))
+# Colunas que são sempre texto; nas demais, um valor que não é número também fica como texto
+# (ex: as_teorico = "REPROVADO (Ductilidade)")
+_TEXTOS = {'tipo_laje', 'status_servico', 'status_geral', 'cortante.status', 'cortante.detalhes'}
+_PREFIXOS_TEXTO = ('detalhamento.',)
+
+
+def formato_do_arquivo(caminho: str) -> str:
+    return CSV if caminho.lower().endswith(".csv") else JSONL
+
+
+def _resultados(resultados: Union[np.ndarray, Iterable[Any]]) -> Iterable[Any]:
+    # Matriz do motor (n x COLUNAS_RESULTADO): decodifica uma linha por vez
+    if isinstance(resultados, np.ndarray):
+        return (columnar.linha_para_resultado(linha)
+                for linha in resultados.reshape(-1, columnar.N_COLUNAS_RESULTADO))
+    return resultados
+
+
+def _estrutura(res) -> List[Tuple[str, Optional[Tuple[str, ...]]]]:
+    """[(campo, subchaves ou None)] — subchaves para os campos que são dicts (ou sub-registros)."""
+    return [(nome, tuple(k for k, _ in v.items()) if hasattr(v, 'items') else None)
+            for nome in _CAMPOS for v in (getattr(res, nome),)]
+
+
+def _cabecalho(estrutura) -> List[str]:
+    colunas = []
+    for nome, chaves in estrutura:
+        colunas.extend([f"{nome}.{k}" for k in chaves] if chaves else [nome])
+    return colunas
+
+
+def _linha_plana(res, estrutura) -> List[Any]:
+    linha = []
+    for nome, chaves in estrutura:
+        v = getattr(res, nome)
+        if chaves:
+            d = v if isinstance(v, dict) else dict(v.items())
+            linha.extend(d.get(k, "") for k in chaves)
+        else:
+            linha.append(v)
+    return linha
+
+
+def _como_dict(res) -> dict:
+    if hasattr(res, 'to_dict'):
+        return res.to_dict()
+    return {nome: (dict(v) if isinstance(v, dict) else v) for nome in _CAMPOS for v in (getattr(res, nome),)}
+
+
+def _conversor(coluna: str):
+    if coluna in _TEXTOS or coluna.startswith(_PREFIXOS_TEXTO):
+        return None
+
+    def converter(texto: str):
+        # repr(float) sempre tem '.', 'e', 'inf' ou 'nan': só dígitos = int (distingue 0 de 0.0)
+        if texto.lstrip('-').isdigit():
+            return int(texto)
+        try:
+            return float(texto)
+        except ValueError:
+            return texto
+    return converter
+
+
+class ExportacaoLote:
+
+    # --- Escrita ---
+
+    @staticmethod
+    def escrever(resultados: Union[np.ndarray, Iterable[Any]], caminho: str,
+                 ids: Optional[Sequence[str]] = None, formato: Optional[str] = None) -> int:
+        """
+        Grava AnalysisResult / CompactAnalysisResult (ou a matriz do motor) em um
+        arquivo CSV ou JSONL (pela extensão, se `formato` não for informado).
+        `ids`, se informado, vira a primeira coluna/chave (COLUNA_ID).
+        Retorna o número de resultados gravados.
+        """
+        formato = formato or formato_do_arquivo(caminho)
+        if formato == CSV:
+            return ExportacaoLote.escrever_csv(resultados, caminho, ids)
+        if formato == JSONL:
+            return ExportacaoLote.escrever_jsonl(resultados, caminho, ids)
+        raise ValueError(f"Formato '{formato}' desconhecido. Opções: {CSV}, {JSONL}")
+
+    @staticmethod
+    def escrever_csv(resultados: Union[np.ndarray, Iterable[Any]], caminho: str,
+                     ids: Optional[Sequence[str]] = None) -> int:
+        n = 0
+        with open(caminho, 'w', encoding='utf-8', newline='') as f:
+            escritor = csv.writer(f)
+            estrutura = None
+            for res in _resultados(resultados):
+                if estrutura is None:
+                    # Colunas definidas pelo primeiro resultado (chaves dos dicts aninhados)
+                    estrutura = _estrutura(res)
+                    escritor.writerow(([COLUNA_ID] if ids is not None else []) + _cabecalho(estrutura))
+                linha = _linha_plana(res, estrutura)
+                if ids is not None:
+                    linha.insert(0, ids[n])
+                escritor.writerow(linha)
+                n += 1
+        return n
+
+    @staticmethod
+    def escrever_jsonl(resultados: Union[np.ndarray, Iterable[Any]], caminho: str,
+                       ids: Optional[Sequence[str]] = None) -> int:
+        n = 0
+        codificador = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        with open(caminho, 'w', encoding='utf-8') as f:
+            for res in _resultados(resultados):
+                dados = _como_dict(res)
+                if ids is not None:
+                    dados = {COLUNA_ID: ids[n], **dados}
+                f.write(codificador.encode(dados))
+                f.write("\n")
+                n += 1
+        return n
+
+    # --- Leitura ---
+
+    @staticmethod
+    def iterar_registros(caminho: str, formato: Optional[str] = None
+                         ) -> Iterator[Tuple[Optional[str], AnalysisResult]]:
+        """(laje_id ou None, AnalysisResult) para cada linha do arquivo, sem ler o arquivo inteiro."""
+        formato = formato or formato_do_arquivo(caminho)
+        if formato == CSV:
+            yield from _ler_csv(caminho)
+        elif formato == JSONL:
+            yield from _ler_jsonl(caminho)
+        else:
+            raise ValueError(f"Formato '{formato}' desconhecido. Opções: {CSV}, {JSONL}")
+
+    @staticmethod
+    def iterar_resultados(caminho: str, formato: Optional[str] = None) -> Iterator[AnalysisResult]:
+        for _, res in ExportacaoLote.iterar_registros(caminho, formato):
+            yield res
+
+    @staticmethod
+    def iterar_blocos(caminho: str, tamanho: int = TAMANHO_BLOCO, formato: Optional[str] = None
+                      ) -> Iterator[Tuple[List[Optional[str]], np.ndarray]]:
+        """Blocos (ids, matriz até `tamanho` x COLUNAS_RESULTADO) na ordem do arquivo."""
+        ids: List[Optional[str]] = []
+        bloco = np.empty((tamanho, columnar.N_COLUNAS_RESULTADO), dtype=np.float64)
+        for laje_id, res in ExportacaoLote.iterar_registros(caminho, formato):
+            columnar.resultado_para_linha(res, bloco[len(ids)])
+            ids.append(laje_id)
+            if len(ids) == tamanho:
+                yield ids, bloco
+                ids, bloco = [], np.empty_like(bloco)
+        if ids:
+            yield ids, bloco[:len(ids)]
+
+    @staticmethod
+    def carregar_matriz(caminho: str, formato: Optional[str] = None
+                        ) -> Tuple[List[Optional[str]], np.ndarray]:
+        """Arquivo inteiro como (ids, matriz n x COLUNAS_RESULTADO), sem criar um objeto por laje."""
+        ids: List[Optional[str]] = []
+        blocos = []
+        for ids_bloco, bloco in ExportacaoLote.iterar_blocos(caminho, formato=formato):
+            ids.extend(ids_bloco)
+            blocos.append(bloco)
+        if not blocos:
+            return ids, np.empty((0, columnar.N_COLUNAS_RESULTADO), dtype=np.float64)
+        return ids, np.concatenate(blocos)
+
+
+def _ler_csv(caminho: str) -> Iterator[Tuple[Optional[str], AnalysisResult]]:
+    with open(caminho, 'r', encoding='utf-8', newline='') as f:
+        leitor = csv.reader(f)
+        cabecalho = next(leitor, None)
+        if cabecalho is None:
+            return
+        com_id = cabecalho[0] == COLUNA_ID
+        colunas = cabecalho[1:] if com_id else cabecalho
+        # (campo, subchave ou None, conversor) por coluna
+        destino = [(*c.split(".", 1), _conversor(c)) if "." in c else (c, None, _conversor(c)) for c in colunas]
+        grupos = {campo for campo, chave, _ in destino if chave is not None}
+
+        for linha in leitor:
+            laje_id = linha[0] if com_id else None
+            valores = linha[1:] if com_id else linha
+            dados = {campo: {} for campo in grupos}
+            for (campo, chave, converter), texto in zip(destino, valores):
+                if chave is not None and texto == "":
+                    continue # Chave ausente neste resultado
+                v = converter(texto) if converter else texto
+                if chave is None:
+                    dados[campo] = v
+                else:
+                    dados[campo][chave] = v
+            yield laje_id, AnalysisResult(**dados)
+
+
+def _ler_jsonl(caminho: str) -> Iterator[Tuple[Optional[str], AnalysisResult]]:
+    decodificar = json.JSONDecoder().decode
+    with open(caminho, 'r', encoding='utf-8') as f:
+        for linha in f:
+            if not linha.strip():
+                continue
+            dados = decodificar(linha)
+            laje_id = dados.pop(COLUNA_ID, None)
+            yield laje_id, AnalysisResult(**dados)
@@ -0,0 +1,78 @@
+"""
+Campos nodais aproximados (mx, my, flecha) a partir dos resultados analíticos.
+
+NÃO são resultados de elementos finitos: os valores de pico por laje do método
+de tabelas (matriz de resultados colunar) são distribuídos com as formas
+clássicas de viga em cada direção, conforme os vínculos. Servem só para
+leitura visual no renderizador de contornos (mesmo formato CampoNodal de
+app.engines.fem_adapter) e são exibidos com os rótulos de CAMPOS, que
+deixam isso explícito.
+"""
+import numpy as np
+
+from app.engines.fem_adapter import CampoNodal
+from app.models import columnar
+from app.models.slab_table import SlabTable, BORDAS, CODIGOS_BORDA
+
+# Nome do campo -> rótulo exibido na interface
+CAMPOS = {
+    "mx": "mx aproximado — não é resultado de MEF (kN.m/m)",
+    "my": "my aproximado — não é resultado de MEF (kN.m/m)",
+    "flecha": "Flecha aproximada — não é resultado de MEF (mm)",
+}
+
+RESOLUCAO_PADRAO = 9 # Nós por direção em cada laje
+
+_ENGASTADO = CODIGOS_BORDA["engastado"]
+_COL = {nome: i for i, nome in enumerate(columnar.COLUNAS_RESULTADO)}
+
+
+def _momento_viga(xi: np.ndarray, m_pos: np.ndarray, m_a: np.ndarray, m_b: np.ndarray) -> np.ndarray:
+    """
+    Diagrama de momentos de viga com carga uniforme e momentos de extremidade
+    (negativos) m_a / m_b, ajustado para valer m_pos no meio do vão.
+    Retorna (n, len(xi)).
+    """
+    m0 = m_pos + (m_a + m_b) / 2.0
+    xi = xi[None, :]
+    return m0[:, None] * 4.0 * xi * (1.0 - xi) - m_a[:, None] * (1.0 - xi) - m_b[:, None] * xi
+
+
+def _forma_flecha(xi: np.ndarray, engaste_a: np.ndarray, engaste_b: np.ndarray) -> np.ndarray:
+    """Forma normalizada (1 no meio): senoide se apoiada, cossenoide se biengastada."""
+    apoiada = np.sin(np.pi * xi)[None, :]
+    engastada = ((1.0 - np.cos(2.0 * np.pi * xi)) / 2.0)[None, :]
+    peso = ((engaste_a.astype(float) + engaste_b.astype(float)) / 2.0)[:, None]
+    return apoiada * (1.0 - peso) + engastada * peso
+
+
+def campos_aproximados(tabela: SlabTable, saida: np.ndarray, resolucao: int = RESOLUCAO_PADRAO) -> CampoNodal:
+    """
+    Campos nodais aproximados de todas as lajes a partir da matriz de
+    resultados (n x COLUNAS_RESULTADO) do pavimento. Bordas livres são
+    tratadas como apoiadas na forma das funções.
+    """
+    xi = np.linspace(0.0, 1.0, resolucao)
+    b = tabela.bordas
+    eng = {k: b[:, i] == _ENGASTADO for i, k in enumerate(BORDAS)}
+    col = lambda nome: saida[:, _COL[nome]]
+    zero = np.zeros(tabela.n)
+
+    mx_neg, my_neg = col('momentos_kNm.mx_neg'), col('momentos_kNm.my_neg')
+    # mx varia ao longo de x (engastes esquerda/direita); my ao longo de y (fundo/topo)
+    mx_x = _momento_viga(xi, col('momentos_kNm.mx'),
+                         np.where(eng['esquerda'], mx_neg, zero), np.where(eng['direita'], mx_neg, zero))
+    my_y = _momento_viga(xi, col('momentos_kNm.my'),
+                         np.where(eng['fundo'], my_neg, zero), np.where(eng['topo'], my_neg, zero))
+    fx = _forma_flecha(xi, eng['esquerda'], eng['direita'])
+    fy = _forma_flecha(xi, eng['fundo'], eng['topo'])
+
+    # Distribuição transversal: faixa central recebe o valor cheio, bordas ~35%
+    transversal = 0.35 + 0.65 * np.sin(np.pi * xi)
+
+    valores = {
+        "mx": mx_x[:, None, :] * transversal[None, :, None],
+        "my": my_y[:, :, None] * transversal[None, None, :],
+        "flecha": col('flecha_total_mm')[:, None, None] * fy[:, :, None] * fx[:, None, :],
+    }
+    return CampoNodal(tabela.x.copy(), tabela.y.copy(), tabela.lx.copy(), tabela.ly.copy(), valores)
@@ -1,6 +1,23 @@
 import json
 from typing import List, Dict, Any, Optional
 from config.settings import CATALOG_PATH
+from app.services import metrics
+
+_AVISOS = metrics.contador("pylaje_avisos_total", "Problemas relatados (print) ao carregar dados", rotulos=("origem",))
+# Contado fora do registro: o catálogo é lido na importação, antes de
+# metrics.ativar() (que zera as métricas). O coletor publica o total.
+_avisos_carga = 0
+
+
+def _contar_aviso():
+    global _avisos_carga
+    _avisos_carga += 1
+
+
+@metrics.coletor
+def _coletar_avisos():
+    _AVISOS.com(origem="catalogo").definir(_avisos_carga)
+
 
 class CatalogService:
     """
@@ -16,15 +33,18 @@ class CatalogService:
         try:
             if not CATALOG_PATH.exists():
                 print(f"Aviso: Ficheiro de catálogo não encontrado em {CATALOG_PATH}")
+                _contar_aviso()
                 return {}
             
             with open(CATALOG_PATH, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except json.JSONDecodeError as e:
             print(f"Erro ao processar JSON de catálogos: {e}")
+            _contar_aviso()
             return {}
         except Exception as e:
             print(f"Erro inesperado ao carregar catálogos: {e}")
+            _contar_aviso()
             return {}
 
     def reload(self):
@@ -0,0 +1,108 @@
+"""
+Histórico de desfazer/refazer do editor de pavimento.
+
+Em vez de copiar o pavimento inteiro a cada edição, cada passo guarda apenas
+as linhas afetadas (antes/depois), compactadas em LinhaTabela (ver
+app.models.slab_table). Desfazer reaplica essas linhas pelo mesmo caminho de
+uma edição comum: o `alvo` de cada registro (o modelo da tabela na interface)
+implementa restaurar_linha / inserir_linha / remover_linha.
+
+A memória é limitada por um orçamento em bytes: ao ultrapassá-lo, os passos
+mais antigos são descartados.
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.models.slab_table import LinhaTabela
+from config import settings
+
+ALTERAR, INSERIR, REMOVER = "alterar", "inserir", "remover"
+
+
+@dataclass(frozen=True)
+class RegistroEdicao:
+    alvo: Any                      # Quem reaplica a linha (ex: SlabTableModel)
+    tipo: str                      # ALTERAR | INSERIR | REMOVER
+    idx: int
+    antes: Optional[LinhaTabela]   # None em INSERIR
+    depois: Optional[LinhaTabela]  # None em REMOVER
+
+    def tamanho(self) -> int:
+        return 96 + sum(l.tamanho() for l in (self.antes, self.depois) if l is not None)
+
+
+class HistoricoEdicoes:
+    def __init__(self, max_bytes: int = settings.HISTORICO_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._desfazer = deque()
+        self._refazer = deque()
+        self._bytes = 0
+        self._aplicando = False
+
+    @property
+    def bytes_usados(self) -> int:
+        return self._bytes
+
+    def pode_desfazer(self) -> bool:
+        return bool(self._desfazer)
+
+    def pode_refazer(self) -> bool:
+        return bool(self._refazer)
+
+    def limpar(self):
+        self._desfazer.clear()
+        self._refazer.clear()
+        self._bytes = 0
+
+    def registrar(self, alvo, tipo: str, idx: int, antes: Optional[LinhaTabela], depois: Optional[LinhaTabela]):
+        """Nova edição do usuário: entra no desfazer e invalida o refazer."""
+        if self._aplicando:
+            return # Reaplicação feita pelo próprio histórico
+        if tipo == ALTERAR and antes == depois:
+            return # Edição sem efeito
+        registro = RegistroEdicao(alvo, tipo, idx, antes, depois)
+        self._desfazer.append(registro)
+        self._bytes += registro.tamanho()
+        for r in self._refazer:
+            self._bytes -= r.tamanho()
+        self._refazer.clear()
+        self._respeitar_orcamento()
+
+    def _respeitar_orcamento(self):
+        # Mantém ao menos o passo mais recente, mesmo que sozinho exceda o orçamento
+        while self._bytes > self.max_bytes and len(self._desfazer) > 1:
+            self._bytes -= self._desfazer.popleft().tamanho()
+        while self._bytes > self.max_bytes and self._refazer:
+            self._bytes -= self._refazer.pop().tamanho()
+
+    def desfazer(self) -> bool:
+        if not self._desfazer:
+            return False
+        registro = self._desfazer.pop()
+        self._aplicar(registro, registro.antes, inverso=True)
+        self._refazer.append(registro)
+        return True
+
+    def refazer(self) -> bool:
+        if not self._refazer:
+            return False
+        registro = self._refazer.pop()
+        self._aplicar(registro, registro.depois, inverso=False)
+        self._desfazer.append(registro)
+        return True
+
+    def _aplicar(self, registro: RegistroEdicao, linha: Optional[LinhaTabela], inverso: bool):
+        tipo = registro.tipo
+        if inverso and tipo != ALTERAR:
+            tipo = REMOVER if tipo == INSERIR else INSERIR
+        self._aplicando = True
+        try:
+            if tipo == ALTERAR:
+                registro.alvo.restaurar_linha(registro.idx, linha)
+            elif tipo == INSERIR:
+                registro.alvo.inserir_linha(registro.idx, linha)
+            else:
+                registro.alvo.remover_linha(registro.idx)
+        finally:
+            self._aplicando = False
@@ -1,7 +1,96 @@
 import os
 from datetime import datetime
-from typing import List
+from functools import lru_cache
+from typing import Iterable, Iterator
 from app.models.value_objects import AnalysisResult
+from app.services import metrics
+from config import settings
+
+_CACHE = metrics.contador("pylaje_cache_consultas_total", "Consultas aos caches (desde o início do processo)",
+                          rotulos=("cache", "resultado"))
+_CACHE_ITENS = metrics.medidor("pylaje_cache_itens", "Itens guardados em cada cache", rotulos=("cache",))
+
+
+# --- Seções por laje (memorizadas) ---
+# A chave reúne exatamente os valores exibidos na seção: dois resultados com a
+# mesma chave produzem o mesmo texto, então a seção renderizada é reaproveitada
+# entre exportações e só as lajes alteradas são formatadas de novo. Valores
+# impressos sem formatação (4 e 4.0 são chaves iguais) entram como texto.
+
+def _chave_secao(res: AnalysisResult) -> tuple:
+    m, a, c, d = res.momentos_kNm, res.as_teorico, res.cortante, res.detalhamento
+    return (
+        res.tipo_laje, f"{res.lx}x{res.ly}", res.lx, res.ly, res.h_cm, res.d_cm, res.cobrimento_mm,
+        res.peso_proprio, res.carga_total_distribuida,
+        m.get('mx', 0), m.get('my', 0), m.get('mx_neg', 0), m.get('my_neg', 0),
+        d.get('mx', 'Mínima'), a.get('mx', 0), d.get('my', 'Mínima'), a.get('my', 0),
+        str(c.get('ratio', 0)), c.get('status', 'OK'), # ratio pode ser int 0 ou float: vale o texto
+        res.flecha_total_mm, res.flecha_limite_mm, res.contraflecha_mm, res.wk_max_mm, res.status_servico,
+        res.volume_concreto, res.peso_aco_estimado, res.taxa_aco_m2,
+    )
+
+
+@lru_cache(maxsize=settings.MEMORIAL_CACHE_SECOES)
+def _secao_laje(chave: tuple) -> str:
+    (tipo_laje, id_texto, lx, ly, h_cm, d_cm, cobrimento_mm, peso_proprio, carga_total,
+     mx, my, mx_neg, my_neg, det_mx, as_mx, det_my, as_my, ratio, status_cortante,
+     flecha_total, flecha_limite, contraflecha, wk_max, status_servico,
+     volume_concreto, peso_aco, taxa_aco) = chave
+
+    md = [f"\n## 2. ANÁLISE DA LAJE: {tipo_laje} (ID: {id_texto})"]
+
+    # 2.1 Dados de Entrada
+    md.append("\n### 2.1 Dados de Entrada")
+    md.append(f"* **Geometria:** {lx:.2f} m x {ly:.2f} m")
+    md.append(f"* **Espessura (h):** {h_cm:.1f} cm (Altura útil d = {d_cm:.1f} cm)")
+    md.append(f"* **Cobrimento Nominal:** {cobrimento_mm:.1f} mm")
+
+    # 2.2 Carregamento
+    md.append("\n### 2.2 Carregamento e Combinações")
+    md.append("| Descrição | Valor (kN/m²) |")
+    md.append("| :--- | :--- |")
+    md.append(f"| Peso Próprio | {peso_proprio:.2f} |")
+    md.append(f"| Carga Total (Calculada $p_d$) | **{carga_total:.2f}** |")
+
+    # 2.3 Esforços
+    md.append("\n### 2.3 Análise Estrutural (Momentos de Cálculo)")
+    md.append(f"Utilizado método de Marcus/Bares para $\\lambda = {ly/lx:.2f}$.")
+    md.append(f"* $M_{{dx}}$: {mx:.2f} kNm/m")
+    md.append(f"* $M_{{dy}}$: {my:.2f} kNm/m")
+    if mx_neg > 0 or my_neg > 0:
+        md.append(f"* $M_{{neg}}$ Máximo: {max(mx_neg, my_neg):.2f} kNm/m")
+
+    # 2.4 Dimensionamento ELU
+    md.append("\n### 2.4 Dimensionamento (ELU)")
+    md.append(f"* **Armadura Principal (X):** {det_mx} (Teórico: {as_mx:.2f} cm²/m)")
+    md.append(f"* **Armadura Secundária (Y):** {det_my} (Teórico: {as_my:.2f} cm²/m)")
+    md.append(f"* **Cisalhamento:** Ratio {ratio} - Status: {status_cortante}")
+
+    # 2.5 ELS
+    md.append("\n### 2.5 Verificações de Serviço (ELS)")
+    md.append(f"* **Flecha Total:** {flecha_total:.2f} mm (Limite $L/250$: {flecha_limite:.2f} mm)")
+    if contraflecha > 0:
+        md.append(f"* **Contraflecha Sugerida:** {contraflecha:.1f} mm")
+    md.append(f"* **Abertura de Fissuras ($w_k$):** {wk_max:.3f} mm - Status: {status_servico}")
+
+    # 2.6 Quantitativos
+    md.append("\n### 2.6 Quantitativos Estritos")
+    md.append(f"* Volume de Concreto: {volume_concreto:.2f} m³")
+    md.append(f"* Peso de Aço Estimado: {peso_aco:.2f} kg")
+    md.append(f"* Taxa de Aço: {taxa_aco:.2f} kg/m²")
+    md.append("\n---")
+
+    # Cada trecho começa com a quebra de linha que o separava do anterior
+    return "\n" + "\n".join(md)
+
+
+@metrics.coletor
+def _coletar_cache():
+    info = _secao_laje.cache_info()
+    _CACHE.com(cache="memorial", resultado="acerto").definir(info.hits)
+    _CACHE.com(cache="memorial", resultado="falta").definir(info.misses)
+    _CACHE_ITENS.com(cache="memorial").definir(info.currsize)
+
 
 class MemorialService:
     """
@@ -10,70 +99,50 @@ class MemorialService:
     """
 
     @staticmethod
-    def gerar_markdown(resultados: List[AnalysisResult], titulo_projeto: str = "Projeto Residencial") -> str:
+    def gerar_markdown(resultados: Iterable[AnalysisResult], titulo_projeto: str = "Projeto Residencial") -> str:
         """
         Gera um memorial completo em formato Markdown contendo uma ou mais lajes.
         """
+        return "".join(MemorialService.iterar_markdown(resultados, titulo_projeto))
+
+    @staticmethod
+    def iterar_markdown(resultados: Iterable[AnalysisResult], titulo_projeto: str = "Projeto Residencial") -> Iterator[str]:
+        """
+        Mesmo conteúdo de gerar_markdown, entregue em trechos (cabeçalho, uma
+        seção por laje, rodapé) sem montar o documento inteiro na memória.
+        """
         data_atual = datetime.now().strftime("%d/%m/%Y")
-        
-        md = [
+        yield "\n".join([
             f"# MEMORIAL DE CÁLCULO ESTRUTURAL: {titulo_projeto.upper()}",
             f"**Data de Emissão:** {data_atual}",
             "\n## 1. INTRODUÇÃO E NORMAS",
             "Este documento apresenta o dimensionamento das lajes do projeto, seguindo rigorosamente os critérios da **NBR 6118:2023 (Projeto de estruturas de concreto)** e as cargas estabelecidas pela **NBR 6120:2019 (Ações para o cálculo de estruturas de edificações)**.",
             "\n---"
-        ]
-
+        ])
         for res in resultados:
-            md.append(f"\n## 2. ANÁLISE DA LAJE: {res.tipo_laje} (ID: {res.lx}x{res.ly})")
-            
-            # 2.1 Dados de Entrada
-            md.append("\n### 2.1 Dados de Entrada")
-            md.append(f"* **Geometria:** {res.lx:.2f} m x {res.ly:.2f} m")
-            md.append(f"* **Espessura (h):** {res.h_cm:.1f} cm (Altura útil d = {res.d_cm:.1f} cm)")
-            md.append(f"* **Cobrimento Nominal:** {res.cobrimento_mm:.1f} mm")
-            
-            # 2.2 Carregamento
-            md.append("\n### 2.2 Carregamento e Combinações")
-            md.append("| Descrição | Valor (kN/m²) |")
-            md.append("| :--- | :--- |")
-            md.append(f"| Peso Próprio | {res.peso_proprio:.2f} |")
-            md.append(f"| Carga Total (Calculada $p_d$) | **{res.carga_total_distribuida:.2f}** |")
-
-            # 2.3 Esforços
-            md.append("\n### 2.3 Análise Estrutural (Momentos de Cálculo)")
-            md.append(f"Utilizado método de Marcus/Bares para $\\lambda = {res.ly/res.lx:.2f}$.")
-            md.append(f"* $M_{{dx}}$: {res.momentos_kNm.get('mx', 0):.2f} kNm/m")
-            md.append(f"* $M_{{dy}}$: {res.momentos_kNm.get('my', 0):.2f} kNm/m")
-            
-            m_neg_x = res.momentos_kNm.get('mx_neg', 0)
-            m_neg_y = res.momentos_kNm.get('my_neg', 0)
-            if m_neg_x > 0 or m_neg_y > 0:
-                md.append(f"* $M_{{neg}}$ Máximo: {max(m_neg_x, m_neg_y):.2f} kNm/m")
-
-            # 2.4 Dimensionamento ELU
-            md.append("\n### 2.4 Dimensionamento (ELU)")
-            md.append(f"* **Armadura Principal (X):** {res.detalhamento.get('mx', 'Mínima')} (Teórico: {res.as_teorico.get('mx', 0):.2f} cm²/m)")
-            md.append(f"* **Armadura Secundária (Y):** {res.detalhamento.get('my', 'Mínima')} (Teórico: {res.as_teorico.get('my', 0):.2f} cm²/m)")
-            md.append(f"* **Cisalhamento:** Ratio {res.cortante.get('ratio', 0)} - Status: {res.cortante.get('status', 'OK')}")
-
-            # 2.5 ELS
-            md.append("\n### 2.5 Verificações de Serviço (ELS)")
-            md.append(f"* **Flecha Total:** {res.flecha_total_mm:.2f} mm (Limite $L/250$: {res.flecha_limite_mm:.2f} mm)")
-            if res.contraflecha_mm > 0:
-                md.append(f"* **Contraflecha Sugerida:** {res.contraflecha_mm:.1f} mm")
-            md.append(f"* **Abertura de Fissuras ($w_k$):** {res.wk_max_mm:.3f} mm - Status: {res.status_servico}")
-
-            # 2.6 Quantitativos
-            md.append("\n### 2.6 Quantitativos Estritos")
-            md.append(f"* Volume de Concreto: {res.volume_concreto:.2f} m³")
-            md.append(f"* Peso de Aço Estimado: {res.peso_aco_estimado:.2f} kg")
-            md.append(f"* Taxa de Aço: {res.taxa_aco_m2:.2f} kg/m²")
-            md.append("\n---")
-
-        md.append("\n**Responsável Técnico:** Software PyLaje - NBR 6118:2023")
-        
-        return "\n".join(md)
+            yield _secao_laje(_chave_secao(res))
+        yield "\n\n**Responsável Técnico:** Software PyLaje - NBR 6118:2023"
+
+    @staticmethod
+    def escrever_markdown(resultados: Iterable[AnalysisResult], caminho: str,
+                          titulo_projeto: str = "Projeto Residencial") -> bool:
+        """Grava o memorial direto no arquivo, seção a seção."""
+        try:
+            with open(caminho, 'w', encoding='utf-8') as f:
+                f.writelines(MemorialService.iterar_markdown(resultados, titulo_projeto))
+            return True
+        except Exception as e:
+            print(f"Erro ao salvar memorial: {e}")
+            return False
+
+    @staticmethod
+    def estatisticas_cache():
+        """Acertos/faltas do cache de seções (functools._CacheInfo)."""
+        return _secao_laje.cache_info()
+
+    @staticmethod
+    def limpar_cache():
+        _secao_laje.cache_clear()
 
     @staticmethod
     def salvar_arquivo(conteudo: str, caminho: str):
@@ -0,0 +1,235 @@
+"""
+Monitoramento de memória por fase (modo opcional de diagnóstico).
+
+Usa os mesmos pontos de medição do rastreamento de tempo (app.services.tracing):
+os trechos listados em FASES viram fases de memória. Em cada fase são
+registrados o crescimento e o pico da memória alocada pelo Python (tracemalloc),
+o RSS no início/fim, o pico de RSS e as linhas de código que mais cresceram
+(comparação de snapshots). Com um orçamento de RSS, a execução é interrompida
+com MemoriaExcedida (e o relatório até ali) antes de o sistema começar a usar swap:
+
+    from app.services import memory_monitor
+    monitor = memory_monitor.ativar(orcamento_mb=2048)
+    try:
+        manager.calcular_e_exportar_vigas("vigas.json")
+    finally:
+        memory_monitor.desativar()
+    print(monitor.relatorio())
+
+O RSS é o do próprio processo: lotes distribuídos entre processos
+(BatchExecutor acima de LOTE_LIMIAR_PARALELO) não entram na conta.
+"""
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.services import tracing
+from config import settings
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+# Trecho (ver tracing) -> fase
+FASES: Dict[str, str] = {
+    "construcao_pavimento": "Construção do pavimento",
+    "leitura_pavimento": "Leitura do pavimento (projeto)",
+    "GerenciadorPavimento.recalcular_vinculos": "Vínculos",
+    "GerenciadorPavimento.distribuir_cargas_paredes": "Distribuição das paredes",
+    "GerenciadorPavimento.analisar": "Análise das lajes",
+    "agregacao_vigas": "Agregação das vigas",
+    "gravacao": "Exportação",
+}
+
+_MB = 1024 * 1024
+# Alocações do próprio tracemalloc (snapshots) não entram na lista de maiores alocações
+_IGNORADOS = {tracemalloc.__file__, "<frozen importlib._bootstrap>"}
+_PAGINA = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_atual() -> int:
+    """RSS do processo em bytes (Linux: /proc; demais: pico desde o início, via getrusage)."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGINA
+    except OSError:
+        return _rss_pico_total()
+
+
+def _rss_pico_total() -> int:
+    if resource is None:
+        return 0
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == "darwin" else pico * 1024 # Linux informa em KB
+
+
+def _rss_pico() -> int:
+    """Pico de RSS desde o último _zerar_pico_rss (VmHWM no Linux)."""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for linha in f:
+                if linha.startswith("VmHWM:"):
+                    return int(linha.split()[1]) * 1024
+    except OSError:
+        pass
+    return _rss_pico_total()
+
+
+def _zerar_pico_rss() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False # Sem permissão/outro SO: o pico passa a ser o do processo inteiro
+
+
+class MemoriaExcedida(MemoryError):
+    def __init__(self, mensagem: str, relatorio: str):
+        super().__init__(f"{mensagem}\n{relatorio}")
+        self.relatorio = relatorio
+
+
+@dataclass
+class RegistroFase:
+    fase: str
+    nivel: int                # Fases abertas por fora desta
+    rss_inicio: int
+    rss_fim: int = 0
+    rss_pico: int = 0
+    alocado_inicio: int = 0
+    alocado_fim: int = 0
+    alocado_pico: int = 0
+    maiores: List[str] = field(default_factory=list) # Linhas que mais cresceram (tracemalloc)
+    concluida: bool = False
+
+
+class MonitorMemoria(tracing.Rastreador):
+    def __init__(self, orcamento_mb: Optional[float] = settings.MEMORIA_ORCAMENTO_MB,
+                 top: int = settings.MEMORIA_TOP_ALOCADORES, quadros: int = 1,
+                 perfil_trecho: Optional[str] = None, perfil_lentos: int = 0):
+        super().__init__(perfil_trecho, perfil_lentos)
+        self.orcamento = None if orcamento_mb is None else int(orcamento_mb * _MB)
+        self.top = top
+        self.fases: List[RegistroFase] = []
+        # Fases abertas em todas as threads (os picos são do processo inteiro);
+        # o par abertura/fechamento usa a pilha da própria thread (_pilha_fases)
+        self._abertas: List[RegistroFase] = []
+        self._contador = 0
+        self._parou_tracemalloc = not tracemalloc.is_tracing()
+        if self._parou_tracemalloc:
+            tracemalloc.start(quadros)
+        self._pico_por_fase = _zerar_pico_rss()
+
+    def _pilha_fases(self) -> List[tuple]:
+        """(registro, snapshot inicial) das fases abertas nesta thread."""
+        pilha = getattr(self._local, 'fases', None)
+        if pilha is None:
+            pilha = self._local.fases = []
+        return pilha
+
+    def encerrar(self):
+        if self._parou_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    # --- Picos aninhados: zerar o pico para a fase filha sem perder o da fase mãe ---
+
+    def _acumular_picos(self):
+        alocado_pico = tracemalloc.get_traced_memory()[1]
+        rss_pico = _rss_pico()
+        with self._trava:
+            abertas = list(self._abertas)
+        for registro in abertas:
+            registro.alocado_pico = max(registro.alocado_pico, alocado_pico)
+            registro.rss_pico = max(registro.rss_pico, rss_pico)
+        tracemalloc.reset_peak()
+        if self._pico_por_fase:
+            _zerar_pico_rss()
+
+    def _ao_abrir(self, aberto):
+        fase = FASES.get(aberto.nome)
+        if fase is None:
+            return
+        self._verificar_orcamento(rss_atual())
+        self._acumular_picos()
+        alocado = tracemalloc.get_traced_memory()[0]
+        rss = rss_atual()
+        pilha = self._pilha_fases()
+        registro = RegistroFase(fase, len(pilha), rss, rss_pico=rss,
+                                alocado_inicio=alocado, alocado_pico=alocado)
+        with self._trava:
+            self.fases.append(registro)
+            self._abertas.append(registro)
+        pilha.append((registro, tracemalloc.take_snapshot()))
+
+    def _ao_fechar(self, aberto):
+        pilha = self._pilha_fases()
+        if FASES.get(aberto.nome) is None or not pilha:
+            self._contador += 1
+            if self._contador % settings.MEMORIA_INTERVALO_VERIFICACAO == 0:
+                self._verificar_orcamento(rss_atual())
+            return
+        self._acumular_picos()
+        registro, inicio = pilha.pop()
+        with self._trava:
+            self._abertas.remove(registro)
+        registro.rss_fim = rss_atual()
+        registro.alocado_fim = tracemalloc.get_traced_memory()[0]
+        diferencas = (d for d in tracemalloc.take_snapshot().compare_to(inicio, 'lineno')
+                      if d.size_diff > 0 and d.traceback[0].filename not in _IGNORADOS)
+        registro.maiores = [str(d) for _, d in zip(range(self.top), diferencas)]
+        registro.concluida = True
+        self._verificar_orcamento(registro.rss_fim)
+
+    def _verificar_orcamento(self, rss: int):
+        if self.orcamento is None or rss <= self.orcamento:
+            return
+        pilha = self._pilha_fases()
+        with self._trava:
+            aberta = pilha[-1][0] if pilha else (self._abertas[-1] if self._abertas else None)
+        aberta = aberta.fase if aberta is not None else "fora das fases monitoradas"
+        mensagem = (f"Orçamento de memória excedido: RSS {rss / _MB:.0f} MB > "
+                    f"{self.orcamento / _MB:.0f} MB (fase: {aberta}).")
+        self.orcamento = None # Um único aviso: a limpeza após a exceção não deve disparar outro
+        raise MemoriaExcedida(mensagem, self.relatorio())
+
+    # --- Relatório ---
+
+    def relatorio(self) -> str:
+        linhas = ["--- Memória por fase ---",
+                  f"{'fase':<44} {'Δ alocado':>10} {'pico aloc.':>10} {'RSS início':>10} {'RSS fim':>10} "
+                  f"{'pico RSS':>10}  (MB)"]
+        if not self._pico_por_fase:
+            linhas.append("(pico de RSS: máximo do processo inteiro, sem zerar por fase)")
+        for r in self.fases:
+            rotulo = "  " * r.nivel + r.fase + ("" if r.concluida else " (em andamento)")
+            fim_rss = r.rss_fim if r.concluida else rss_atual()
+            pico_rss = r.rss_pico if r.concluida else max(r.rss_pico, _rss_pico())
+            fim_aloc = r.alocado_fim if r.concluida else tracemalloc.get_traced_memory()[0]
+            linhas.append(f"{rotulo:<44} {(fim_aloc - r.alocado_inicio) / _MB:>10.1f} "
+                          f"{r.alocado_pico / _MB:>10.1f} {r.rss_inicio / _MB:>10.1f} {fim_rss / _MB:>10.1f} "
+                          f"{pico_rss / _MB:>10.1f}")
+        for r in self.fases:
+            if r.maiores:
+                linhas.append(f"Maiores alocações — {r.fase}:")
+                linhas.extend(f"  {m}" for m in r.maiores)
+        return "\n".join(linhas)
+
+
+def ativar(orcamento_mb: Optional[float] = settings.MEMORIA_ORCAMENTO_MB, **kwargs) -> MonitorMemoria:
+    """Liga o monitoramento (substitui o rastreamento de tempo ativo, que continua medindo tempos)."""
+    anterior = tracing.rastreador_atual()
+    if isinstance(anterior, MonitorMemoria):
+        anterior.encerrar()
+    monitor = MonitorMemoria(orcamento_mb, **kwargs)
+    return tracing.instalar(monitor)
+
+
+def desativar() -> Optional[MonitorMemoria]:
+    monitor = tracing.desativar()
+    if isinstance(monitor, MonitorMemoria):
+        monitor.encerrar()
+    return monitor
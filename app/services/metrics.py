@@ -0,0 +1,247 @@
+"""
+Métricas de execução: contadores, medidores e histogramas.
+
+As métricas são declaradas uma vez, no módulo que as alimenta, e ficam no
+REGISTRO global. Desligado (padrão), inc()/observar()/definir() retornam na
+primeira linha e @cronometrar chama a função direto. Ligado (ativar()), os
+valores acumulam até serem exportados em texto Prometheus ou JSON:
+
+    from app.services import metrics
+    metrics.ativar()
+    manager.calcular_e_exportar_vigas("vigas.json")
+    metrics.exportar("metricas.prom")   # ou .json
+
+Valores que já existem em outro lugar (ex: estatísticas de lru_cache) entram
+por coletores: funções chamadas só no momento da exportação, sem custo no
+caminho de cálculo.
+"""
+import bisect
+import functools
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+CONTADOR, MEDIDOR, HISTOGRAMA = "counter", "gauge", "histogram"
+# Limites (s) dos histogramas de latência: de 10 µs a 10 s
+LIMITES_LATENCIA = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 0.1, 1.0, 10.0)
+
+_ativo = False
+
+
+def ativo() -> bool:
+    return _ativo
+
+
+class _Serie:
+    __slots__ = ('rotulos', 'valor', 'contagens', 'soma', 'limites', '_trava')
+
+    def __init__(self, rotulos: Tuple[Tuple[str, str], ...], limites: Optional[Sequence[float]] = None):
+        self.rotulos = rotulos
+        self.limites = limites
+        self._trava = threading.Lock()
+        self.zerar()
+
+    def zerar(self):
+        self.valor = 0.0
+        self.soma = 0.0
+        self.contagens = [0] * (len(self.limites) + 1) if self.limites is not None else None
+
+    def inc(self, n: float = 1):
+        if not _ativo:
+            return
+        with self._trava:
+            self.valor += n
+
+    def definir(self, valor: float):
+        if not _ativo:
+            return
+        self.valor = valor
+
+    def observar(self, valor: float):
+        if not _ativo:
+            return
+        i = bisect.bisect_left(self.limites, valor)
+        with self._trava:
+            self.contagens[i] += 1
+            self.soma += valor
+            self.valor += 1 # Número de observações
+
+
+class Metrica:
+    def __init__(self, nome: str, ajuda: str, tipo: str, rotulos: Sequence[str] = (),
+                 limites: Optional[Sequence[float]] = None):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.tipo = tipo
+        self.nomes_rotulos = tuple(rotulos)
+        self.limites = tuple(limites) if limites is not None else None
+        self._series: Dict[Tuple[str, ...], _Serie] = {}
+        if not self.nomes_rotulos:
+            self._padrao = self.com()
+
+    def com(self, **rotulos: str) -> _Serie:
+        """Série com estes rótulos (criada no primeiro uso; guarde-a para o caminho quente)."""
+        chave = tuple(str(rotulos[r]) for r in self.nomes_rotulos)
+        serie = self._series.get(chave)
+        if serie is None:
+            serie = self._series[chave] = _Serie(tuple(zip(self.nomes_rotulos, chave)), self.limites)
+        return serie
+
+    # Atalhos para métricas sem rótulos
+    def inc(self, n: float = 1):
+        self._padrao.inc(n)
+
+    def definir(self, valor: float):
+        self._padrao.definir(valor)
+
+    def observar(self, valor: float):
+        self._padrao.observar(valor)
+
+    def series(self) -> List[_Serie]:
+        return list(self._series.values())
+
+    def zerar(self):
+        for s in self._series.values():
+            s.zerar()
+
+
+class RegistroMetricas:
+    def __init__(self):
+        self.metricas: Dict[str, Metrica] = {}
+        self.coletores: List[Callable[[], None]] = []
+
+    def _registrar(self, nome: str, ajuda: str, tipo: str, rotulos: Sequence[str], limites=None) -> Metrica:
+        existente = self.metricas.get(nome)
+        if existente is not None:
+            if existente.tipo != tipo:
+                raise ValueError(f"Métrica '{nome}' já registrada como {existente.tipo}.")
+            return existente
+        metrica = self.metricas[nome] = Metrica(nome, ajuda, tipo, rotulos, limites)
+        return metrica
+
+    def contador(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Metrica:
+        return self._registrar(nome, ajuda, CONTADOR, rotulos)
+
+    def medidor(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Metrica:
+        return self._registrar(nome, ajuda, MEDIDOR, rotulos)
+
+    def histograma(self, nome: str, ajuda: str, limites: Sequence[float] = LIMITES_LATENCIA,
+                   rotulos: Sequence[str] = ()) -> Metrica:
+        return self._registrar(nome, ajuda, HISTOGRAMA, rotulos, sorted(limites))
+
+    def coletor(self, funcao: Callable[[], None]) -> Callable[[], None]:
+        """Registra `funcao` (atualiza medidores/contadores) para rodar antes de cada exportação."""
+        self.coletores.append(funcao)
+        return funcao
+
+    def zerar(self):
+        for m in self.metricas.values():
+            m.zerar()
+
+    def _coletar(self):
+        for funcao in self.coletores:
+            funcao()
+
+    # --- Exportação ---
+
+    def para_dict(self) -> dict:
+        self._coletar()
+        saida = {}
+        for m in self.metricas.values():
+            series = []
+            for s in m.series():
+                item = {"rotulos": dict(s.rotulos)}
+                if m.tipo == HISTOGRAMA:
+                    item.update(contagem=int(s.valor), soma=s.soma,
+                                faixas={str(l): c for l, c in zip(list(m.limites) + ["+Inf"], _acumulado(s.contagens))})
+                else:
+                    item["valor"] = s.valor
+                series.append(item)
+            saida[m.nome] = {"tipo": m.tipo, "ajuda": m.ajuda, "series": series}
+        return saida
+
+    def texto_prometheus(self) -> str:
+        self._coletar()
+        linhas = []
+        for m in self.metricas.values():
+            linhas.append(f"# HELP {m.nome} {m.ajuda}")
+            linhas.append(f"# TYPE {m.nome} {m.tipo}")
+            for s in m.series():
+                if m.tipo == HISTOGRAMA:
+                    for limite, c in zip(list(m.limites) + ["+Inf"], _acumulado(s.contagens)):
+                        linhas.append(f"{m.nome}_bucket{_rotulos(s.rotulos + (('le', str(limite)),))} {c}")
+                    linhas.append(f"{m.nome}_sum{_rotulos(s.rotulos)} {_numero(s.soma)}")
+                    linhas.append(f"{m.nome}_count{_rotulos(s.rotulos)} {int(s.valor)}")
+                else:
+                    linhas.append(f"{m.nome}{_rotulos(s.rotulos)} {_numero(s.valor)}")
+        return "\n".join(linhas) + "\n"
+
+    def exportar(self, caminho: str):
+        """JSON se o arquivo terminar em .json; senão, texto Prometheus."""
+        with open(caminho, 'w', encoding='utf-8') as f:
+            if caminho.lower().endswith(".json"):
+                json.dump(self.para_dict(), f, indent=4, ensure_ascii=False)
+            else:
+                f.write(self.texto_prometheus())
+
+
+def _acumulado(contagens: List[int]) -> List[int]:
+    total, saida = 0, []
+    for c in contagens:
+        total += c
+        saida.append(total)
+    return saida
+
+
+def _rotulos(rotulos: Tuple[Tuple[str, str], ...]) -> str:
+    if not rotulos:
+        return ""
+    pares = ",".join(f'{k}="{v}"'.replace("\n", "\\n") for k, v in rotulos)
+    return "{" + pares + "}"
+
+
+def _numero(valor: float) -> str:
+    return str(int(valor)) if float(valor).is_integer() else repr(float(valor))
+
+
+# ==============================================================================
+# INTERFACE DO MÓDULO
+# ==============================================================================
+
+REGISTRO = RegistroMetricas()
+contador = REGISTRO.contador
+medidor = REGISTRO.medidor
+histograma = REGISTRO.histograma
+coletor = REGISTRO.coletor
+exportar = REGISTRO.exportar
+
+
+def ativar(zerar: bool = True):
+    global _ativo
+    if zerar:
+        REGISTRO.zerar()
+    _ativo = True
+
+
+def desativar():
+    global _ativo
+    _ativo = False
+
+
+def cronometrar(hist: Metrica, contagem: Optional[Metrica] = None):
+    """Decorador: observa a duração (s) de cada chamada em `hist` e incrementa `contagem`."""
+    def decorar(funcao):
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if not _ativo:
+                return funcao(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                hist.observar(time.perf_counter() - t0)
+                if contagem is not None:
+                    contagem.inc()
+        return envolvida
+    return decorar
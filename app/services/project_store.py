@@ -0,0 +1,211 @@
+"""
+Arquivo de projeto com vários pavimentos (diretório *.pylaje).
+
+Estrutura:
+    projeto.pylaje/
+        index.json                      lista de pavimentos e metadados
+        pavimentos/<arquivo>.npz        lajes, paredes, vigas, vínculos manuais, materiais
+        pavimentos/<arquivo>.res.npz    resultados da última análise (opcional)
+
+Cada pavimento é um bloco independente (colunas do SlabTable/WallTable
+comprimidas com np.savez_compressed). Abrir o projeto lê apenas o índice;
+um pavimento só é lido quando pedido. Salvar grava apenas os blocos cujas
+tabelas mudaram desde a última leitura/gravação, e o índice. Blocos que deixam
+de ser usados (pavimento removido, resultados obsoletos) só são apagados depois
+que o novo índice substituiu o anterior: o projeto no disco nunca aponta para
+um arquivo que não existe.
+"""
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.models.floor_system import GerenciadorPavimento
+from app.models.slab_table import SlabTable, WallTable
+from app.models import columnar
+from app.services.tracing import trecho
+
+FORMATO = 1
+ARQUIVO_INDICE = "index.json"
+PASTA_PAVIMENTOS = "pavimentos"
+
+
+@dataclass
+class _Pavimento:
+    nome: str
+    arquivo: str                                    # Nome base do bloco (sem extensão)
+    manager: Optional[GerenciadorPavimento] = None  # None = ainda não lido
+    versoes_salvas: tuple = (-1, -1)                # (lajes, paredes) na última leitura/gravação
+    resultados: Optional[np.ndarray] = None
+    resultados_versao: int = -1                     # Versão da tabela de lajes a que os resultados se referem
+    resultados_alterados: bool = False
+    tem_resultados: bool = False                    # Há bloco de resultados no disco
+
+    def versoes(self) -> tuple:
+        return (self.manager.tabela.versao, self.manager.tabela_paredes.versao)
+
+
+def _nome_arquivo(nome: str, usados) -> str:
+    base = re.sub(r'[^A-Za-z0-9_-]+', '_', nome).strip('_') or "pavimento"
+    arquivo, i = base, 2
+    while arquivo in usados:
+        arquivo, i = f"{base}_{i}", i + 1
+    return arquivo
+
+
+def _gravar_npz(caminho: str, dados: Dict[str, np.ndarray]):
+    # Grava em arquivo temporário e troca: um bloco nunca fica pela metade
+    temporario = caminho + ".tmp"
+    with open(temporario, 'wb') as f:
+        np.savez_compressed(f, **dados)
+    os.replace(temporario, caminho)
+
+
+class ProjetoPavimentos:
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._pavimentos: List[_Pavimento] = []
+        self._indice_alterado = True
+        self._apagar_ao_salvar: List[str] = [] # Blocos obsoletos, apagados após a troca do índice
+        self.blocos_gravados = 0 # Contador da última gravação (diagnóstico)
+
+    # --- Abertura ---
+
+    @classmethod
+    def abrir(cls, caminho: str) -> "ProjetoPavimentos":
+        """Lê só o índice; os pavimentos são carregados sob demanda em pavimento()."""
+        projeto = cls(caminho)
+        with open(os.path.join(caminho, ARQUIVO_INDICE), 'r', encoding='utf-8') as f:
+            indice = json.load(f)
+        if indice.get("formato", 0) > FORMATO:
+            raise ValueError(f"Formato de projeto {indice['formato']} mais novo que o suportado ({FORMATO}).")
+        for p in indice["pavimentos"]:
+            projeto._pavimentos.append(_Pavimento(p["nome"], p["arquivo"], tem_resultados=p.get("resultados", False)))
+        projeto._indice_alterado = False
+        return projeto
+
+    @property
+    def nomes(self) -> List[str]:
+        return [p.nome for p in self._pavimentos]
+
+    def _buscar(self, nome: str) -> _Pavimento:
+        for p in self._pavimentos:
+            if p.nome == nome:
+                return p
+        raise KeyError(nome)
+
+    def _caminho_bloco(self, pav: _Pavimento, sufixo: str = "") -> str:
+        return os.path.join(self.caminho, PASTA_PAVIMENTOS, pav.arquivo + sufixo + ".npz")
+
+    def carregado(self, nome: str) -> bool:
+        return self._buscar(nome).manager is not None
+
+    def pavimento(self, nome: str) -> GerenciadorPavimento:
+        pav = self._buscar(nome)
+        if pav.manager is None:
+            with trecho("leitura_pavimento"):
+                with np.load(self._caminho_bloco(pav), allow_pickle=False) as dados:
+                    lajes = {k[6:]: dados[k] for k in dados.files if k.startswith("lajes/")}
+                    paredes = {k[8:]: dados[k] for k in dados.files if k.startswith("paredes/")}
+                manager = GerenciadorPavimento()
+                manager.tabela = SlabTable.de_arrays(lajes)
+                manager.tabela_paredes = WallTable.de_arrays(paredes)
+            pav.manager = manager
+            pav.versoes_salvas = pav.versoes()
+        return pav.manager
+
+    # --- Alteração ---
+
+    def adicionar_pavimento(self, nome: str, manager: GerenciadorPavimento):
+        if nome in self.nomes:
+            raise ValueError(f"Já existe um pavimento '{nome}'.")
+        # Blocos à espera de remoção ainda são do índice gravado: o nome não pode ser reaproveitado
+        usados = {p.arquivo for p in self._pavimentos}
+        usados.update(os.path.basename(c).split(".")[0] for c in self._apagar_ao_salvar)
+        arquivo = _nome_arquivo(nome, usados)
+        self._pavimentos.append(_Pavimento(nome, arquivo, manager)) # versoes_salvas=(-1,-1): bloco novo
+        self._indice_alterado = True
+
+    def remover_pavimento(self, nome: str):
+        pav = self._buscar(nome)
+        self._pavimentos.remove(pav)
+        self._apagar_ao_salvar.extend(self._caminho_bloco(pav, sufixo) for sufixo in ("", ".res"))
+        self._indice_alterado = True
+
+    # --- Resultados em cache ---
+
+    def definir_resultados(self, nome: str, saida: np.ndarray, versao_tabela: int):
+        """Guarda a matriz de resultados (n x COLUNAS_RESULTADO) obtida com a tabela na versão informada."""
+        pav = self._buscar(nome)
+        pav.resultados = saida
+        pav.resultados_versao = versao_tabela
+        pav.resultados_alterados = True
+
+    def resultados(self, nome: str) -> Optional[np.ndarray]:
+        """Resultados ainda válidos para o pavimento (None se não houver ou se ele mudou desde a análise)."""
+        pav = self._buscar(nome)
+        manager = self.pavimento(nome)
+        if pav.resultados is None and pav.tem_resultados and not pav.resultados_alterados:
+            with np.load(self._caminho_bloco(pav, ".res"), allow_pickle=False) as dados:
+                if list(dados['colunas']) == list(columnar.COLUNAS_RESULTADO):
+                    pav.resultados = dados['resultados']
+                    pav.resultados_versao = pav.versoes_salvas[0]
+        if pav.resultados is None or pav.resultados_versao != manager.tabela.versao:
+            return None
+        return pav.resultados
+
+    # --- Gravação ---
+
+    def alterados(self) -> List[str]:
+        """Pavimentos com alterações ainda não gravadas."""
+        return [p.nome for p in self._pavimentos
+                if p.resultados_alterados or (p.manager is not None and p.versoes() != p.versoes_salvas)]
+
+    def salvar(self) -> int:
+        """Grava os blocos alterados (e o índice, se preciso). Retorna o número de arquivos gravados."""
+        os.makedirs(os.path.join(self.caminho, PASTA_PAVIMENTOS), exist_ok=True)
+        gravados = 0
+        for pav in self._pavimentos:
+            if pav.manager is not None and pav.versoes() != pav.versoes_salvas:
+                dados = {f"lajes/{k}": v for k, v in pav.manager.tabela.para_arrays().items()}
+                dados.update({f"paredes/{k}": v for k, v in pav.manager.tabela_paredes.para_arrays().items()})
+                _gravar_npz(self._caminho_bloco(pav), dados)
+                pav.versoes_salvas = pav.versoes()
+                gravados += 1
+                if pav.resultados_versao != pav.versoes_salvas[0]:
+                    # Resultados de uma geometria anterior: não vão para o disco
+                    pav.resultados, pav.resultados_alterados = None, False
+                    if pav.tem_resultados:
+                        self._apagar_ao_salvar.append(self._caminho_bloco(pav, ".res"))
+                        pav.tem_resultados = False
+                        self._indice_alterado = True
+            if pav.resultados_alterados:
+                _gravar_npz(self._caminho_bloco(pav, ".res"),
+                            {'resultados': pav.resultados, 'colunas': np.array(columnar.COLUNAS_RESULTADO, dtype=str)})
+                pav.resultados_alterados = False
+                if not pav.tem_resultados:
+                    pav.tem_resultados = True
+                    self._indice_alterado = True
+                gravados += 1
+
+        if self._indice_alterado:
+            indice = {"formato": FORMATO,
+                      "pavimentos": [{"nome": p.nome, "arquivo": p.arquivo, "resultados": p.tem_resultados}
+                                     for p in self._pavimentos]}
+            temporario = os.path.join(self.caminho, ARQUIVO_INDICE + ".tmp")
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(indice, f, indent=2, ensure_ascii=False)
+            os.replace(temporario, os.path.join(self.caminho, ARQUIVO_INDICE))
+            self._indice_alterado = False
+            gravados += 1
+
+        for caminho in self._apagar_ao_salvar:
+            if os.path.exists(caminho):
+                os.remove(caminho)
+        self._apagar_ao_salvar.clear()
+
+        self.blocos_gravados = gravados
+        return gravados
@@ -0,0 +1,183 @@
+"""
+Levantamento de quantitativos por pavimento e por edifício.
+
+Concreto, fôrma, aço por bitola e blocos de enchimento (lajes treliçadas,
+modelos do catálogo) calculados em bloco sobre as matrizes colunares do
+pavimento (ver app.models.columnar):
+
+    entrada: SlabTable.matriz_entrada()  (n x COLUNAS_LAJE)
+    saida:   GerenciadorPavimento.analisar()  (n x COLUNAS_RESULTADO)
+
+Cada laje vira uma linha de parcelas (uma coluna por item de ITENS), somadas
+por grupo com np.bincount. O pavimento guarda as parcelas de cada laje, de
+forma que reanalisar algumas lajes só troca as linhas delas nos totais.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.models import columnar
+from app.services.catalog_service import catalog_service
+
+_COL = {nome: i for i, nome in enumerate(columnar.COLUNAS_RESULTADO)}
+_COLS_BITOLA = [_COL[f'detalhamento.{p}.bitola'] for p in columnar.POSICOES]
+_COLS_ESPACAMENTO = [_COL[f'detalhamento.{p}.espacamento'] for p in columnar.POSICOES]
+_IDX_TIPO, _IDX_LX, _IDX_LY = 0, 1, 2
+_IDX_SAPATA, _IDX_ENCH = 18, slice(19, 22) # largura_sapata; altura, largura, comprimento (cm)
+
+# Mesmos fatores de SlabController.run_analysis (peso_aco_estimado)
+FATOR_AREA_POSICAO = np.array([0.30 if "neg" in p else 1.0 for p in columnar.POSICOES])
+FATOR_PERDAS_ACO = 1.15
+
+_TIPO_TRELICADA = float(columnar.TIPOS_LAJE.index("LajeTrelicada"))
+OUTROS_BLOCOS = "Outros"
+
+
+def _catalogo_bitolas():
+    bitolas = sorted(catalog_service.get_todas_bitolas(), key=lambda b: b["diametro_mm"])
+    return (np.array([b["diametro_mm"] for b in bitolas], dtype=np.float64),
+            np.array([b["massa_kg_m"] for b in bitolas], dtype=np.float64))
+
+
+def _catalogo_enchimentos():
+    modelos = catalog_service.get_todos_enchimentos()
+    dims = np.array([[e["altura_h_cm"], e["largura_b_cm"], e.get("comprimento_cm", 30.0)] for e in modelos],
+                    dtype=np.float64).reshape(-1, 3)
+    return [e["modelo"] for e in modelos], dims
+
+
+DIAMETROS, MASSAS_KG_M = _catalogo_bitolas()
+MODELOS_ENCHIMENTO, _DIMS_ENCHIMENTO = _catalogo_enchimentos()
+
+# Itens (colunas das parcelas): concreto, fôrma, aço por bitola, blocos por modelo
+ITENS: List[str] = (["concreto_m3", "forma_m2", "aco_kg"]
+                    + [f"aco_phi{d:g}_kg" for d in DIAMETROS]
+                    + [f"blocos_{m}" for m in MODELOS_ENCHIMENTO + [OUTROS_BLOCOS]])
+_I_CONCRETO, _I_FORMA, _I_ACO, _I_BITOLAS = 0, 1, 2, 3
+_I_BLOCOS = _I_BITOLAS + len(DIAMETROS)
+N_ITENS = len(ITENS)
+
+
+def parcelas(entrada: np.ndarray, saida: np.ndarray) -> np.ndarray:
+    """
+    Quantitativos de cada laje: matriz (n x N_ITENS).
+    Fôrma só nas maciças (nas treliçadas os blocos fazem o papel de fôrma perdida).
+    """
+    n = saida.shape[0]
+    p = np.zeros((n, N_ITENS), dtype=np.float64)
+    if n == 0:
+        return p
+    area = entrada[:, _IDX_LX] * entrada[:, _IDX_LY]
+    trelicada = entrada[:, _IDX_TIPO] == _TIPO_TRELICADA
+
+    p[:, _I_CONCRETO] = saida[:, _COL['volume_concreto']]
+    p[:, _I_FORMA] = np.where(trelicada, 0.0, area)
+
+    # Aço: (100 / s) barras por metro x massa linear x área x fator da posição, agrupado por bitola
+    phi = saida[:, _COLS_BITOLA]
+    s = saida[:, _COLS_ESPACAMENTO]
+    k = np.searchsorted(DIAMETROS, phi)
+    k_valido = np.minimum(k, len(DIAMETROS) - 1)
+    valido = (phi > 0) & (s > 0) & (k < len(DIAMETROS)) & (DIAMETROS[k_valido] == phi)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        peso = np.where(valido, 100.0 / s * MASSAS_KG_M[k_valido], 0.0)
+    peso *= area[:, None] * FATOR_AREA_POSICAO * FATOR_PERDAS_ACO
+    linhas = np.repeat(np.arange(n), len(columnar.POSICOES))
+    grupo = linhas * len(DIAMETROS) + k_valido.ravel()
+    p[:, _I_BITOLAS:_I_BLOCOS] = np.bincount(grupo, weights=peso.ravel(),
+                                             minlength=n * len(DIAMETROS)).reshape(n, len(DIAMETROS))
+    p[:, _I_ACO] = p[:, _I_BITOLAS:_I_BLOCOS].sum(axis=1)
+
+    # Blocos de enchimento: (1 / intereixo) nervuras por metro x (1 / comprimento) blocos por nervura
+    idx = np.nonzero(trelicada)[0]
+    if idx.size:
+        dims = entrada[idx, _IDX_ENCH]
+        intereixo = dims[:, 1] / 100.0 + entrada[idx, _IDX_SAPATA]
+        qtd = area[idx] / intereixo / (dims[:, 2] / 100.0)
+        iguais = (dims[:, None, :] == _DIMS_ENCHIMENTO[None, :, :]).all(axis=2)
+        modelo = np.where(iguais.any(axis=1), iguais.argmax(axis=1), len(MODELOS_ENCHIMENTO))
+        p[idx, _I_BLOCOS + modelo] = qtd
+    return p
+
+
+def resumo(totais: np.ndarray) -> Dict[str, object]:
+    """Totais (N_ITENS) em forma legível; bitolas e modelos sem quantidade são omitidos."""
+    aco = {f"Ø{d:g}": round(float(v), 1) for d, v in zip(DIAMETROS, totais[_I_BITOLAS:_I_BLOCOS]) if v > 0}
+    blocos = {m: int(np.ceil(v)) for m, v in zip(MODELOS_ENCHIMENTO + [OUTROS_BLOCOS], totais[_I_BLOCOS:]) if v > 0}
+    return {
+        "concreto_m3": round(float(totais[_I_CONCRETO]), 2),
+        "forma_m2": round(float(totais[_I_FORMA]), 2),
+        "aco_kg": round(float(totais[_I_ACO]), 1),
+        "aco_por_bitola_kg": aco,
+        "blocos_enchimento": blocos,
+    }
+
+
+class QuantitativoPavimento:
+    def __init__(self, entrada: Optional[np.ndarray] = None, saida: Optional[np.ndarray] = None):
+        self.parcelas = np.zeros((0, N_ITENS), dtype=np.float64)
+        self.totais = np.zeros(N_ITENS, dtype=np.float64)
+        if entrada is not None and saida is not None:
+            self.definir(entrada, saida)
+
+    @property
+    def n(self) -> int:
+        return self.parcelas.shape[0]
+
+    def definir(self, entrada: np.ndarray, saida: np.ndarray):
+        """Recalcula todas as lajes (nova análise do pavimento ou lajes inseridas/removidas)."""
+        self.parcelas = parcelas(entrada, saida)
+        self.totais = self.parcelas.sum(axis=0)
+
+    def atualizar(self, indices: Sequence[int], entrada: np.ndarray, saida: np.ndarray):
+        """
+        Lajes reanalisadas: `entrada` e `saida` trazem apenas as linhas de `indices`.
+        Os totais são corrigidos pela diferença, sem somar o pavimento de novo.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        novas = parcelas(entrada, saida)
+        self.totais += novas.sum(axis=0) - self.parcelas[indices].sum(axis=0)
+        self.parcelas[indices] = novas
+
+    def resumo(self) -> Dict[str, object]:
+        return resumo(self.totais)
+
+
+class QuantitativoEdificio:
+    """Pavimentos por nome (ex: os de um ProjetoPavimentos); `repeticoes` conta pavimentos-tipo."""
+    def __init__(self):
+        self.pavimentos: Dict[str, QuantitativoPavimento] = {}
+        self.repeticoes: Dict[str, int] = {}
+
+    @classmethod
+    def de_projeto(cls, projeto) -> "QuantitativoEdificio":
+        """Pavimentos de um ProjetoPavimentos com resultados válidos (os demais ficam de fora)."""
+        edificio = cls()
+        for nome in projeto.nomes:
+            saida = projeto.resultados(nome)
+            if saida is not None:
+                edificio.definir_pavimento(nome, projeto.pavimento(nome).tabela.matriz_entrada(), saida)
+        return edificio
+
+    def definir_pavimento(self, nome: str, entrada: np.ndarray, saida: np.ndarray, repeticoes: int = 1):
+        self.pavimentos[nome] = QuantitativoPavimento(entrada, saida)
+        self.repeticoes[nome] = repeticoes
+
+    def atualizar_lajes(self, nome: str, indices: Sequence[int], entrada: np.ndarray, saida: np.ndarray):
+        self.pavimentos[nome].atualizar(indices, entrada, saida)
+
+    def remover_pavimento(self, nome: str):
+        self.pavimentos.pop(nome, None)
+        self.repeticoes.pop(nome, None)
+
+    def totais(self) -> np.ndarray:
+        total = np.zeros(N_ITENS, dtype=np.float64)
+        for nome, q in self.pavimentos.items():
+            total += q.totais * self.repeticoes.get(nome, 1)
+        return total
+
+    def resumo(self) -> Dict[str, object]:
+        return resumo(self.totais())
+
+    def resumo_por_pavimento(self) -> Dict[str, Dict[str, object]]:
+        return {nome: q.resumo() for nome, q in self.pavimentos.items()}
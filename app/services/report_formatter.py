@@ -55,6 +55,7 @@ class ReportFormatter:
 
     @staticmethod
     def save_json(res: AnalysisResult, filepath: str):
-        data = dataclasses.asdict(res)
+        # CompactAnalysisResult expõe to_dict() com o mesmo conteúdo de asdict()
+        data = res.to_dict() if hasattr(res, 'to_dict') else dataclasses.asdict(res)
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=4, ensure_ascii=False)
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""
+Banco local (sqlite) de resultados por revisão de projeto.
+
+Cada linha é o resultado de uma laje, identificada por projeto, pavimento,
+revisão e id da laje. O registro completo fica em `dados` (a linha de
+COLUNAS_RESULTADO em float64, sem perdas: ver app.models.columnar); os campos
+usados em filtros e comparações são repetidos em colunas próprias e indexados.
+
+Uso típico:
+    banco = BancoResultados("resultados.sqlite")
+    banco.gravar_revisao("Edifício A", "Tipo", 12, manager.tabela.ids, manager.analisar())
+    falhas = banco.consultar("Edifício A", revisao=12, status_servico="FALHA")
+    banco.exportar_memorial(falhas, "falhas_rev12.md")
+    delta = banco.delta("Edifício A", 10, 11, campo="taxa_aco_m2")
+"""
+import dataclasses
+import json
+import sqlite3
+from typing import Any, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from app.models import columnar
+from app.models.value_objects import AnalysisResult
+from app.services.memorial_service import MemorialService
+
+_COL = {nome: i for i, nome in enumerate(columnar.COLUNAS_RESULTADO)}
+
+# Colunas do resultado repetidas na tabela para filtros/comparações (nome SQL -> coluna)
+CAMPOS = {
+    'h_cm': 'h_cm',
+    'taxa_aco_m2': 'taxa_aco_m2',
+    'peso_aco_estimado': 'peso_aco_estimado',
+    'volume_concreto': 'volume_concreto',
+    'flecha_total_mm': 'flecha_total_mm',
+    'flecha_limite_mm': 'flecha_limite_mm',
+    'wk_max_mm': 'wk_max_mm',
+    'cortante_ratio': 'cortante.ratio',
+}
+_IDX_CAMPOS = [_COL[c] for c in CAMPOS.values()]
+_IDX_ELS, _IDX_GERAL = _COL['status_servico'], _COL['status_geral']
+
+_ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS resultados (
+    projeto TEXT NOT NULL,
+    pavimento TEXT NOT NULL,
+    revisao INTEGER NOT NULL,
+    linha INTEGER NOT NULL,
+    laje_id TEXT NOT NULL,
+    status_servico TEXT NOT NULL,
+    status_geral TEXT NOT NULL,
+    {', '.join(f'{nome} REAL' for nome in CAMPOS)},
+    dados BLOB NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_posicao ON resultados (projeto, revisao, pavimento, linha);
+CREATE INDEX IF NOT EXISTS idx_laje ON resultados (projeto, laje_id, pavimento, revisao);
+CREATE INDEX IF NOT EXISTS idx_els ON resultados (projeto, revisao, status_servico);
+CREATE INDEX IF NOT EXISTS idx_geral ON resultados (projeto, revisao, status_geral);
+"""
+
+
+class RegistroResultado(NamedTuple):
+    projeto: str
+    pavimento: str
+    revisao: int
+    laje_id: str
+    linha: int
+    dados: bytes
+
+    def valores(self) -> np.ndarray:
+        return np.frombuffer(self.dados, dtype=np.float64)
+
+    def resultado(self) -> AnalysisResult:
+        return columnar.linha_para_resultado(self.valores())
+
+
+_SELECT = "SELECT projeto, pavimento, revisao, laje_id, linha, dados FROM resultados"
+
+
+class BancoResultados:
+    def __init__(self, caminho: str = ":memory:"):
+        self.conexao = sqlite3.connect(caminho)
+        if caminho != ":memory:":
+            self.conexao.execute("PRAGMA journal_mode=WAL")
+            self.conexao.execute("PRAGMA synchronous=NORMAL")
+        self.conexao.executescript(_ESQUEMA)
+
+    def fechar(self):
+        self.conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    # --- Gravação ---
+
+    def gravar_revisao(self, projeto: str, pavimento: str, revisao: int, ids: Sequence[str],
+                       resultados: Union[np.ndarray, Sequence[AnalysisResult]]) -> int:
+        """
+        Grava (substituindo, se já existir) a revisão de um pavimento em uma única
+        transação. `resultados`: matriz (n x COLUNAS_RESULTADO) ou lista de AnalysisResult,
+        na mesma ordem de `ids`. Retorna o número de linhas gravadas.
+        """
+        if isinstance(resultados, np.ndarray):
+            matriz = np.ascontiguousarray(resultados, dtype=np.float64)
+        else:
+            matriz = np.array([columnar.resultado_para_linha(r) for r in resultados], dtype=np.float64)
+        matriz = matriz.reshape(-1, columnar.N_COLUNAS_RESULTADO)
+        if len(ids) != matriz.shape[0]:
+            raise ValueError(f"{len(ids)} ids para {matriz.shape[0]} resultados.")
+
+        els = [columnar.STATUS_ELS[int(c)] for c in matriz[:, _IDX_ELS]]
+        geral = [columnar.STATUS_GERAL[int(c)] for c in matriz[:, _IDX_GERAL]]
+        campos = matriz[:, _IDX_CAMPOS].tolist()
+        linhas = ((projeto, pavimento, revisao, i, ids[i], els[i], geral[i], *campos[i], matriz[i].tobytes())
+                  for i in range(matriz.shape[0]))
+
+        marcadores = ", ".join("?" * (7 + len(CAMPOS) + 1))
+        with self.conexao: # Transação: tudo ou nada
+            self.conexao.execute("DELETE FROM resultados WHERE projeto = ? AND revisao = ? AND pavimento = ?",
+                                 (projeto, revisao, pavimento))
+            self.conexao.executemany(f"INSERT INTO resultados VALUES ({marcadores})", linhas)
+        # Estatísticas dos índices: sem elas o sqlite escolhe mal entre idx_posicao e idx_laje
+        self.conexao.execute("PRAGMA optimize=0x10002")
+        return matriz.shape[0]
+
+    def remover_revisao(self, projeto: str, revisao: int):
+        with self.conexao:
+            self.conexao.execute("DELETE FROM resultados WHERE projeto = ? AND revisao = ?", (projeto, revisao))
+
+    # --- Consultas ---
+
+    def revisoes(self, projeto: str) -> List[int]:
+        cur = self.conexao.execute("SELECT DISTINCT revisao FROM resultados WHERE projeto = ? ORDER BY revisao",
+                                   (projeto,))
+        return [r[0] for r in cur]
+
+    def consultar(self, projeto: str, revisao: Optional[int] = None, pavimento: Optional[str] = None,
+                  laje_id: Optional[str] = None, status_servico: Optional[str] = None,
+                  status_geral: Optional[str] = None) -> List[RegistroResultado]:
+        """Registros que atendem a todos os filtros informados, na ordem do pavimento."""
+        filtros = {'projeto': projeto, 'revisao': revisao, 'pavimento': pavimento, 'laje_id': laje_id,
+                   'status_servico': status_servico, 'status_geral': status_geral}
+        usados = {k: v for k, v in filtros.items() if v is not None}
+        onde = " AND ".join(f"{k} = ?" for k in usados)
+        cur = self.conexao.execute(f"{_SELECT} WHERE {onde} ORDER BY revisao, pavimento, linha",
+                                   tuple(usados.values()))
+        return [RegistroResultado(*r) for r in cur]
+
+    def delta(self, projeto: str, revisao_a: int, revisao_b: int, campo: str = 'taxa_aco_m2',
+              pavimento: Optional[str] = None) -> List[tuple]:
+        """
+        Comparação de um campo de CAMPOS entre duas revisões, por laje (mesmo
+        pavimento e id): [(pavimento, laje_id, valor_a, valor_b, valor_b - valor_a)].
+        """
+        if campo not in CAMPOS:
+            raise ValueError(f"Campo '{campo}' não indexado. Opções: {', '.join(CAMPOS)}")
+        sql = (f"SELECT a.pavimento, a.laje_id, a.{campo}, b.{campo}, b.{campo} - a.{campo} "
+               f"FROM resultados a JOIN resultados b "
+               f"ON b.projeto = a.projeto AND b.revisao = ? AND b.pavimento = a.pavimento AND b.laje_id = a.laje_id "
+               f"WHERE a.projeto = ? AND a.revisao = ?")
+        parametros: List[Any] = [revisao_b, projeto, revisao_a]
+        if pavimento is not None:
+            sql += " AND a.pavimento = ?"
+            parametros.append(pavimento)
+        return self.conexao.execute(sql + " ORDER BY a.pavimento, a.linha", parametros).fetchall()
+
+    def sql(self, consulta: str, parametros: Sequence[Any] = ()) -> List[RegistroResultado]:
+        """Consulta livre: `consulta` é a cláusula após WHERE (ex: 'revisao = ? AND wk_max_mm > 0.3')."""
+        cur = self.conexao.execute(f"{_SELECT} WHERE {consulta} ORDER BY revisao, pavimento, linha", parametros)
+        return [RegistroResultado(*r) for r in cur]
+
+    # --- Exportação ---
+
+    @staticmethod
+    def exportar_json(registros: Sequence[RegistroResultado], caminho: str):
+        dados = [{"projeto": r.projeto, "pavimento": r.pavimento, "revisao": r.revisao, "laje_id": r.laje_id,
+                  "resultado": dataclasses.asdict(r.resultado())} for r in registros]
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, indent=4, ensure_ascii=False)
+
+    @staticmethod
+    def exportar_memorial(registros: Sequence[RegistroResultado], caminho: str,
+                          titulo_projeto: Optional[str] = None) -> bool:
+        if titulo_projeto is None:
+            titulo_projeto = registros[0].projeto if registros else "Projeto"
+        return MemorialService.escrever_markdown((r.resultado() for r in registros), caminho, titulo_projeto)
@@ -0,0 +1,224 @@
+"""
+Rastreamento de tempo por etapa (análise de laje, vínculos, cargas de paredes,
+exportação de vigas).
+
+Desligado por padrão: trecho() devolve um contexto nulo compartilhado e
+@rastrear chama a função direto, sem medir nada. Ligado (ativar()), cada trecho
+registra início e duração, aninhado no trecho que estiver aberto na mesma thread:
+
+    from app.services import tracing
+    r = tracing.ativar(perfil_trecho="SlabController.run_analysis", perfil_lentos=5)
+    manager.calcular_e_exportar_vigas("vigas.json")
+    print(r.relatorio())                 # contagem, total e percentis por caminho
+    r.exportar_chrome("rastro.json")     # abrir em chrome://tracing ou ui.perfetto.dev
+    r.exportar_perfis("perfis/")         # cProfile das N execuções mais lentas
+
+Só é medido o que roda no próprio processo: lotes distribuídos entre processos
+(BatchExecutor acima de LOTE_LIMIAR_PARALELO) aparecem como um único trecho.
+"""
+import cProfile
+import functools
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+_NULO = nullcontext()
+
+
+class Trecho(NamedTuple):
+    nome: str
+    caminho: str      # Nomes dos trechos abertos, do mais externo a este ("a/b/c")
+    inicio_ns: int    # Desde a ativação
+    duracao_ns: int
+    thread: int
+
+
+class Rastreador:
+    def __init__(self, perfil_trecho: Optional[str] = None, perfil_lentos: int = 0):
+        self.origem_ns = time.perf_counter_ns()
+        self.trechos: List[Trecho] = []
+        self.perfil_trecho = perfil_trecho
+        self.perfil_lentos = perfil_lentos
+        self._perfis: List[Tuple[int, int, cProfile.Profile]] = [] # heap (duração, seq, perfil): os N mais lentos
+        self._seq = itertools.count()
+        self._local = threading.local()
+        self._trava = threading.Lock()
+
+    def _pilha(self) -> List[str]:
+        pilha = getattr(self._local, 'pilha', None)
+        if pilha is None:
+            pilha = self._local.pilha = []
+        return pilha
+
+    def _registrar(self, trecho: Trecho, perfil: Optional[cProfile.Profile]):
+        with self._trava:
+            self.trechos.append(trecho)
+            if perfil is not None:
+                item = (trecho.duracao_ns, next(self._seq), perfil)
+                if len(self._perfis) < self.perfil_lentos:
+                    heapq.heappush(self._perfis, item)
+                else:
+                    heapq.heappushpop(self._perfis, item)
+
+    # Pontos de extensão (ver app.services.memory_monitor): chamados ao abrir/fechar cada trecho
+    def _ao_abrir(self, aberto: "_TrechoAberto"):
+        pass
+
+    def _ao_fechar(self, aberto: "_TrechoAberto"):
+        pass
+
+    # --- Consulta ---
+
+    def estatisticas(self) -> Dict[str, Dict[str, float]]:
+        """Por caminho: n, total, média e percentis (ms), na ordem em que cada caminho começou."""
+        duracoes: Dict[str, List[int]] = {}
+        primeiro: Dict[str, int] = {}
+        for t in self.trechos: # Registrados ao fechar: o pai vem depois dos filhos
+            duracoes.setdefault(t.caminho, []).append(t.duracao_ns)
+            primeiro[t.caminho] = min(primeiro.get(t.caminho, t.inicio_ns), t.inicio_ns)
+        saida = {}
+        for caminho in sorted(duracoes, key=primeiro.__getitem__):
+            lista = duracoes[caminho]
+            ms = np.array(lista, dtype=np.float64) / 1e6
+            p50, p90, p99 = np.percentile(ms, (50, 90, 99))
+            saida[caminho] = {"n": len(lista), "total_ms": float(ms.sum()), "media_ms": float(ms.mean()),
+                              "p50_ms": float(p50), "p90_ms": float(p90), "p99_ms": float(p99),
+                              "max_ms": float(ms.max())}
+        return saida
+
+    def relatorio(self) -> str:
+        linhas = ["--- Tempos por etapa ---",
+                  f"{'trecho':<56} {'n':>7} {'total ms':>10} {'p50':>8} {'p90':>8} {'p99':>8} {'máx':>8}"]
+        for caminho, e in self.estatisticas().items():
+            nivel = caminho.count("/")
+            rotulo = "  " * nivel + caminho.rsplit("/", 1)[-1]
+            linhas.append(f"{rotulo:<56} {e['n']:>7} {e['total_ms']:>10.1f} {e['p50_ms']:>8.3f} "
+                          f"{e['p90_ms']:>8.3f} {e['p99_ms']:>8.3f} {e['max_ms']:>8.3f}")
+        return "\n".join(linhas)
+
+    # --- Exportação ---
+
+    def exportar_chrome(self, caminho: str):
+        """Formato Trace Event (eventos completos 'X', tempos em µs)."""
+        pid = os.getpid()
+        eventos = [{"name": t.nome, "cat": t.caminho.split("/", 1)[0], "ph": "X", "pid": pid, "tid": t.thread,
+                    "ts": t.inicio_ns / 1000.0, "dur": t.duracao_ns / 1000.0} for t in self.trechos]
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+
+    def perfis(self) -> List[Tuple[float, cProfile.Profile]]:
+        """(duração em ms, perfil) das execuções perfiladas mais lentas, da mais lenta para a mais rápida."""
+        return [(d / 1e6, p) for d, _, p in sorted(self._perfis, reverse=True)]
+
+    def exportar_perfis(self, pasta: str) -> List[str]:
+        """Grava cada perfil (formato pstats) em `pasta`. Retorna os caminhos gravados."""
+        os.makedirs(pasta, exist_ok=True)
+        nome = (self.perfil_trecho or "trecho").replace("/", "_")
+        caminhos = []
+        for i, (ms, perfil) in enumerate(self.perfis(), start=1):
+            caminho = os.path.join(pasta, f"{i:02d}_{nome}_{ms:.1f}ms.prof")
+            perfil.dump_stats(caminho)
+            caminhos.append(caminho)
+        return caminhos
+
+
+class _TrechoAberto:
+    __slots__ = ('rastreador', 'nome', 'caminho', 'inicio', 'perfil')
+
+    def __init__(self, rastreador: Rastreador, nome: str):
+        self.rastreador = rastreador
+        self.nome = nome
+        self.perfil = None
+
+    def __enter__(self):
+        r = self.rastreador
+        pilha = r._pilha()
+        pilha.append(self.nome)
+        self.caminho = "/".join(pilha)
+        try:
+            r._ao_abrir(self)
+        except BaseException:
+            pilha.pop() # O bloco não chega a rodar: __exit__ não será chamado
+            raise
+        # Um único cProfile por thread: só o trecho mais externo com esse nome é perfilado
+        if (r.perfil_lentos and self.nome == r.perfil_trecho and self.nome not in pilha[:-1]
+                and not getattr(r._local, 'perfilando', False)):
+            r._local.perfilando = True
+            self.perfil = cProfile.Profile()
+            self.perfil.enable()
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        fim = time.perf_counter_ns()
+        r = self.rastreador
+        if self.perfil is not None:
+            self.perfil.disable()
+            r._local.perfilando = False
+        r._pilha().pop()
+        r._registrar(Trecho(self.nome, self.caminho, self.inicio - r.origem_ns, fim - self.inicio,
+                            threading.get_ident()), self.perfil)
+        r._ao_fechar(self)
+        return False
+
+
+# ==============================================================================
+# INTERFACE DO MÓDULO
+# ==============================================================================
+
+_rastreador: Optional[Rastreador] = None
+
+
+def ativar(perfil_trecho: Optional[str] = None, perfil_lentos: int = 0) -> Rastreador:
+    """
+    Liga o rastreamento (descartando o anterior) e retorna o coletor.
+    `perfil_trecho` + `perfil_lentos`: roda esse trecho sob cProfile e guarda os N mais lentos.
+    """
+    return instalar(Rastreador(perfil_trecho, perfil_lentos))
+
+
+def instalar(rastreador: Rastreador) -> Rastreador:
+    """Torna `rastreador` (ou uma subclasse, ex: MonitorMemoria) o coletor ativo."""
+    global _rastreador
+    _rastreador = rastreador
+    return rastreador
+
+
+def desativar() -> Optional[Rastreador]:
+    """Desliga e retorna o coletor com o que foi medido."""
+    global _rastreador
+    r, _rastreador = _rastreador, None
+    return r
+
+
+def rastreador_atual() -> Optional[Rastreador]:
+    return _rastreador
+
+
+def trecho(nome: str):
+    """Contexto que mede o bloco `with` (nulo quando desligado)."""
+    r = _rastreador
+    return _NULO if r is None else _TrechoAberto(r, nome)
+
+
+def rastrear(nome: Optional[str] = None):
+    """Decorador: mede cada chamada da função como um trecho (padrão: Classe.metodo)."""
+    def decorar(funcao):
+        rotulo = nome or funcao.__qualname__
+
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            r = _rastreador
+            if r is None:
+                return funcao(*args, **kwargs)
+            with _TrechoAberto(r, rotulo):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorar
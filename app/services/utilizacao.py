@@ -0,0 +1,51 @@
+"""
+Índices de utilização por laje (demanda / capacidade) para o mapa de calor.
+
+Calculados em bloco sobre a matriz de resultados colunar (ver
+app.models.columnar): cada métrica é uma operação vetorizada sobre colunas,
+sem reconstruir objetos AnalysisResult. 1.0 = limite atingido; acima de 1.0 a
+verificação não passa.
+"""
+from typing import Dict
+
+import numpy as np
+
+from app.models import columnar
+
+WK_LIMITE_MM = 0.3     # Mesmo limite usado em AnalyticEngine.verificar_fissuracao
+TAXA_AS_MAXIMA = 0.04  # As,máx = 4% Ac (NBR 6118 17.3.5.2.4)
+
+# Chave -> rótulo exibido na interface
+METRICAS = {
+    "cortante": "Cortante (V_Sd / V_Rd1)",
+    "flecha": "Flecha / limite",
+    "fissuracao": "Fissuração (wk / wk,lim)",
+    "armadura": "Armadura (As / As,máx)",
+}
+
+_COL = {nome: i for i, nome in enumerate(columnar.COLUNAS_RESULTADO)}
+_COLS_AS = [_COL[f'as_teorico.{p}'] for p in columnar.POSICOES]
+
+
+def indices_utilizacao(saida: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Recebe a matriz (n x COLUNAS_RESULTADO) e retorna {métrica: array(n)}.
+    Lajes reprovadas por ductilidade (As codificado como NaN) recebem inf em 'armadura'.
+    """
+    col = lambda nome: saida[:, _COL[nome]]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        limite_flecha = col('flecha_limite_mm')
+        flecha = np.where(limite_flecha > 0, col('flecha_total_mm') / limite_flecha, 0.0)
+
+        as_req = saida[:, _COLS_AS]
+        as_req = np.where(np.isnan(as_req), np.inf, as_req)
+        as_max = TAXA_AS_MAXIMA * 100.0 * col('h_cm') # cm²/m (faixa de 1 m)
+        armadura = as_req.max(axis=1) / as_max
+
+    return {
+        "cortante": col('cortante.ratio').copy(),
+        "flecha": flecha,
+        "fissuracao": col('wk_max_mm') / WK_LIMITE_MM,
+        "armadura": armadura,
+    }
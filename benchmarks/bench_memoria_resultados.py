@@ -0,0 +1,81 @@
+"""
+Benchmark de memória: custo por resultado retido de AnalysisResult (dicts)
+contra CompactAnalysisResult (__slots__ + sub-registros fixos).
+
+Uso:
+    python benchmarks/bench_memoria_resultados.py [--n 20000] [--json saida.json]
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from app.models.solid import LajeMacica
+from app.models.value_objects import (Materiais, Carregamento, ClasseAgressividade,
+                                      CompactAnalysisResult)
+from app.engines.analytic import AnalyticEngine
+from app.controllers.slab_controller import SlabController
+
+
+def gerar_lajes(n: int, semente: int = 42):
+    rnd = random.Random(semente)
+    mat = Materiais(fck=25, fyk=500, Ecs=25.0)
+    lajes = []
+    for _ in range(n):
+        bordas = {b: rnd.choice(["apoiado", "engastado"]) for b in ('esquerda', 'direita', 'topo', 'fundo')}
+        lajes.append(LajeMacica(
+            h=rnd.choice([0.08, 0.10, 0.12, 0.14]),
+            lx=round(rnd.uniform(2.0, 6.0), 2), ly=round(rnd.uniform(2.0, 7.0), 2),
+            materiais=mat, caa=ClasseAgressividade.II, bordas=bordas,
+            carregamento=Carregamento(g_revestimento=rnd.uniform(0.5, 2.0), q_acidental=rnd.uniform(1.5, 4.0))
+        ))
+    return lajes
+
+
+def medir(lajes, compacto: bool) -> int:
+    """Bytes retidos (tracemalloc) pela lista de resultados ao final da análise."""
+    engine = AnalyticEngine()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    if compacto:
+        resultados = [CompactAnalysisResult.from_result(SlabController(l, engine).run_analysis()) for l in lajes]
+    else:
+        resultados = [SlabController(l, engine).run_analysis() for l in lajes]
+    retido = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del resultados
+    return retido
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória por AnalysisResult")
+    parser.add_argument("--n", type=int, default=20000)
+    parser.add_argument("--json", default=None, help="Arquivo de saída (opcional)")
+    args = parser.parse_args()
+
+    lajes = gerar_lajes(args.n)
+    completo = medir(lajes, compacto=False)
+    compacto = medir(lajes, compacto=True)
+
+    dados = {
+        "n_resultados": args.n,
+        "bytes_por_resultado_dataclass": round(completo / args.n, 1),
+        "bytes_por_resultado_compacto": round(compacto / args.n, 1),
+        "reducao_percentual": round(100.0 * (1 - compacto / completo), 1) if completo else 0.0
+    }
+    for k, v in dados.items():
+        print(f"{k:<32}: {v}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Benchmark de escala: tempos das etapas de cálculo em pavimentos sintéticos de
+tamanhos crescentes (ver benchmarks/pavimento_sintetico.py).
+
+Para cada tamanho (grade lado x lado) mede o menor tempo de `--repeticoes`
+execuções de:
+    por laje:     análise (SlabController + AnalyticEngine), SteelDetailer, optimize_thickness
+    por pavimento: recalcular_vinculos, distribuir_cargas_paredes,
+                   calcular_e_exportar_vigas, MemorialService.gerar_markdown
+e estima o expoente de escala (t ~ n^k, ajuste log-log sobre os itens
+processados). O JSON de saída pode ser comparado com uma execução anterior
+para apontar regressões.
+
+Uso:
+    python benchmarks/bench_pavimento.py [--lados 5 10 20 40] [--json atual.json]
+                                         [--comparar anterior.json --tolerancia 0.25]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+from typing import Callable, Dict, List, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+import numpy as np
+
+from app.models import columnar
+from app.engines.analytic import AnalyticEngine
+from app.controllers.slab_controller import SlabController
+from app.services.steel_detailer import SteelDetailer
+from app.services.memorial_service import MemorialService
+from benchmarks.pavimento_sintetico import gerar_pavimento
+
+AMOSTRA_POR_LAJE = 200    # Lajes medidas nas operações por laje
+AMOSTRA_OTIMIZACAO = 20   # optimize_thickness é ~30 análises por laje
+
+
+def menor_tempo(funcao: Callable[[], object], repeticoes: int, preparar: Callable[[], None] = None) -> float:
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        if preparar:
+            preparar()
+        t0 = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor
+
+
+def medir_tamanho(lado: int, repeticoes: int, semente: int) -> Dict[str, Dict[str, float]]:
+    """{operação: {"itens": quantidade medida, "segundos": menor tempo}} para uma grade lado x lado."""
+    manager = gerar_pavimento(lado, lado, semente)
+    n = manager.tabela.n
+    rnd = random.Random(semente)
+    amostra = rnd.sample(range(n), min(n, AMOSTRA_POR_LAJE))
+    lajes = [manager.tabela.criar_laje(i) for i in amostra]
+    engine = AnalyticEngine()
+    medidas = {}
+
+    def registrar(nome, itens, segundos):
+        medidas[nome] = {"itens": itens, "segundos": segundos}
+
+    registrar("analise_por_laje", len(lajes), menor_tempo(
+        lambda: [SlabController(l, engine).run_analysis() for l in lajes], repeticoes))
+
+    pedidos = [(rnd.uniform(0.5, 8.0), rnd.choice((0.10, 0.12, 0.14))) for _ in range(len(lajes) * 4)]
+    registrar("steel_detailer", len(pedidos), menor_tempo(
+        lambda: [SteelDetailer.encontrar_melhor_armadura(a, h) for a, h in pedidos], repeticoes))
+
+    otimizar = lajes[:AMOSTRA_OTIMIZACAO]
+    registrar("optimize_thickness", len(otimizar), menor_tempo(
+        lambda: [SlabController(l, engine).optimize_thickness() for l in otimizar], repeticoes,
+        preparar=SlabController.limpar_cache)) # Sem o cache de specs: mede o cálculo
+
+    # Por pavimento (forçando o recálculo completo a cada repetição)
+    registrar("recalcular_vinculos", n, menor_tempo(manager.recalcular_vinculos, repeticoes))
+    registrar("distribuir_cargas_paredes", n, menor_tempo(manager.distribuir_cargas_paredes, repeticoes))
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "vigas.json")
+        registrar("calcular_e_exportar_vigas", n, menor_tempo(
+            lambda: manager.calcular_e_exportar_vigas(caminho), repeticoes))
+
+    resultados = [columnar.linha_para_resultado(linha) for linha in manager.analisar()]
+    registrar("gerar_markdown", n, menor_tempo(
+        lambda: MemorialService.gerar_markdown(resultados), repeticoes,
+        preparar=MemorialService.limpar_cache)) # Memorial a frio (sem seções em cache)
+    return medidas
+
+
+def expoente_escala(ns: List[int], tempos: List[float]) -> Optional[float]:
+    """k em t ~ n^k (mínimos quadrados em log-log); None se n não variou (ex: amostra fixa)."""
+    validos = [(n, t) for n, t in zip(ns, tempos) if n > 0 and t > 0]
+    if len({n for n, _ in validos}) < 2:
+        return None
+    x, y = np.log([v[0] for v in validos]), np.log([v[1] for v in validos])
+    return round(float(np.polyfit(x, y, 1)[0]), 3)
+
+
+def executar(lados: List[int], repeticoes: int, semente: int) -> dict:
+    por_operacao: Dict[str, dict] = {}
+    medir_tamanho(3, 1, semente) # Aquecimento (imports, caches de coeficientes): não entra na conta
+    for lado in lados:
+        t0 = time.perf_counter()
+        for nome, m in medir_tamanho(lado, repeticoes, semente).items():
+            op = por_operacao.setdefault(nome, {"lajes": [], "itens": [], "segundos": [], "us_por_item": []})
+            op["lajes"].append(lado * lado)
+            op["itens"].append(m["itens"])
+            op["segundos"].append(m["segundos"])
+            op["us_por_item"].append(m["segundos"] / m["itens"] * 1e6 if m["itens"] else 0.0)
+        print(f"  {lado}x{lado} ({lado * lado} lajes): {time.perf_counter() - t0:.1f} s")
+
+    for op in por_operacao.values():
+        # Tempo x itens processados (lajes do pavimento ou da amostra): 1.0 = linear
+        op["expoente"] = expoente_escala(op["itens"], op["segundos"])
+
+    return {
+        "ambiente": {"python": platform.python_version(), "numpy": np.__version__,
+                     "plataforma": platform.platform(), "cpus": os.cpu_count()},
+        "parametros": {"lados": lados, "repeticoes": repeticoes, "semente": semente},
+        "operacoes": por_operacao,
+    }
+
+
+def comparar(atual: dict, anterior: dict, tolerancia: float) -> List[str]:
+    """Operações/tamanhos em que o tempo por item piorou mais que `tolerancia` (fração)."""
+    regressoes = []
+    for nome, op in atual["operacoes"].items():
+        antes = anterior.get("operacoes", {}).get(nome)
+        if not antes:
+            continue
+        referencia = dict(zip(antes["lajes"], antes["us_por_item"]))
+        for lajes, us in zip(op["lajes"], op["us_por_item"]):
+            base = referencia.get(lajes)
+            if base and us > base * (1 + tolerancia):
+                regressoes.append(f"{nome} ({lajes} lajes): {base:.1f} -> {us:.1f} us/item (+{100 * (us / base - 1):.0f}%)")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escala das etapas de cálculo em pavimentos sintéticos")
+    parser.add_argument("--lados", type=int, nargs="+", default=[5, 10, 20, 40], help="Grades lado x lado")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--json", default=None, help="Arquivo de saída (opcional)")
+    parser.add_argument("--comparar", default=None, help="JSON de uma execução anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Piora tolerada na comparação (fração)")
+    args = parser.parse_args()
+
+    dados = executar(args.lados, args.repeticoes, args.semente)
+
+    print(f"{'operação':<28} {'expoente':>8}  " + "  ".join(f"{l * l:>9}" for l in args.lados) + "  (us/item)")
+    for nome, op in dados["operacoes"].items():
+        expoente = "-" if op["expoente"] is None else f"{op['expoente']:.2f}"
+        print(f"{nome:<28} {expoente:>8}  " + "  ".join(f"{v:>9.1f}" for v in op["us_por_item"]))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, indent=4)
+
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            regressoes = comparar(dados, json.load(f), args.tolerancia)
+        for r in regressoes:
+            print(f"REGRESSÃO: {r}")
+        if regressoes:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Gerador de pavimentos sintéticos para os benchmarks.
+
+Grade de nx x ny lajes com vãos variados por coluna/linha (a grade continua
+fechada, então a detecção de continuidade encontra os vizinhos), parte das
+lajes treliçadas, balanços aleatórios (borda externa 'livre' via
+vinculos_manuais) e uma rede aleatória de paredes alinhadas aos eixos.
+Mesma semente = mesmo pavimento.
+"""
+import random
+from typing import List, Optional
+
+from app.models.floor_system import GerenciadorPavimento, LajePosicionada
+from app.models.flyweights import internar_materiais, internar_carregamento, CarregamentoLaje
+from app.models.ribbed import LajeTrelicada
+from app.models.solid import LajeMacica
+from app.models.value_objects import ClasseAgressividade, CargaLinear
+from app.services.catalog_service import catalog_service
+
+VAOS = (3.0, 3.5, 4.0, 4.5, 5.0, 6.0)
+ESPESSURAS = (0.10, 0.12, 0.14)
+_ENCHIMENTO_PADRAO = {"altura_h_cm": 8.0, "largura_b_cm": 25.0, "comprimento_cm": 30.0, "peso_unitario_kg": 3.4}
+
+
+def _eixos(n: int, rnd: random.Random) -> List[float]:
+    """Coordenadas das n + 1 linhas de eixo (vão escolhido por faixa)."""
+    coords = [0.0]
+    for _ in range(n):
+        coords.append(coords[-1] + rnd.choice(VAOS))
+    return coords
+
+
+def gerar_pavimento(nx: int, ny: int, semente: int = 0, frac_trelicada: float = 0.25,
+                    frac_balanco: float = 0.05, paredes_por_laje: float = 0.5,
+                    enchimento: Optional[dict] = None) -> GerenciadorPavimento:
+    rnd = random.Random(semente)
+    xs, ys = _eixos(nx, rnd), _eixos(ny, rnd)
+    mat = internar_materiais(25.0, 500.0, 25.0)
+    if enchimento is None:
+        modelos = catalog_service.get_todos_enchimentos()
+        enchimento = modelos[0] if modelos else _ENCHIMENTO_PADRAO
+
+    lajes = []
+    for j in range(ny):
+        for i in range(nx):
+            lx, ly = xs[i + 1] - xs[i], ys[j + 1] - ys[j]
+            carga = CarregamentoLaje(internar_carregamento(rnd.choice((1.0, 1.5, 2.0)), rnd.choice((1.5, 2.0, 3.0))))
+            comum = dict(lx=lx, ly=ly, materiais=mat, caa=ClasseAgressividade.II, bordas={}, carregamento=carga)
+            if rnd.random() < frac_trelicada:
+                laje = LajeTrelicada(h_capa=0.04, largura_sapata=0.125, dados_enchimento=enchimento, **comum)
+            else:
+                laje = LajeMacica(h=rnd.choice(ESPESSURAS), **comum)
+
+            # Balanço: uma borda externa da grade fica livre
+            externas = ([b for b, cond in (('esquerda', i == 0), ('direita', i == nx - 1),
+                                           ('fundo', j == 0), ('topo', j == ny - 1)) if cond])
+            manuais = {rnd.choice(externas): 'livre'} if externas and rnd.random() < frac_balanco else {}
+
+            vigas = {'esquerda': f"VX{i + 1}", 'direita': f"VX{i + 2}", 'fundo': f"VY{j + 1}", 'topo': f"VY{j + 2}"}
+            lajes.append(LajePosicionada(f"L{j * nx + i + 1}", laje, xs[i], ys[j], vigas=vigas,
+                                         vinculos_manuais=manuais))
+
+    manager = GerenciadorPavimento()
+    manager.adicionar_lajes(lajes)
+
+    # Paredes: trechos horizontais/verticais de 1 a 2 vãos, em posição qualquer
+    for k in range(int(round(paredes_por_laje * nx * ny))):
+        x, y = rnd.uniform(0.0, xs[-1]), rnd.uniform(0.0, ys[-1])
+        comprimento = rnd.uniform(1.0, 2.0) * rnd.choice(VAOS)
+        if rnd.random() < 0.5:
+            x_fim, y_fim = min(x + comprimento, xs[-1]), y
+        else:
+            x_fim, y_fim = x, min(y + comprimento, ys[-1])
+        manager.adicionar_parede(CargaLinear(f"P{k + 1}", x, y, x_fim, y_fim, rnd.choice((2.5, 3.5, 5.0))))
+    return manager
@@ -26,6 +26,18 @@ GAMMA_S = 1.15  # Aço
 GAMMA_G = 1.40  # Ações permanentes
 GAMMA_Q = 1.40  # Ações variáveis
 
+# Fatores de redução ψ0, ψ1, ψ2 da ação variável por categoria de uso (NBR 6118 Tabela 11.2)
+# Usados nas combinações frequente (ψ1) e quase-permanente (ψ2): ver app.engines.combinations
+PSI_POR_CATEGORIA = {
+    "residencial": (0.5, 0.4, 0.3), # Sem predominância de equipamentos fixos nem alta concentração de pessoas
+    "escritorio": (0.7, 0.6, 0.4),  # Equipamentos fixos por longos períodos ou alta concentração de pessoas
+    "cobertura": (0.0, 0.0, 0.0),   # Sem acesso: sobrecarga só de manutenção (EN 1990, categoria H)
+}
+CATEGORIA_USO = "residencial"
+# Dimensionar os momentos positivos pela envoltória da carga acidental alternada
+# (xadrez) em vez de tudo carregado: ver app.engines.pattern_loading
+ALTERNANCIA_CARGA_ACIDENTAL = False
+
 # ==============================================================================
 # 3. PROPRIEDADES DOS MATERIAIS (VALORES PADRÃO)
 # ==============================================================================
@@ -69,4 +81,49 @@ COBRIMENTO_POR_CAA = {
 
 PASSO_INCREMENTO_H = 0.01  # Incremento de 1cm na busca pela espessura ideal
 H_MIN_LAJE_MACICA = 0.07   # 7cm (Lajes de cobertura não em balanço)
-H_MIN_LAJE_PISO = 0.08     # 8cm (Lajes de piso conforme NBR 6118 13.2.4.1)
\ No newline at end of file
+H_MIN_LAJE_PISO = 0.08     # 8cm (Lajes de piso conforme NBR 6118 13.2.4.1)
+CACHE_ANALISES_MAX = 4096  # Resultados memorizados por SlabSpec (SlabController.analisar_spec)
+
+# ==============================================================================
+# 7. EXECUÇÃO EM LOTE (VARREDURAS E PAVIMENTOS GRANDES)
+# ==============================================================================
+
+LOTE_LIMIAR_PARALELO = 5000  # Abaixo disso o lote roda no próprio processo
+LOTE_TAMANHO_BLOCO = 512     # Lajes por intervalo entregue a cada worker
+LOTE_PROCESSOS = None        # None = os.cpu_count()
+
+# ==============================================================================
+# 8. EDITOR DE PAVIMENTO
+# ==============================================================================
+
+HISTORICO_MAX_BYTES = 4 * 1024 * 1024  # Orçamento do desfazer/refazer (edições mais antigas são descartadas)
+
+# ==============================================================================
+# 9. RELATÓRIOS
+# ==============================================================================
+
+MEMORIAL_CACHE_SECOES = 20000  # Seções de laje já formatadas guardadas entre exportações do memorial
+
+# ==============================================================================
+# 10. DIAGNÓSTICO (MEMÓRIA)
+# ==============================================================================
+
+MEMORIA_ORCAMENTO_MB = None         # RSS máximo no modo de monitoramento (None = sem limite)
+MEMORIA_INTERVALO_VERIFICACAO = 256 # Trechos entre verificações do orçamento (além das trocas de fase)
+MEMORIA_TOP_ALOCADORES = 10         # Linhas de código com maior crescimento listadas por fase
+
+# ==============================================================================
+# 11. CONFIABILIDADE (MONTE CARLO)
+# ==============================================================================
+
+CONFIABILIDADE_AMOSTRAS = 200_000 # Amostras por análise (padrão)
+CONFIABILIDADE_BLOCO = 100_000    # Amostras avaliadas por vez (limita a memória)
+CONFIABILIDADE_NIVEL = 0.95       # Nível dos intervalos de confiança de Pf e β
+
+# Variabilidade das variáveis de entrada (valores nominais = os da laje)
+CV_FCK = 0.10             # Lognormal; fck nominal = quantil de 5%
+CV_FYK = 0.05             # Lognormal; fyk nominal = quantil de 5%
+CV_PERMANENTE = 0.10      # Normal, média = revestimento + paredes nominais
+CV_ACIDENTAL = 0.25       # Gumbel (máximos), média = q nominal
+DESVIO_H = 0.005          # Normal (m): tolerância de execução da espessura
+DESVIO_COBRIMENTO = 0.005 # Normal (m): Δc = 10 mm ≈ 2 desvios
@@ -1,3 +1,6 @@
+import time
+_INICIO = time.perf_counter() # Referência para o relatório de tempos de inicialização
+
 import sys
 import os
 import argparse
@@ -9,7 +12,7 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 if BASE_DIR not in sys.path:
     sys.path.append(BASE_DIR)
 
-def start_gui():
+def start_gui(relatar_tempos=False):
     """Inicializa a aplicação gráfica PyQt6."""
     
     # 1. Tenta carregar PyQt6 (Dependência Externa)
@@ -31,6 +34,7 @@ def start_gui():
     # 2. Tenta carregar módulos locais (Dependência Interna)
     try:
         from ui.gui.main_window import MainWindow
+        from ui.gui.startup_timing import TemposInicializacao
     except ImportError as e:
         print("\n" + "="*60)
         print("ERRO DE ESTRUTURA DO PROJETO")
@@ -51,9 +55,12 @@ def start_gui():
 
     # 3. Executa a GUI
     try:
+        tempos = TemposInicializacao(_INICIO)
         app = QApplication(sys.argv)
         app.setStyle("Fusion") 
-        window = MainWindow()
+        window = MainWindow(tempos)
+        if relatar_tempos:
+            window.inicializacao_concluida.connect(lambda: print(tempos.relatorio()))
         window.show()
         sys.exit(app.exec())
     except Exception as e:
@@ -61,6 +68,43 @@ def start_gui():
         traceback.print_exc()
         sys.exit(1)
 
+def ativar_rastreamento(caminho=None, perfis=0, memoria=False, orcamento_mb=None):
+    """
+    Liga o rastreamento por etapa (e, com `memoria`, o monitor de memória por fase);
+    ao sair imprime os resumos e grava o rastro (Chrome trace), se `caminho` foi informado.
+    """
+    import atexit
+    from app.services import tracing, memory_monitor
+    opcoes = dict(perfil_trecho="SlabController.run_analysis", perfil_lentos=perfis)
+    if memoria:
+        rastreador = memory_monitor.ativar(orcamento_mb, **opcoes)
+    else:
+        rastreador = tracing.ativar(**opcoes)
+
+    def exportar():
+        if memoria:
+            print(rastreador.relatorio())
+        if not caminho:
+            return
+        rastreador.exportar_chrome(caminho)
+        print(tracing.Rastreador.relatorio(rastreador))
+        print(f"Rastro gravado em {caminho}")
+        if perfis:
+            for perfil in rastreador.exportar_perfis(os.path.splitext(caminho)[0] + "_perfis"):
+                print(f"  {perfil}")
+    atexit.register(exportar)
+
+def ativar_metricas(caminho):
+    """Liga as métricas de execução e as grava ao sair (.json ou texto Prometheus)."""
+    import atexit
+    from app.services import metrics
+    metrics.ativar()
+
+    def exportar():
+        metrics.exportar(caminho)
+        print(f"Métricas gravadas em {caminho}")
+    atexit.register(exportar)
+
 def start_cli():
     try:
         from ui.cli import run_cli_interface
@@ -73,9 +117,24 @@ def start_cli():
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="PyLaje")
     parser.add_argument("--cli", action="store_true", help="Modo Texto")
+    parser.add_argument("--tempo-inicio", action="store_true", help="Imprime os tempos de abertura da interface")
+    parser.add_argument("--rastrear", metavar="ARQUIVO", help="Grava os tempos por etapa em formato Chrome trace")
+    parser.add_argument("--perfis", type=int, default=0, metavar="N",
+                        help="Com --rastrear: cProfile das N análises de laje mais lentas")
+    parser.add_argument("--memoria", action="store_true", help="Relatório de memória por fase (tracemalloc + RSS)")
+    parser.add_argument("--orcamento-memoria", type=float, metavar="MB",
+                        help="Interrompe com relatório se o RSS passar de MB (implica --memoria)")
+    parser.add_argument("--metricas", metavar="ARQUIVO",
+                        help="Grava contadores/latências ao sair (JSON se .json; senão, texto Prometheus)")
     args = parser.parse_args()
 
+    if args.rastrear or args.memoria or args.orcamento_memoria:
+        ativar_rastreamento(args.rastrear, args.perfis, args.memoria or args.orcamento_memoria is not None,
+                            args.orcamento_memoria)
+    if args.metricas:
+        ativar_metricas(args.metricas)
+
     if args.cli:
         start_cli()
     else:
-        start_gui()
\ No newline at end of file
+        start_gui(args.tempo_inicio)
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+Envoltória da carga acidental alternada (app.engines.pattern_loading) contra
+força bruta num pavimento 3x3: todos os 2^9 arranjos de q avaliados um a um.
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from app.engines import combinations, pattern_loading
+from app.engines.combinations import ELU
+from app.models import columnar
+from benchmarks.pavimento_sintetico import gerar_pavimento
+
+_COL = {nome: i for i, nome in enumerate(columnar.COLUNAS_RESULTADO)}
+
+
+@pytest.fixture(scope="module")
+def pavimento():
+    manager = gerar_pavimento(3, 3, semente=2)
+    manager.distribuir_cargas_paredes()
+    entrada = manager.tabela.matriz_entrada()
+    pares = manager.pares_continuidade()
+    influencia = pattern_loading.matriz_influencia(entrada, pares)
+    env = pattern_loading.envoltoria(entrada, pares, influencia=influencia)
+    return manager, entrada, influencia, env
+
+
+def _densa(influencia, valores):
+    a = np.zeros((influencia.n, influencia.n))
+    np.add.at(a, (influencia.linhas, influencia.colunas), valores)
+    return a
+
+
+def test_envoltoria_igual_forca_bruta(pavimento):
+    manager, entrada, influencia, env = pavimento
+    n = influencia.n
+    g = entrada[:, 14] + entrada[:, 16] + pattern_loading.peso_proprio(entrada)
+    q = entrada[:, 15]
+    arranjos = np.array(list(itertools.product((0.0, 1.0), repeat=n))) # (2^n x n)
+    for k, combinacao in enumerate(combinations.padrao().combinacoes):
+        for eixo, valores in (('mx', influencia.ax), ('my', influencia.ay)):
+            a = _densa(influencia, valores)
+            m_ref = a.sum(axis=1) * (combinacao.coef_g * g + combinacao.coef_q * q)
+            # M(s) = M_ref + A @ (coef_q·q·(s - 1)), um arranjo por linha
+            momentos = m_ref + (combinacao.coef_q * q * (arranjos - 1.0)) @ a.T
+            np.testing.assert_allclose(getattr(env, f'{eixo}_max')[:, k], momentos.max(axis=0), atol=1e-9)
+            np.testing.assert_allclose(getattr(env, f'{eixo}_min')[:, k], momentos.min(axis=0), atol=1e-9)
+            np.testing.assert_allclose(getattr(env, f'{eixo}_total')[:, k], momentos[-1], atol=1e-9)
+
+
+def test_tudo_carregado_igual_analise(pavimento):
+    manager, entrada, influencia, env = pavimento
+    saida = manager.analisar(alternancia=False)
+    elu = env.coluna(ELU)
+    for eixo in ('mx', 'my'):
+        # A análise arredonda os momentos em 0,01 kNm/m
+        np.testing.assert_allclose(elu[f'{eixo}_total'], saida[:, _COL[f'momentos_kNm.{eixo}']], atol=0.005 + 1e-9)
+
+
+def test_alternancia_nos_momentos_de_calculo(pavimento):
+    manager, entrada, influencia, env = pavimento
+    base = manager.analisar(alternancia=False)
+    saida = manager.analisar(alternancia=True)
+    elu = env.coluna(ELU)
+    for eixo in ('mx', 'my'):
+        esperado = np.maximum(base[:, _COL[f'momentos_kNm.{eixo}']], np.round(elu[f'{eixo}_max'], 2))
+        np.testing.assert_array_equal(saida[:, _COL[f'momentos_kNm.{eixo}']], esperado)
+    assert (saida[:, _COL['momentos_kNm.mx']] > base[:, _COL['momentos_kNm.mx']]).any()
@@ -4,8 +4,9 @@ import math
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QLineEdit, QComboBox, 
                              QPushButton, QTabWidget, QGroupBox, QTextEdit, 
-                             QFormLayout, QMessageBox, QCheckBox, QFileDialog)
-from PyQt6.QtCore import Qt
+                             QFormLayout, QMessageBox, QCheckBox, QFileDialog,
+                             QProgressBar)
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 
 # Importações dos Modelos e Serviços
 from app.models.value_objects import Materiais, Carregamento, ClasseAgressividade, CondicaoContorno
@@ -16,11 +17,16 @@ from app.controllers.slab_controller import SlabController
 from app.services.report_formatter import ReportFormatter
 from app.services.catalog_service import catalog_service
 from app.services.memorial_service import MemorialService
-from ui.gui.tabs.floor_editor import FloorEditorTab
+from ui.gui.workers import ExecutorTarefas
+from ui.gui.startup_timing import TemposInicializacao
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # Emitido quando a aba inicial e o pavimento de exemplo estão prontos
+    inicializacao_concluida = pyqtSignal()
+
+    def __init__(self, tempos: TemposInicializacao = None):
         super().__init__()
+        self.tempos = tempos or TemposInicializacao()
         self.setWindowTitle("PyLaje 2024 - Sistema Integrado de Engenharia")
         self.setGeometry(50, 50, 1300, 850)
         self.current_result = None 
@@ -29,24 +35,113 @@ class MainWindow(QMainWindow):
         self.laje_pavimento_ref = None 
         self.laje_pavimento_idx = -1
 
+        # Cálculos rodam fora da thread da interface (ver ui/gui/workers.py)
+        self.executor = ExecutorTarefas(self)
+        self.setup_status_bar()
+
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
         self.main_layout = QVBoxLayout(self.central_widget)
 
         self.main_tabs = QTabWidget()
-        
+
+        # Abas montadas na primeira exibição: até lá cada uma é um contêiner vazio.
+        # A aba inicial só é construída depois da primeira pintura da janela.
+        self.tab_floor_editor = None
+        self.tab_single_calc = None
+        self._abas = [("1. Editor de Pavimento (Grelha)", self._criar_editor_pavimento),
+                      ("2. Calculadora Detalhada", self._criar_calculadora)]
+        self._abas_construidas = set()
+        for titulo, _ in self._abas:
+            conteiner = QWidget()
+            QVBoxLayout(conteiner).setContentsMargins(0, 0, 0, 0)
+            self.main_tabs.addTab(conteiner, titulo)
+        self._pintada = False
+
+        self.main_layout.addWidget(self.main_tabs)
+        self.tempos.marcar("janela criada")
+
+    # --- Construção sob demanda ---
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._pintada:
+            self._pintada = True
+            self.tempos.marcar("primeira pintura")
+            QTimer.singleShot(0, self._concluir_inicializacao)
+
+    def _concluir_inicializacao(self):
+        self._garantir_aba(self.main_tabs.currentIndex())
+        self.main_tabs.currentChanged.connect(self._garantir_aba)
+        self.tempos.marcar("aba inicial pronta")
+        # Pavimento de exemplo carregado com a janela já visível
+        QTimer.singleShot(0, self._carregar_exemplo)
+
+    def _carregar_exemplo(self):
+        self._garantir_aba(0)
+        if self.tab_floor_editor.manager.tabela.n == 0:
+            self.tab_floor_editor.add_example_data()
+        self.tempos.marcar("pavimento de exemplo")
+        self.inicializacao_concluida.emit()
+
+    def _garantir_aba(self, indice: int):
+        if indice < 0 or indice in self._abas_construidas: return
+        self._abas_construidas.add(indice)
+        titulo, fabrica = self._abas[indice]
+        with self.tempos.medir_aba(titulo):
+            widget = fabrica()
+            self.main_tabs.widget(indice).layout().addWidget(widget)
+
+    def _criar_editor_pavimento(self):
+        # Import adiado: o editor traz o NumPy e o canvas gráfico
+        from ui.gui.tabs.floor_editor import FloorEditorTab
+
         # Aba 1: Editor de Pavimento (Grelha Global)
-        self.tab_floor_editor = FloorEditorTab()
+        self.tab_floor_editor = FloorEditorTab(self.executor, carregar_exemplo=False)
         # CONEXÃO: Recebe a laje do editor para detalhamento
         self.tab_floor_editor.laje_selecionada_signal.connect(self.importar_laje_para_calculadora)
-        self.main_tabs.addTab(self.tab_floor_editor, "1. Editor de Pavimento (Grelha)")
-        
+        return self.tab_floor_editor
+
+    def _criar_calculadora(self):
         # Aba 2: Calculadora Detalhada (Laje Individual)
         self.tab_single_calc = QWidget()
         self.setup_single_calc_ui()
-        self.main_tabs.addTab(self.tab_single_calc, "2. Calculadora Detalhada")
-        
-        self.main_layout.addWidget(self.main_tabs)
+        return self.tab_single_calc
+
+    def setup_status_bar(self):
+        """Indicador de progresso e botão de cancelamento das tarefas em segundo plano."""
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(220)
+        self.btn_cancelar = QPushButton("Cancelar")
+        self.btn_cancelar.clicked.connect(self.executor.cancelar_todos)
+        self.statusBar().addPermanentWidget(self.progress_bar)
+        self.statusBar().addPermanentWidget(self.btn_cancelar)
+        self.progress_bar.setVisible(False)
+        self.btn_cancelar.setVisible(False)
+
+        self.executor.progresso.connect(self.atualizar_progresso)
+        self.executor.ocupado.connect(self.atualizar_ocupado)
+        self.executor.erro.connect(self.exibir_erro_tarefa)
+
+    def atualizar_progresso(self, canal, concluidas, total):
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(concluidas)
+
+    def atualizar_ocupado(self, canal, ocupado):
+        ativo = self.executor.em_execucao()
+        self.progress_bar.setVisible(ativo)
+        self.btn_cancelar.setVisible(ativo)
+        if ocupado:
+            # Indeterminado até a primeira notificação de progresso
+            self.progress_bar.setRange(0, 0)
+
+    def exibir_erro_tarefa(self, canal, mensagem):
+        self.statusBar().showMessage(f"Erro na tarefa '{canal}': {mensagem}", 10000)
+
+    def closeEvent(self, event):
+        self.executor.cancelar_todos()
+        self.executor.aguardar()
+        super().closeEvent(event)
 
     def setup_single_calc_ui(self):
         layout = QHBoxLayout(self.tab_single_calc)
@@ -129,6 +224,7 @@ class MainWindow(QMainWindow):
             laje_pos = data_packet
             self.laje_pavimento_idx = -1
 
+        self._garantir_aba(1)
         self.laje_pavimento_ref = laje_pos
         self.btn_sync.setEnabled(True)
         
@@ -183,9 +279,6 @@ class MainWindow(QMainWindow):
             g_base_real = g_input_calculadora - g_paredes_original
             nova_laje.carregamento.g_revestimento = g_base_real
             
-            # Atualiza referência
-            self.laje_pavimento_ref.laje = nova_laje
-            
             # Atualiza visual da tabela na outra aba
             self.tab_floor_editor.atualizar_linha_tabela(self.laje_pavimento_idx, nova_laje)
             
@@ -301,24 +394,38 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Erro", f"Verifique os dados de entrada: {e}")
             return None
 
+    # --- Cálculo em segundo plano ---
+    # Cálculo e otimização usam o mesmo canal: a entrada mais recente substitui a anterior.
+
     def run_calculation(self):
         laje = self.get_user_data()
         if not laje: return
-        
-        self.current_result = SlabController(laje, AnalyticEngine()).run_analysis()
+
+        controller = SlabController(laje, AnalyticEngine())
+        self.executor.submeter("calculadora", lambda progresso: controller.run_analysis(),
+                               self.exibir_resultado, ao_falhar=self.exibir_falha)
+
+    def exibir_resultado(self, resultado):
+        self.current_result = resultado
         self.text_report.setText(ReportFormatter.format_as_text(self.current_result))
-        
+
         self.btn_export_json.setEnabled(True)
         self.btn_export_memorial.setEnabled(True)
 
+    def exibir_falha(self, mensagem):
+        QMessageBox.warning(self, "Erro", f"Falha no cálculo: {mensagem}")
+
     def run_optimization(self):
         laje = self.get_user_data()
         if not laje: return
         
         self.text_report.setText("Calculando altura ótima...")
-        QApplication.processEvents()
-        
-        h_opt = SlabController(laje, AnalyticEngine()).optimize_thickness()
+
+        controller = SlabController(laje, AnalyticEngine())
+        self.executor.submeter("calculadora", controller.optimize_thickness,
+                               self.aplicar_otimizacao, ao_falhar=self.exibir_falha)
+
+    def aplicar_otimizacao(self, h_opt):
         if h_opt:
             self.input_h_macica.setText(f"{h_opt*100:.1f}")
             self.run_calculation()
@@ -336,6 +443,5 @@ class MainWindow(QMainWindow):
         if not self.current_result: return
         path, _ = QFileDialog.getSaveFileName(self, "Salvar Memorial", "memorial_calculo.md", "Markdown (*.md)")
         if path:
-            conteudo = MemorialService.gerar_markdown([self.current_result])
-            if MemorialService.salvar_arquivo(conteudo, path):
+            if MemorialService.escrever_markdown([self.current_result], path):
                 QMessageBox.information(self, "Sucesso", f"Memorial salvo em:\n{path}")
\ No newline at end of file
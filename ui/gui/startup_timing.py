@@ -0,0 +1,43 @@
+"""
+Marcos de tempo da abertura da interface.
+
+Registra, a partir do início do processo, quando a janela foi criada, quando
+recebeu a primeira pintura e quanto custou construir cada aba (as abas são
+montadas sob demanda, ver MainWindow._garantir_aba). `python main.py --tempo-inicio`
+imprime o relatório quando a abertura termina.
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+class TemposInicializacao:
+    def __init__(self, inicio: Optional[float] = None):
+        self.inicio = time.perf_counter() if inicio is None else inicio
+        self.marcos: List[Tuple[str, float]] = [] # (etapa, segundos desde o início)
+        self.abas: Dict[str, float] = {}          # aba -> segundos de construção
+
+    def marcar(self, etapa: str):
+        self.marcos.append((etapa, time.perf_counter() - self.inicio))
+
+    def instante(self, etapa: str) -> Optional[float]:
+        for nome, t in self.marcos:
+            if nome == etapa:
+                return t
+        return None
+
+    @contextmanager
+    def medir_aba(self, nome: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.abas[nome] = time.perf_counter() - t0
+
+    def relatorio(self) -> str:
+        linhas = ["--- Tempos de inicialização ---"]
+        linhas += [f"{etapa:<32} {t * 1000:8.1f} ms" for etapa, t in self.marcos]
+        if self.abas:
+            linhas.append("Construção das abas:")
+            linhas += [f"  {nome:<30} {t * 1000:8.1f} ms" for nome, t in self.abas.items()]
+        return "\n".join(linhas)
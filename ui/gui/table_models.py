@@ -0,0 +1,239 @@
+"""
+Modelos Qt (model/view) sobre o armazenamento colunar do pavimento.
+
+As tabelas da interface leem diretamente das colunas de SlabTable/WallTable:
+nenhuma célula guarda texto próprio e a view só consulta as linhas visíveis.
+A validação acontece em setData, no momento em que o usuário confirma a edição;
+valores inválidos são recusados e o dado anterior permanece.
+
+Com um HistoricoEdicoes associado (atributo `historico`), cada edição aceita
+registra as linhas antes/depois; desfazer volta por restaurar_linha /
+inserir_linha / remover_linha, emitindo os mesmos sinais de uma edição comum.
+"""
+import math
+from typing import Any, Callable, Optional, Tuple
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+from app.models.slab_table import SlabTable, WallTable, LinhaTabela
+from app.services.edit_history import ALTERAR, INSERIR, REMOVER
+from app.models.value_objects import CargaLinear
+
+_EDITAVEL = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsEditable
+
+
+def _ler_numero(valor: Any) -> float:
+    # Aceita vírgula decimal (digitação em pt-BR)
+    return float(str(valor).strip().replace(',', '.'))
+
+
+def _formatar(v: float) -> str:
+    return f"{v:g}"
+
+
+def _positivo(v: float) -> bool: return v > 0
+def _nao_negativo(v: float) -> bool: return v >= 0
+def _qualquer(v: float) -> bool: return True
+
+
+class _ModeloColunar(QAbstractTableModel):
+    """
+    Base: colunas de texto (ids e listas) e numéricas (arrays do NumPy).
+    `alterado` é emitido após cada edição aceita; `erro_validacao` traz a
+    mensagem quando um valor é recusado.
+    """
+    alterado = pyqtSignal()
+    erro_validacao = pyqtSignal(str)
+
+    # Colunas numéricas: coluna da view -> (título, coluna da tabela, fator de exibição, validação, mensagem)
+    _NUMERICAS: dict = {}
+    _TITULOS: Tuple[str, ...] = ()
+
+    def __init__(self, tabela, parent=None):
+        super().__init__(parent)
+        self.tabela = tabela
+        self.historico = None # HistoricoEdicoes opcional
+
+    def definir_tabela(self, tabela):
+        """Troca a tabela de origem (ex: projeto carregado ou snapshot restaurado)."""
+        self.beginResetModel()
+        self.tabela = tabela
+        self.endResetModel()
+
+    # --- Interface do QAbstractTableModel ---
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.tabela.n
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._TITULOS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole: return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._TITULOS[section]
+        return str(section + 1)
+
+    def flags(self, index: QModelIndex):
+        return _EDITAVEL if index.isValid() else Qt.ItemFlag.NoItemFlags
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole): return None
+        r, c = index.row(), index.column()
+        if r >= self.tabela.n: return None
+        num = self._NUMERICAS.get(c)
+        if num is not None:
+            return _formatar(float(self.tabela._buf[num[1]][r]) * num[2])
+        return self._texto(r, c)
+
+    def setData(self, index: QModelIndex, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if role != Qt.ItemDataRole.EditRole or not index.isValid(): return False
+        r, c = index.row(), index.column()
+        antes = self.tabela.ler_linha(r)
+        num = self._NUMERICAS.get(c)
+        if num is not None:
+            titulo, coluna, fator, valido, msg = num
+            try:
+                v = _ler_numero(value)
+            except ValueError:
+                self.erro_validacao.emit(f"{titulo}: '{value}' não é um número.")
+                return False
+            if not math.isfinite(v):
+                # nan/inf passam por float(): seriam aceitos e quebrariam vínculos e análise em silêncio
+                self.erro_validacao.emit(f"{titulo}: '{value}' não é um número finito.")
+                return False
+            if not valido(v):
+                self.erro_validacao.emit(f"{titulo}: {msg}")
+                return False
+            self.tabela.atualizar(r, **{coluna: v / fator})
+        else:
+            texto = str(value).strip()
+            if not self._definir_texto(r, c, texto):
+                return False
+
+        self._registrar(ALTERAR, r, antes, self.tabela.ler_linha(r))
+        self.dataChanged.emit(index, index)
+        self.alterado.emit()
+        return True
+
+    def _registrar(self, tipo: str, r: int, antes: Optional[LinhaTabela], depois: Optional[LinhaTabela]):
+        if self.historico is not None:
+            self.historico.registrar(self, tipo, r, antes, depois)
+
+    # --- Inclusão / remoção ---
+
+    def _inserir(self, adicionar: Callable[[], Any]) -> int:
+        r = self.tabela.n
+        self.beginInsertRows(QModelIndex(), r, r)
+        adicionar()
+        self.endInsertRows()
+        self._registrar(INSERIR, r, None, self.tabela.ler_linha(r))
+        self.alterado.emit()
+        return r
+
+    def remover_linha(self, r: int):
+        if not 0 <= r < self.tabela.n: return
+        antes = self.tabela.ler_linha(r)
+        self.beginRemoveRows(QModelIndex(), r, r)
+        self.tabela.remover(r)
+        self.endRemoveRows()
+        self._registrar(REMOVER, r, antes, None)
+        self.alterado.emit()
+
+    # --- Reaplicação de linhas (desfazer/refazer) ---
+
+    def restaurar_linha(self, r: int, linha: LinhaTabela):
+        self.tabela.escrever_linha(r, linha)
+        self.atualizar_linhas(r, r)
+        self.alterado.emit()
+
+    def inserir_linha(self, r: int, linha: LinhaTabela):
+        self.beginInsertRows(QModelIndex(), r, r)
+        self.tabela.inserir_linha(r, linha)
+        self.endInsertRows()
+        self.alterado.emit()
+
+    def atualizar_linhas(self, inicio: int = 0, fim: Optional[int] = None):
+        """Notifica a view de alterações feitas fora do modelo (ex: sincronização)."""
+        if self.tabela.n == 0: return
+        fim = self.tabela.n - 1 if fim is None else fim
+        self.dataChanged.emit(self.index(inicio, 0), self.index(fim, self.columnCount() - 1))
+
+    # --- Colunas de texto (implementadas nas subclasses) ---
+
+    def _texto(self, r: int, c: int) -> str:
+        return self.tabela.ids[r]
+
+    def _definir_texto(self, r: int, c: int, texto: str) -> bool:
+        if not texto:
+            self.erro_validacao.emit("ID: não pode ficar vazio.")
+            return False
+        self.tabela.renomear(r, texto)
+        return True
+
+
+class SlabTableModel(_ModeloColunar):
+    """Lajes: ID | Lx | Ly | h (cm) | Perm | Acid | Pos X | Pos Y | V.Esq | V.Dir | V.Sup | V.Inf"""
+
+    _TITULOS = ("ID", "Lx", "Ly", "h (cm)", "Perm", "Acid", "Pos X", "Pos Y", "V.Esq", "V.Dir", "V.Sup", "V.Inf")
+    _NUMERICAS = {
+        1: ("Lx", 'lx', 1.0, _positivo, "o vão deve ser positivo."),
+        2: ("Ly", 'ly', 1.0, _positivo, "o vão deve ser positivo."),
+        3: ("h", 'h', 100.0, _positivo, "a espessura deve ser positiva."),
+        4: ("Perm", 'g_revestimento', 1.0, _nao_negativo, "a carga não pode ser negativa."),
+        5: ("Acid", 'q_acidental', 1.0, _nao_negativo, "a carga não pode ser negativa."),
+        6: ("Pos X", 'x', 1.0, _qualquer, ""),
+        7: ("Pos Y", 'y', 1.0, _qualquer, ""),
+    }
+    _COL_VIGAS = 8  # V.Esq..V.Inf na ordem de BORDAS
+
+    def __init__(self, tabela: SlabTable, parent=None):
+        super().__init__(tabela, parent)
+
+    def _texto(self, r: int, c: int) -> str:
+        if c >= self._COL_VIGAS:
+            return self.tabela.vigas[r][c - self._COL_VIGAS]
+        return super()._texto(r, c)
+
+    def _definir_texto(self, r: int, c: int, texto: str) -> bool:
+        if c >= self._COL_VIGAS:
+            vigas = list(self.tabela.vigas[r])
+            vigas[c - self._COL_VIGAS] = texto # Vazio = borda sem viga
+            self.tabela.vigas[r] = tuple(vigas)
+            self.tabela.marcar_alteracao()
+            return True
+        return super()._definir_texto(r, c, texto)
+
+    def definir_vinculo_manual(self, r: int, borda: str, tipo: str):
+        """Força a condição de uma borda ('' = automático), com registro no histórico."""
+        antes = self.tabela.ler_linha(r)
+        vinculos = self.tabela.vinculos_manuais_dict(r)
+        vinculos[borda] = tipo
+        self.tabela.definir_vinculos_manuais(r, vinculos)
+        self._registrar(ALTERAR, r, antes, self.tabela.ler_linha(r))
+        self.alterado.emit()
+
+    def adicionar_laje(self, laje_pos) -> int:
+        """Acrescenta uma LajePosicionada ao final e retorna a linha."""
+        return self._inserir(lambda: self.tabela.adicionar(
+            laje_pos.id, laje_pos.laje, laje_pos.x, laje_pos.y, vigas=laje_pos.vigas,
+            dim_vigas=laje_pos.dim_vigas, vinculos_manuais=laje_pos.vinculos_manuais))
+
+
+class WallTableModel(_ModeloColunar):
+    """Paredes: ID | X1 | Y1 | X2 | Y2 | Carga (kN/m)"""
+
+    _TITULOS = ("ID", "X1", "Y1", "X2", "Y2", "Carga (kN/m)")
+    _NUMERICAS = {
+        1: ("X1", 'x_inicio', 1.0, _qualquer, ""),
+        2: ("Y1", 'y_inicio', 1.0, _qualquer, ""),
+        3: ("X2", 'x_fim', 1.0, _qualquer, ""),
+        4: ("Y2", 'y_fim', 1.0, _qualquer, ""),
+        5: ("Carga", 'carga_kn_m', 1.0, _nao_negativo, "a carga não pode ser negativa."),
+    }
+
+    def __init__(self, tabela: WallTable, parent=None):
+        super().__init__(tabela, parent)
+
+    def adicionar_parede(self, parede: CargaLinear) -> int:
+        return self._inserir(lambda: self.tabela.adicionar(parede))
@@ -1,24 +1,80 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-                             QTableWidgetItem, QPushButton, QHeaderView, QSplitter,
-                             QMessageBox, QLabel, QTabWidget, QFileDialog, QMenu)
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+                             QPushButton, QHeaderView, QSplitter,
+                             QMessageBox, QLabel, QTabWidget, QFileDialog, QMenu, QComboBox)
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+from PyQt6.QtGui import QKeySequence, QShortcut
 from ui.gui.widgets.floor_canvas import FloorCanvas
+from ui.gui.workers import ExecutorTarefas
+from ui.gui.table_models import SlabTableModel, WallTableModel
 from app.models.floor_system import GerenciadorPavimento, LajePosicionada
-from app.models.value_objects import Materiais, Carregamento, ClasseAgressividade, CargaLinear
+from app.models.value_objects import ClasseAgressividade, CargaLinear
+from app.models import flyweights
+from app.models.flyweights import internar_materiais, internar_carregamento, CarregamentoLaje
 from app.models.solid import LajeMacica
+from app.models import columnar
+from app.services.utilizacao import METRICAS, indices_utilizacao
+from app.services.campos_aproximados import CAMPOS, campos_aproximados
+from app.services.report_formatter import ReportFormatter
 from app.services.catalog_service import catalog_service
+from app.services.edit_history import HistoricoEdicoes
+from app.services.project_store import ProjetoPavimentos
+
+# Intervalo sem novas edições antes de recalcular vínculos/cargas do pavimento
+ATRASO_RECALCULO_MS = 250
+
+
+def _criar_view(modelo):
+    view = QTableView()
+    view.setModel(modelo)
+    view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+    view.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+    # Altura fixa: a view não mede o conteúdo de todas as linhas
+    view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    view.verticalHeader().setDefaultSectionSize(22)
+    return view
+
 
 class FloorEditorTab(QWidget):
     laje_selecionada_signal = pyqtSignal(object)
 
-    def __init__(self):
+    def __init__(self, executor: ExecutorTarefas = None, carregar_exemplo: bool = True):
         super().__init__()
         self.manager = GerenciadorPavimento()
-        
-        # Dicionário para guardar vínculos manuais: { 'L1': {'direita': 'livre', ...}, ... }
-        self.manual_overrides = {} 
+        self.executor = executor or ExecutorTarefas(self)
+
+        # As tabelas da interface são vistas diretas do armazenamento do pavimento
+        # (vínculos manuais ficam na coluna vinculos_manuais da SlabTable)
+        self.modelo_lajes = SlabTableModel(self.manager.tabela, self)
+        self.modelo_paredes = WallTableModel(self.manager.tabela_paredes, self)
+
+        # Desfazer/refazer: os modelos registram as linhas alteradas (deltas)
+        self.historico = HistoricoEdicoes()
+        self.modelo_lajes.historico = self.modelo_paredes.historico = self.historico
+
+        # Projeto aberto (vários pavimentos, lidos sob demanda) e pavimento em edição
+        self.projeto = None
+        self.nome_pavimento = None
+
+        # Última análise do pavimento (matriz colunar), índices de utilização e
+        # campos nodais derivados. Válidos enquanto a versão da tabela não mudar.
+        self._resultados = None
+        self._indices = None
+        self._campos = None
+        self._versao_resultados = -1
+
+        # Recalculo agrupado: cada edição reinicia a contagem (debounce)
+        self._timer_recalculo = QTimer(self)
+        self._timer_recalculo.setSingleShot(True)
+        self._timer_recalculo.setInterval(ATRASO_RECALCULO_MS)
+        self._timer_recalculo.timeout.connect(self.process_geometry)
+        for modelo in (self.modelo_lajes, self.modelo_paredes):
+            modelo.alterado.connect(self._timer_recalculo.start)
+            modelo.erro_validacao.connect(self.exibir_erro_validacao)
+            modelo.alterado.connect(self._atualizar_botoes_historico)
         
         self.setup_ui()
+        if carregar_exemplo:
+            self.add_example_data()
 
     def setup_ui(self):
         main_layout = QHBoxLayout(self)
@@ -26,17 +82,24 @@ class FloorEditorTab(QWidget):
         # --- PAINEL ESQUERDO ---
         left_panel_container = QWidget()
         vbox_left = QVBoxLayout(left_panel_container)
+
+        # Projeto: pavimento em edição + abrir/salvar
+        self.combo_pavimento = QComboBox()
+        self.combo_pavimento.setEnabled(False)
+        self.combo_pavimento.currentTextChanged.connect(self.trocar_pavimento)
+        btn_abrir = QPushButton("Abrir Projeto"); btn_abrir.clicked.connect(self.abrir_projeto)
+        btn_salvar = QPushButton("Salvar Projeto"); btn_salvar.clicked.connect(self.salvar_projeto)
+        btn_novo_pav = QPushButton("Duplicar Pavimento"); btn_novo_pav.clicked.connect(self.duplicar_pavimento)
+        hproj = QHBoxLayout()
+        hproj.addWidget(self.combo_pavimento, 1); hproj.addWidget(btn_abrir); hproj.addWidget(btn_salvar); hproj.addWidget(btn_novo_pav)
+        vbox_left.addLayout(hproj)
         
         self.tabs_input = QTabWidget()
         
         # 1. ABA LAJES
         tab_lajes = QWidget()
         vbox_l = QVBoxLayout(tab_lajes)
-        self.table_lajes = QTableWidget()
-        
-        cols_l = ["ID", "Lx", "Ly", "h (cm)", "Perm", "Acid", "Pos X", "Pos Y", "V.Esq", "V.Dir", "V.Sup", "V.Inf"]
-        self.table_lajes.setColumnCount(len(cols_l))
-        self.table_lajes.setHorizontalHeaderLabels(cols_l)
+        self.table_lajes = _criar_view(self.modelo_lajes)
         
         # Menu de contexto
         self.table_lajes.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
@@ -53,10 +116,7 @@ class FloorEditorTab(QWidget):
         # 2. ABA PAREDES
         tab_paredes = QWidget()
         vbox_p = QVBoxLayout(tab_paredes)
-        self.table_paredes = QTableWidget()
-        cols_p = ["ID", "X1", "Y1", "X2", "Y2", "Carga (kN/m)"]
-        self.table_paredes.setColumnCount(len(cols_p))
-        self.table_paredes.setHorizontalHeaderLabels(cols_p)
+        self.table_paredes = _criar_view(self.modelo_paredes)
         vbox_p.addWidget(self.table_paredes)
         
         btn_add_p = QPushButton("Add Parede"); btn_add_p.clicked.connect(self.add_parede_row)
@@ -75,6 +135,21 @@ class FloorEditorTab(QWidget):
         lbl_hint.setStyleSheet("color: gray; font-style: italic; font-size: 10px;")
         vbox_act.addWidget(lbl_hint)
 
+        self.lbl_validacao = QLabel("")
+        self.lbl_validacao.setStyleSheet("color: #C62828; font-size: 10px;")
+        vbox_act.addWidget(self.lbl_validacao)
+
+        self.btn_desfazer = QPushButton("Desfazer"); self.btn_desfazer.clicked.connect(self.desfazer)
+        self.btn_refazer = QPushButton("Refazer"); self.btn_refazer.clicked.connect(self.refazer)
+        hh = QHBoxLayout(); hh.addWidget(self.btn_desfazer); hh.addWidget(self.btn_refazer)
+        vbox_act.addLayout(hh)
+        for tecla, acao in ((QKeySequence.StandardKey.Undo, self.desfazer),
+                            (QKeySequence.StandardKey.Redo, self.refazer)):
+            atalho = QShortcut(QKeySequence(tecla), self)
+            atalho.setContext(Qt.ShortcutContext.WidgetWithChildrenShortcut)
+            atalho.activated.connect(acao)
+        self._atualizar_botoes_historico()
+
         btn_upd = QPushButton("1. Atualizar Geometria")
         btn_upd.clicked.connect(self.process_geometry)
         
@@ -84,42 +159,142 @@ class FloorEditorTab(QWidget):
         
         btn_export = QPushButton("3. Exportar JSON para Vigas")
         btn_export.clicked.connect(self.export_floor_data)
+
+        btn_analisar = QPushButton("Analisar Pavimento (Mapa de Utilização)")
+        btn_analisar.clicked.connect(self.analisar_pavimento)
+        self.combo_metrica = QComboBox()
+        self.combo_metrica.addItem("Sem mapa", None)
+        for chave, rotulo in METRICAS.items():
+            self.combo_metrica.addItem(rotulo, chave)
+        for nome, rotulo in CAMPOS.items():
+            self.combo_metrica.addItem(rotulo, ("campo", nome))
+        # Trocar a métrica só recolore: não reanalisa
+        self.combo_metrica.currentIndexChanged.connect(self.aplicar_mapa_utilizacao)
         
         vbox_act.addWidget(btn_upd)
         vbox_act.addWidget(self.btn_send_to_calc)
         vbox_act.addWidget(btn_export)
+        vbox_act.addWidget(btn_analisar)
+        vbox_act.addWidget(self.combo_metrica)
         
         vbox_left.addWidget(group_actions)
 
         # --- PAINEL DIREITO ---
         self.canvas = FloorCanvas()
+        self.canvas.laje_clicada.connect(self.exibir_resumo_laje)
         split = QSplitter(Qt.Orientation.Horizontal)
         split.addWidget(left_panel_container)
         split.addWidget(self.canvas)
         main_layout.addWidget(split)
-        
-        # INICIALIZAÇÃO DE DADOS DE EXEMPLO (CORREÇÃO: Chamada restaurada)
-        self.add_example_data()
 
     def add_laje_row(self):
-        r = self.table_lajes.rowCount(); self.table_lajes.insertRow(r)
-        defaults = [f"L{r+1}", "4.0", "5.0", "12.0", "1.0", "2.0", "0.0", "0.0", "V1", "V2", "V3", "V4"]
-        for i, val in enumerate(defaults): self.table_lajes.setItem(r, i, QTableWidgetItem(val))
+        r = self.modelo_lajes.rowCount()
+        mat = internar_materiais(fck=25, fyk=500, Ecs=25.0)
+        laje = LajeMacica(h=0.12, lx=4.0, ly=5.0, materiais=mat, caa=ClasseAgressividade.II, bordas={},
+                          carregamento=CarregamentoLaje(internar_carregamento(1.0, 2.0)))
+        vigas = {'esquerda': "V1", 'direita': "V2", 'topo': "V3", 'fundo': "V4"}
+        self.modelo_lajes.adicionar_laje(LajePosicionada(f"L{r+1}", laje, 0.0, 0.0, vigas=vigas))
 
     def add_parede_row(self):
-        r = self.table_paredes.rowCount(); self.table_paredes.insertRow(r)
-        data = [f"P{r+1}", "2.0", "0.0", "2.0", "5.0", "3.0"]
-        for i, v in enumerate(data): self.table_paredes.setItem(r, i, QTableWidgetItem(v))
+        r = self.modelo_paredes.rowCount()
+        self.modelo_paredes.adicionar_parede(CargaLinear(f"P{r+1}", 2.0, 0.0, 2.0, 5.0, 3.0))
 
     def remove_row(self, table):
-        c = table.currentRow()
-        if c >= 0: table.removeRow(c); self.process_geometry()
+        c = table.currentIndex().row()
+        if c >= 0: table.model().remover_linha(c)
+
+    def exibir_erro_validacao(self, mensagem):
+        self.lbl_validacao.setText(mensagem)
+
+    def carregar_pavimento(self, manager, resultados=None):
+        """
+        Substitui o pavimento em edição (ex: projeto aberto ou gerado em lote).
+        `resultados`: matriz de uma análise ainda válida para este pavimento (cache do projeto).
+        """
+        self._timer_recalculo.stop() # Edições pendentes eram do pavimento anterior
+        self.manager = manager
+        self.modelo_lajes.definir_tabela(manager.tabela)
+        self.modelo_paredes.definir_tabela(manager.tabela_paredes)
+        self.historico.limpar() # Registros apontam para linhas da tabela anterior
+        self._atualizar_botoes_historico()
+        if resultados is not None:
+            self._adotar_resultados(resultados, manager.tabela, manager.tabela.versao)
+        else:
+            self._descartar_analise()
+        self.process_geometry()
+        self.aplicar_mapa_utilizacao()
+
+    # --- Projeto (arquivo com vários pavimentos) ---
+
+    def abrir_projeto(self):
+        caminho = QFileDialog.getExistingDirectory(self, "Abrir Projeto (.pylaje)")
+        if not caminho: return
+        try:
+            projeto = ProjetoPavimentos.abrir(caminho)
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self, "Erro", f"Não foi possível abrir o projeto: {e}")
+            return
+        # O projeto anterior é descartado: especificações internadas por ele não serão mais reaproveitadas
+        flyweights.limpar()
+        self.projeto = projeto
+        self.nome_pavimento = None
+        self._preencher_combo_pavimentos(projeto.nomes[0] if projeto.nomes else None)
+
+    def salvar_projeto(self):
+        self._aplicar_pendentes()
+        if self.projeto is None:
+            caminho, _ = QFileDialog.getSaveFileName(self, "Salvar Projeto", "projeto.pylaje", "Projeto PyLaje (*.pylaje)")
+            if not caminho: return
+            self.projeto = ProjetoPavimentos(caminho)
+            self.nome_pavimento = "Pavimento 1"
+            self.projeto.adicionar_pavimento(self.nome_pavimento, self.manager)
+            if self._resultados is not None:
+                self.projeto.definir_resultados(self.nome_pavimento, self._resultados, self._versao_resultados)
+            self._preencher_combo_pavimentos(self.nome_pavimento)
+        try:
+            gravados = self.projeto.salvar()
+        except OSError as e:
+            QMessageBox.warning(self, "Erro", f"Falha ao salvar o projeto: {e}")
+            return
+        self.window().statusBar().showMessage(f"Projeto salvo ({gravados} arquivo(s) gravado(s)).", 5000)
+
+    def duplicar_pavimento(self):
+        """Novo pavimento no projeto, copiado do atual (ex: pavimento tipo)."""
+        if self.projeto is None:
+            QMessageBox.information(self, "Projeto", "Salve o projeto antes de adicionar pavimentos.")
+            return
+        self._aplicar_pendentes()
+        nome, i = f"Pavimento {len(self.projeto.nomes) + 1}", len(self.projeto.nomes) + 1
+        while nome in self.projeto.nomes:
+            i += 1
+            nome = f"Pavimento {i}"
+        self.projeto.adicionar_pavimento(nome, self.manager.copiar())
+        self._preencher_combo_pavimentos(nome)
+
+    def _preencher_combo_pavimentos(self, selecionado):
+        self.combo_pavimento.blockSignals(True)
+        self.combo_pavimento.clear()
+        self.combo_pavimento.addItems(self.projeto.nomes)
+        self.combo_pavimento.setEnabled(True)
+        self.combo_pavimento.blockSignals(False)
+        if selecionado is not None:
+            self.combo_pavimento.setCurrentText(selecionado)
+            self.trocar_pavimento(selecionado)
+
+    def trocar_pavimento(self, nome):
+        """Edita outro pavimento do projeto (lido do disco só na primeira vez)."""
+        if self.projeto is None or not nome or nome == self.nome_pavimento: return
+        self._aplicar_pendentes()
+        self.nome_pavimento = nome
+        self.carregar_pavimento(self.projeto.pavimento(nome), self.projeto.resultados(nome))
 
     # MÉTODO RESTAURADO: Adiciona dados iniciais para não abrir vazio
     def add_example_data(self):
         self.add_laje_row()   # Adiciona L1 padrão
         self.add_parede_row() # Adiciona P1 padrão
         self.process_geometry() # Renderiza
+        self.historico.limpar() # O exemplo não entra no desfazer
+        self._atualizar_botoes_historico()
 
     def abrir_menu_contexto(self, position):
         menu = QMenu()
@@ -131,66 +306,60 @@ class FloorEditorTab(QWidget):
         menu.exec(self.table_lajes.viewport().mapToGlobal(position))
 
     def set_vinculo(self, borda, tipo):
-        row = self.table_lajes.currentRow()
+        row = self.table_lajes.currentIndex().row()
         if row < 0: return
-        laje_id = self.table_lajes.item(row, 0).text()
-        
-        if laje_id not in self.manual_overrides:
-            self.manual_overrides[laje_id] = {}
-        self.manual_overrides[laje_id][borda] = tipo
+        laje_id = self.manager.tabela.ids[row]
         
-        self.process_geometry() 
+        self.modelo_lajes.definir_vinculo_manual(row, borda, tipo)
+        self.process_geometry()
         tipo_str = tipo.upper() if tipo else "AUTOMÁTICO"
         QMessageBox.information(self, "Vínculo Definido", f"Laje {laje_id} - Borda {borda}: {tipo_str}")
 
+    # --- Desfazer / refazer ---
+    # A reaplicação passa pelos modelos: mesmos sinais e mesmo recálculo agrupado de uma edição.
+
+    def desfazer(self):
+        if self.historico.desfazer():
+            self._atualizar_botoes_historico()
+
+    def refazer(self):
+        if self.historico.refazer():
+            self._atualizar_botoes_historico()
+
+    def _atualizar_botoes_historico(self):
+        self.btn_desfazer.setEnabled(self.historico.pode_desfazer())
+        self.btn_refazer.setEnabled(self.historico.pode_refazer())
+
     def process_geometry(self):
-        self.manager.limpar()
+        """Recalcula vínculos e cargas de paredes a partir das tabelas e redesenha."""
+        self._timer_recalculo.stop()
+        self.lbl_validacao.setText("")
+        # Qualquer edição desde a análise invalida o mapa de utilização
+        analise_valida = self._resultados is not None and self.manager.tabela.versao == self._versao_resultados
         try:
-            for r in range(self.table_lajes.rowCount()):
-                nome = self.table_lajes.item(r,0).text()
-                lx = float(self.table_lajes.item(r,1).text())
-                ly = float(self.table_lajes.item(r,2).text())
-                h_cm = float(self.table_lajes.item(r,3).text())
-                g_perm = float(self.table_lajes.item(r,4).text())
-                q_acid = float(self.table_lajes.item(r,5).text())
-                x = float(self.table_lajes.item(r,6).text())
-                y = float(self.table_lajes.item(r,7).text())
-                vigas = {
-                    'esquerda': self.table_lajes.item(r,8).text(),
-                    'direita': self.table_lajes.item(r,9).text(),
-                    'topo': self.table_lajes.item(r,10).text(),
-                    'fundo': self.table_lajes.item(r,11).text()
-                }
-                
-                mat = Materiais(fck=25, fyk=500, Ecs=25.0)
-                cargas = Carregamento(g_revestimento=g_perm, q_acidental=q_acid)
-                
-                laje = LajeMacica(h=h_cm/100.0, lx=lx, ly=ly, materiais=mat, caa=ClasseAgressividade.II, bordas={}, carregamento=cargas)
-                
-                overrides = self.manual_overrides.get(nome, {})
-                laje_pos = LajePosicionada(nome, laje, x, y, vigas=vigas, vinculos_manuais=overrides)
-                self.manager.adicionar_laje(laje_pos)
-
-            for r in range(self.table_paredes.rowCount()):
-                n = self.table_paredes.item(r,0).text()
-                x1, y1 = float(self.table_paredes.item(r,1).text()), float(self.table_paredes.item(r,2).text())
-                x2, y2 = float(self.table_paredes.item(r,3).text()), float(self.table_paredes.item(r,4).text())
-                c = float(self.table_paredes.item(r,5).text())
-                self.manager.adicionar_parede(CargaLinear(n, x1, y1, x2, y2, c))
-
+            self.manager.recalcular_vinculos()
             self.manager.distribuir_cargas_paredes()
-            self.canvas.update_system(self.manager.lajes, self.manager.paredes)
+            self.canvas.update_from_tables(self.manager.tabela, self.manager.tabela_paredes)
+            if analise_valida:
+                self._versao_resultados = self.manager.tabela.versao
+            else:
+                self._descartar_analise()
 
         except Exception as e: 
             print(f"Erro: {e}")
             QMessageBox.warning(self, "Erro nos Dados", f"Verifique a tabela: {e}")
 
+    def _aplicar_pendentes(self):
+        # Edições ainda dentro do intervalo de debounce
+        if self._timer_recalculo.isActive():
+            self.process_geometry()
+
     def enviar_para_calculadora(self):
-        row = self.table_lajes.currentRow()
+        row = self.table_lajes.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "Aviso", "Selecione uma laje.")
             return
-        self.process_geometry()
+        self._aplicar_pendentes()
         
         # Verificação de segurança de índice
         if row < len(self.manager.lajes):
@@ -200,14 +369,70 @@ class FloorEditorTab(QWidget):
             QMessageBox.warning(self, "Erro", "Erro de sincronia. Tente 'Atualizar Geometria' primeiro.")
 
     def export_floor_data(self):
-        self.process_geometry()
+        self._aplicar_pendentes()
         path, _ = QFileDialog.getSaveFileName(self, "Exportar", "vigas.json", "JSON (*.json)")
         if path:
-            self.manager.calcular_e_exportar_vigas(path)
-            QMessageBox.information(self, "Sucesso", "Exportado.")
+            # Snapshot: a edição continua liberada enquanto a exportação roda
+            manager = self.manager.copiar()
+            self.executor.submeter(
+                "exportacao_vigas",
+                lambda progresso: manager.calcular_e_exportar_vigas(path, progresso),
+                lambda _: QMessageBox.information(self, "Sucesso", "Exportado."),
+                ao_falhar=lambda msg: QMessageBox.warning(self, "Erro", f"Falha na exportação: {msg}")
+            )
+
+    # --- Análise do pavimento e mapa de utilização ---
+
+    def analisar_pavimento(self):
+        self._aplicar_pendentes()
+        manager = self.manager.copiar()
+        tabela_atual, versao = self.manager.tabela, self.manager.tabela.versao
+
+        def concluir(saida):
+            # Editado (ou trocado de pavimento) durante a análise
+            if self.manager.tabela is not tabela_atual or tabela_atual.versao != versao: return
+            self._adotar_resultados(saida, manager.tabela, versao) # Mesma geometria da análise
+            if self.projeto is not None:
+                self.projeto.definir_resultados(self.nome_pavimento, saida, versao)
+            if self.combo_metrica.currentData() is None:
+                self.combo_metrica.setCurrentIndex(1) # Dispara aplicar_mapa_utilizacao
+            else:
+                self.aplicar_mapa_utilizacao()
+
+        self.executor.submeter(
+            "analise_pavimento", manager.analisar, concluir,
+            ao_falhar=lambda msg: QMessageBox.warning(self, "Erro", f"Falha na análise: {msg}")
+        )
+
+    def _adotar_resultados(self, saida, tabela, versao):
+        self._resultados = saida
+        self._indices = indices_utilizacao(saida)
+        self._campos = campos_aproximados(tabela, saida)
+        self._versao_resultados = versao
+
+    def _descartar_analise(self):
+        if self._resultados is None: return
+        self._resultados = self._indices = self._campos = None
+        self.canvas.definir_campo(None)
+
+    def aplicar_mapa_utilizacao(self):
+        chave = self.combo_metrica.currentData()
+        if chave is None or self._indices is None:
+            self.canvas.definir_campo(None)
+        elif isinstance(chave, tuple): # ("campo", nome): contorno do campo nodal
+            self.canvas.definir_campo(self._campos, chave[1])
+        else:
+            self.canvas.definir_campo(None)
+            self.canvas.definir_utilizacao(self._indices[chave])
+
+    def exibir_resumo_laje(self, row):
+        self.table_lajes.selectRow(row)
+        if self._resultados is None or row >= len(self._resultados): return
+        res = columnar.linha_para_resultado(self._resultados[row])
+        QMessageBox.information(self, f"Laje {self.manager.tabela.ids[row]}", ReportFormatter.format_as_text(res))
 
     def atualizar_linha_tabela(self, row_idx, laje_atualizada):
         """Atualiza a tabela visual após sincronização da calculadora."""
-        if row_idx < 0 or row_idx >= self.table_lajes.rowCount(): return
-        self.table_lajes.setItem(row_idx, 3, QTableWidgetItem(f"{laje_atualizada.h * 100:.1f}"))
+        if row_idx < 0 or row_idx >= self.modelo_lajes.rowCount(): return
+        self.modelo_lajes.setData(self.modelo_lajes.index(row_idx, 3), f"{laje_atualizada.h * 100:.1f}")
         self.table_lajes.selectRow(row_idx)
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Rasterização de campos nodais (app.engines.fem_adapter.CampoNodal) em QImage.
+
+Em vez de um QGraphicsItem por elemento, o campo é amostrado direto nos pixels
+da área visível: cada pixel é associado à laje que o contém (busca binária por
+faixas de colunas/linhas), o valor é interpolado bilinearmente na malha da laje
+e convertido em cor por uma tabela (LUT) pré-calculada. Tudo vetorizado no NumPy.
+"""
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+from PyQt6.QtCore import QRectF
+from PyQt6.QtGui import QImage, QColor
+
+from app.engines.fem_adapter import CampoNodal
+
+N_CORES = 256
+
+
+def _lut(cores) -> np.ndarray:
+    # ARGB32 (0xAARRGGBB) para cada um dos N_CORES níveis
+    return np.array([QColor(*c).rgba() for c in cores], dtype=np.uint32)
+
+
+# Tabelas montadas no primeiro uso (não pesam na abertura do programa)
+@lru_cache(maxsize=None)
+def lut_divergente() -> np.ndarray:
+    """Azul (negativo) -> branco (zero) -> vermelho (positivo)."""
+    cores = []
+    for i in range(N_CORES):
+        t = i / (N_CORES - 1) * 2.0 - 1.0
+        if t < 0:
+            cores.append((int(255 * (1 + t)), int(255 * (1 + t)), 255))
+        else:
+            cores.append((255, int(255 * (1 - t)), int(255 * (1 - t))))
+    return _lut(cores)
+
+
+@lru_cache(maxsize=None)
+def lut_sequencial() -> np.ndarray:
+    """Azul (mínimo) -> ciano -> verde -> amarelo -> vermelho (máximo)."""
+    cores = []
+    for i in range(N_CORES):
+        c = QColor.fromHsvF((1.0 - i / (N_CORES - 1)) * 2.0 / 3.0, 0.85, 1.0)
+        cores.append((c.red(), c.green(), c.blue()))
+    return _lut(cores)
+
+
+def rasterizar(campo: CampoNodal, nome: str, area: QRectF, largura: int, altura: int,
+               vmin: float, vmax: float, lut: np.ndarray) -> Optional[QImage]:
+    """
+    Amostra o campo `nome` nos centros de uma grade largura x altura cobrindo
+    `area` (coordenadas da cena). A linha 0 da imagem corresponde a area.top().
+    Pixels fora das lajes ficam transparentes.
+    """
+    if largura <= 0 or altura <= 0:
+        return None
+    xs = area.left() + (np.arange(largura) + 0.5) * (area.width() / largura)
+    ys = area.top() + (np.arange(altura) + 0.5) * (area.height() / altura)
+    imagem = np.zeros((altura, largura), dtype=np.uint32)
+
+    # 1. Faixa de pixels (colunas [c0, c1) e linhas [r0, r1)) de cada laje
+    x0, y0, lx, ly = campo.x0, campo.y0, campo.lx, campo.ly
+    c0 = np.searchsorted(xs, x0, side='left')
+    c1 = np.searchsorted(xs, x0 + lx, side='left')
+    r0 = np.searchsorted(ys, y0, side='left')
+    r1 = np.searchsorted(ys, y0 + ly, side='left')
+    nc, nr = c1 - c0, r1 - r0
+    cont = np.where((nc > 0) & (nr > 0), nc * nr, 0)
+    total = int(cont.sum())
+    if total:
+        # 2. Expande para a lista (laje, linha, coluna) de cada pixel coberto
+        p = np.repeat(np.arange(campo.n), cont)
+        k = np.arange(total) - np.repeat(np.cumsum(cont) - cont, cont)
+        ncp = np.repeat(nc, cont)
+        col = np.repeat(c0, cont) + k % ncp
+        lin = np.repeat(r0, cont) + k // ncp
+
+        # 3. Interpolação bilinear na malha (ny x nx) da laje
+        V = campo.valores[nome]
+        ny, nx = V.shape[1], V.shape[2]
+        u = np.clip((xs[col] - x0[p]) / lx[p], 0.0, 1.0) * (nx - 1)
+        v = np.clip((ys[lin] - y0[p]) / ly[p], 0.0, 1.0) * (ny - 1)
+        iu = np.minimum(u.astype(np.intp), nx - 2)
+        iv = np.minimum(v.astype(np.intp), ny - 2)
+        fu, fv = u - iu, v - iv
+        val = ((V[p, iv, iu] * (1 - fu) + V[p, iv, iu + 1] * fu) * (1 - fv) +
+               (V[p, iv + 1, iu] * (1 - fu) + V[p, iv + 1, iu + 1] * fu) * fv)
+
+        # 4. Cor pela LUT
+        escala = (N_CORES - 1) / (vmax - vmin) if vmax > vmin else 0.0
+        nivel = np.clip(((val - vmin) * escala).astype(np.intp), 0, N_CORES - 1)
+        imagem[lin, col] = lut[nivel]
+
+    qimg = QImage(imagem.data, largura, altura, 4 * largura, QImage.Format.Format_ARGB32)
+    return qimg.copy() # Desvincula do buffer do NumPy
@@ -1,87 +1,353 @@
-from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsRectItem, QGraphicsSimpleTextItem, QGraphicsLineItem
-from PyQt6.QtCore import Qt, QRectF
-from PyQt6.QtGui import QPen, QBrush, QColor, QFont, QTransform, QPainter
+import math
+import numpy as np
+from PyQt6.QtWidgets import (QGraphicsView, QGraphicsScene, QGraphicsItem, QGraphicsRectItem,
+                             QGraphicsLineItem, QStyleOptionGraphicsItem)
+from PyQt6.QtCore import Qt, QRectF, QLineF, pyqtSignal
+from PyQt6.QtGui import QPen, QBrush, QColor, QFont, QPainter
+
+from app.engines.fem_adapter import CampoNodal, CAMPOS_COM_SINAL
+from ui.gui.widgets import contour_layer
+
+# --- Estilos compartilhados (um objeto para todos os itens) ---
+BRUSH_LAJE = QBrush(QColor(220, 230, 250)) # Azul claro
+PEN_LAJE = QPen(Qt.GlobalColor.black, 0.05) # Linha fina (escala em metros)
+PEN_LAJE_LOD = QPen(Qt.GlobalColor.black, 0) # Cosmética (1 pixel em qualquer zoom)
+PEN_PAREDE = QPen(Qt.GlobalColor.red, 0.15) # Vermelha, Grossa
+PEN_PAREDE_LOD = QPen(Qt.GlobalColor.red, 0)
+PEN_GRADE = QPen(QColor(220, 220, 220), 0)
+PEN_GRADE.setStyle(Qt.PenStyle.DotLine)
+FONTE_LAJE = QFont("Arial")
+FONTE_LAJE.setPointSizeF(0.4) # Tamanho em "metros" visuais
+
+# Paleta do mapa de utilização (pré-calculada): verde (0) -> amarelo -> vermelho (1.0)
+N_CORES_UTILIZACAO = 20
+BRUSHES_UTILIZACAO = [QBrush(QColor.fromHsvF((1 - i / (N_CORES_UTILIZACAO - 1)) / 3.0, 0.7, 0.95))
+                      for i in range(N_CORES_UTILIZACAO)]
+BRUSH_FALHA = QBrush(QColor(120, 0, 0)) # Utilização acima de 1.0
+BRUSH_VAZIO = QBrush(Qt.BrushStyle.NoBrush) # Só contorno (campo de contorno visível por baixo)
+# Índices da paleta completa: 0..N-1 escala, N = falha, N+1 = sem valor (cor padrão), N+2 = sem preenchimento
+_PALETA = BRUSHES_UTILIZACAO + [BRUSH_FALHA, BRUSH_LAJE, BRUSH_VAZIO]
+_COR_PADRAO = N_CORES_UTILIZACAO + 1
+_SEM_PREENCHIMENTO = N_CORES_UTILIZACAO + 2
+
+# Nível de detalhe (pixels por metro na tela) abaixo do qual a representação simplifica
+LOD_TEXTO = 12.0
+LOD_VISAO_GERAL = 6.0 # Abaixo disso o pavimento inteiro é um único item (ver VisaoGeralItem)
+GRADE_MIN_PX = 8.0 # Espaçamento mínimo entre linhas da grade na tela
+PX_POR_AMOSTRA_CONTORNO = 2 # Contorno amostrado a cada 2 pixels da tela (suavizado ao desenhar)
+
+
+def _escala(painter) -> float:
+    return QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+
 
 class LajeItem(QGraphicsRectItem):
     """Representação gráfica de uma laje."""
     def __init__(self, x, y, lx, ly, nome):
         # CORREÇÃO: Não inverter Y manualmente aqui. A View já faz scale(1, -1).
         # Desenhamos no quadrante positivo do item (0,0 a lx, ly)
-        super().__init__(0, 0, lx, ly) 
-        self.setPos(x, y) 
-        
+        super().__init__(0, 0, lx, ly)
+        self.setPos(x, y)
+        self.nome = nome
+        self.geometria = (x, y, lx, ly)
+        self.linha = -1 # Índice na SlabTable (atualizado a cada sincronização)
+        self.cor = _COR_PADRAO
+
         # Estilo
-        self.setBrush(QBrush(QColor(220, 230, 250))) # Azul claro
-        self.setPen(QPen(Qt.GlobalColor.black, 0.05)) # Linha fina (escala em metros)
-        
-        # Texto (Nome da Laje)
-        text = QGraphicsSimpleTextItem(nome, self)
-        f = QFont("Arial")
-        f.setPointSizeF(0.4) # Tamanho em "metros" visuais
-        text.setFont(f)
-        
-        # Centralizar texto
-        br = text.boundingRect()
-        text.setPos((lx - br.width()) / 2, (ly - br.height()) / 2)
-        
-        # O texto precisa ser invertido verticalmente para não aparecer de cabeça para baixo
-        # já que o sistema de coordenadas global está invertido (Y+ para cima)
-        text.setTransform(QTransform().scale(1, -1).translate(0, -br.height())) 
+        self.setBrush(BRUSH_LAJE)
+        self.setPen(PEN_LAJE)
+
+    def atualizar(self, x, y, lx, ly):
+        self.setRect(0, 0, lx, ly)
+        self.setPos(x, y)
+        self.geometria = (x, y, lx, ly)
+
+    def paint(self, painter, option, widget=None):
+        if _escala(painter) < LOD_TEXTO:
+            # Longe: apenas o retângulo, sem texto e com contorno cosmético
+            painter.setPen(PEN_LAJE_LOD)
+            painter.setBrush(self.brush())
+            painter.drawRect(self.rect())
+            return
+
+        super().paint(painter, option, widget)
+        # Nome centralizado. O texto precisa ser invertido verticalmente para não
+        # aparecer de cabeça para baixo (sistema global com Y+ para cima)
+        r = self.rect()
+        painter.save()
+        painter.setFont(FONTE_LAJE)
+        painter.translate(r.center())
+        painter.scale(1, -1)
+        painter.drawText(QRectF(-r.width() / 2, -r.height() / 2, r.width(), r.height()),
+                         Qt.AlignmentFlag.AlignCenter, self.nome)
+        painter.restore()
 
 class ParedeItem(QGraphicsLineItem):
     """Representação visual de uma parede."""
     def __init__(self, x1, y1, x2, y2, carga):
         # CORREÇÃO: Coordenadas cartesianas diretas
         super().__init__(x1, y1, x2, y2)
-        
-        # Estilo da parede: Vermelha, Grossa
-        pen = QPen(Qt.GlobalColor.red, 0.15)
-        self.setPen(pen)
+        self.geometria = (x1, y1, x2, y2, carga)
+        self.setPen(PEN_PAREDE)
+
+    def atualizar(self, x1, y1, x2, y2, carga):
+        self.setLine(x1, y1, x2, y2)
+        self.geometria = (x1, y1, x2, y2, carga)
+
+
+class VisaoGeralItem(QGraphicsItem):
+    """
+    Representação barata do pavimento afastado: todos os retângulos e paredes
+    desenhados em duas chamadas (drawRects/drawLines), com traço de 1 pixel e
+    sem texto. Substitui os milhares de itens individuais abaixo de LOD_VISAO_GERAL.
+    """
+    def __init__(self):
+        super().__init__()
+        self._retangulos = {} # cor (rgba) -> (brush, [QRectF])
+        self._linhas = []
+        self._limites = QRectF()
+
+    def reconstruir(self, itens_lajes, itens_paredes):
+        self.prepareGeometryChange()
+        self._retangulos = {}
+        limites = QRectF()
+        for item in itens_lajes:
+            x, y, lx, ly = item.geometria
+            r = QRectF(x, y, lx, ly)
+            brush = item.brush()
+            self._retangulos.setdefault(brush.color().rgba(), (brush, []))[1].append(r)
+            limites = limites.united(r)
+        self._linhas = [QLineF(*item.geometria[:4]) for item in itens_paredes]
+        for l in self._linhas:
+            limites = limites.united(QRectF(l.p1(), l.p2()).normalized())
+        self._limites = limites
+
+    def boundingRect(self):
+        return self._limites
+
+    def paint(self, painter, option, widget=None):
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        painter.setPen(PEN_LAJE_LOD)
+        for brush, retangulos in self._retangulos.values():
+            painter.setBrush(brush)
+            painter.drawRects(retangulos)
+        painter.setPen(PEN_PAREDE_LOD)
+        painter.drawLines(self._linhas)
+
 
 class FloorCanvas(QGraphicsView):
+    laje_clicada = pyqtSignal(int) # Índice da laje (linha da tabela)
+
     def __init__(self):
         super().__init__()
         self.scene = QGraphicsScene(self)
         self.setScene(self.scene)
         self.setBackgroundBrush(QBrush(QColor(255, 255, 255)))
-        
+
         # Habilitar Antialiasing
         self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing, True)
+
+        # Navegação: arrastar para mover, roda do mouse para zoom
+        self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+
+        # Itens persistentes: (id, ocorrência) -> item. Só o que muda é recriado/movido.
+        self._itens_lajes = {}
+        self._itens_paredes = {}
+        self._lajes_por_linha = []
+
+        # Itens individuais x visão geral: alternados pelo zoom. Os itens ficam no
+        # nível superior da cena (filhos de um grupo perderiam o descarte pelo índice)
+        self._afastado = False
+        self._visao_geral = VisaoGeralItem()
+        self._visao_geral.setVisible(False)
+        self.scene.addItem(self._visao_geral)
+        self._visao_geral_desatualizada = True
+
+        # Campo de contorno: rasterizado só para a área visível e refeito quando ela muda
+        self._campo = None
+        self._campo_nome = None
+        self._campo_escala = (0.0, 0.0, None) # (vmin, vmax, LUT)
+        self._raster = (None, None) # (chave da área/tamanho, QImage)
 
         # Escala inicial (Pixels por Metro)
-        self.scale(40, 40) 
+        self.scale(40, 40)
         # Inverter eixo Y da view para funcionar como cartesiano (Y para cima)
         self.scale(1, -1)
 
-    def draw_grid(self):
-        # Grid de 1m em 1m
-        pen = QPen(QColor(220, 220, 220), 0) # Cosmetic pen (largura 0)
-        pen.setStyle(Qt.PenStyle.DotLine)
-        
-        # Desenha uma grid grande o suficiente
-        size = 50 
-        for i in range(-10, size):
-            self.scene.addLine(i, -10, i, size, pen) # Verticais
-            self.scene.addLine(-10, i, size, i, pen) # Horizontais
-            
+    def drawBackground(self, painter, rect):
+        # Grade pintada direto no fundo (não são itens da cena), só na área exposta
+        super().drawBackground(painter, rect)
+        px_por_m = _escala(painter)
+        passo = 1.0 # Grid de 1m em 1m; espaçada quando afastado
+        while passo * px_por_m < GRADE_MIN_PX:
+            passo *= 5.0
+
+        painter.setPen(PEN_GRADE)
+        x0 = math.floor(rect.left() / passo) * passo
+        y0 = math.floor(rect.top() / passo) * passo
+        nx = int((rect.right() - x0) / passo) + 1
+        ny = int((rect.bottom() - y0) / passo) + 1
+        linhas = [QLineF(x0 + i * passo, rect.top(), x0 + i * passo, rect.bottom()) for i in range(nx)]
+        linhas += [QLineF(rect.left(), y0 + j * passo, rect.right(), y0 + j * passo) for j in range(ny)]
+        painter.drawLines(linhas)
+
+        if self._campo is not None:
+            self._desenhar_contorno(painter)
+
         # Eixos X e Y destacados
-        self.scene.addLine(0, 0, 5, 0, QPen(Qt.GlobalColor.red, 0.05)) # X
-        self.scene.addLine(0, 0, 0, 5, QPen(Qt.GlobalColor.green, 0.05)) # Y
+        painter.setPen(QPen(Qt.GlobalColor.red, 0.05)); painter.drawLine(QLineF(0, 0, 5, 0)) # X
+        painter.setPen(QPen(Qt.GlobalColor.green, 0.05)); painter.drawLine(QLineF(0, 0, 0, 5)) # Y
+
+    def _desenhar_contorno(self, painter):
+        vp = self.viewport().rect()
+        area = self.mapToScene(vp).boundingRect()
+        largura = max(1, vp.width() // PX_POR_AMOSTRA_CONTORNO)
+        altura = max(1, vp.height() // PX_POR_AMOSTRA_CONTORNO)
+        chave = (area.getRect(), largura, altura)
+        if self._raster[0] != chave:
+            vmin, vmax, lut = self._campo_escala
+            imagem = contour_layer.rasterizar(self._campo, self._campo_nome, area, largura, altura, vmin, vmax, lut)
+            self._raster = (chave, imagem)
+        imagem = self._raster[1]
+        if imagem is not None:
+            painter.save()
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            painter.drawImage(area, imagem)
+            painter.restore()
+
+    def paintEvent(self, event):
+        # Escolhe a representação antes de desenhar (vale para zoom por roda, fit, etc.)
+        afastado = abs(self.transform().m11()) < LOD_VISAO_GERAL
+        if afastado and self._visao_geral_desatualizada:
+            self._visao_geral.reconstruir(self._itens_lajes.values(), self._itens_paredes.values())
+            self._visao_geral_desatualizada = False
+        if self._afastado != afastado:
+            self._afastado = afastado
+            self._visao_geral.setVisible(afastado)
+            for mapa in (self._itens_lajes, self._itens_paredes):
+                for item in mapa.values():
+                    item.setVisible(not afastado)
+        super().paintEvent(event)
+
+    def mousePressEvent(self, event):
+        item = self.itemAt(event.position().toPoint())
+        if isinstance(item, LajeItem) and item.linha >= 0:
+            self.laje_clicada.emit(item.linha)
+        super().mousePressEvent(event)
+
+    def wheelEvent(self, event):
+        fator = 1.15 if event.angleDelta().y() > 0 else 1 / 1.15
+        self.scale(fator, fator)
+
+    def _sincronizar(self, mapa, entradas, fabrica):
+        """
+        entradas: (id, geometria). Cria itens novos, atualiza os que mudaram e
+        remove os que sumiram. Ids repetidos são distinguidos pela ocorrência.
+        """
+        vistos = set()
+        ocorrencias = {}
+        ordem = []
+        alterou = False
+        for id_, geom in entradas:
+            k = ocorrencias.get(id_, 0)
+            ocorrencias[id_] = k + 1
+            chave = (id_, k)
+            vistos.add(chave)
+            item = mapa.get(chave)
+            if item is None:
+                item = fabrica(id_, geom)
+                item.setVisible(not self._afastado)
+                self.scene.addItem(item)
+                mapa[chave] = item
+                alterou = True
+            elif item.geometria != geom:
+                item.atualizar(*geom)
+                alterou = True
+            ordem.append(item)
+        for chave in [c for c in mapa if c not in vistos]:
+            self.scene.removeItem(mapa.pop(chave))
+            alterou = True
+        if alterou:
+            self._visao_geral_desatualizada = True
+            self.viewport().update()
+        return ordem
 
     def update_system(self, lajes, paredes):
-        self.scene.clear()
-        self.draw_grid()
-        
-        # Desenhar Lajes
-        for item in lajes:
-            rect = LajeItem(item.x, item.y, item.laje.lx, item.laje.ly, item.id)
-            self.scene.addItem(rect)
-            
-        # Desenhar Paredes
-        for p in paredes:
-            line = ParedeItem(p.x_inicio, p.y_inicio, p.x_fim, p.y_fim, p.carga_kn_m)
-            self.scene.addItem(line)
-            
-        # Centraliza a vista nos itens se houver
-        if lajes:
-            self.centerOn(lajes[0].x + lajes[0].laje.lx/2, lajes[0].y + lajes[0].laje.ly/2)
\ No newline at end of file
+        self.atualizar_itens(
+            ((l.id, (l.x, l.y, l.laje.lx, l.laje.ly)) for l in lajes),
+            ((p.id, (p.x_inicio, p.y_inicio, p.x_fim, p.y_fim, p.carga_kn_m)) for p in paredes)
+        )
+
+    def update_from_tables(self, tabela, tabela_paredes):
+        """Mesmo que update_system, lendo direto das colunas (sem montar objetos Laje)."""
+        t, p = tabela, tabela_paredes
+        self.atualizar_itens(
+            zip(t.ids, zip(t.x.tolist(), t.y.tolist(), t.lx.tolist(), t.ly.tolist())),
+            zip(p.ids, zip(p.x_inicio.tolist(), p.y_inicio.tolist(), p.x_fim.tolist(),
+                           p.y_fim.tolist(), p.carga_kn_m.tolist()))
+        )
+
+    def atualizar_itens(self, lajes, paredes):
+        primeira_carga = not self._itens_lajes
+        self._lajes_por_linha = self._sincronizar(self._itens_lajes, lajes, lambda id_, g: LajeItem(*g, id_))
+        for i, item in enumerate(self._lajes_por_linha):
+            item.linha = i
+        self._sincronizar(self._itens_paredes, paredes, lambda id_, g: ParedeItem(*g))
+
+        # Centraliza a vista nos itens na primeira carga (edições não movem a câmera)
+        if primeira_carga and self._itens_lajes:
+            x, y, lx, ly = self._itens_lajes[next(iter(self._itens_lajes))].geometria
+            self.centerOn(x + lx/2, y + ly/2)
+
+    def definir_utilizacao(self, valores=None):
+        """
+        Colore as lajes pelo índice de utilização (array na ordem das linhas da
+        tabela). None restaura a cor padrão. Só os itens cuja faixa mudou são tocados.
+        """
+        n = len(self._lajes_por_linha)
+        if valores is None:
+            codigos = [_COR_PADRAO] * n
+        else:
+            v = np.asarray(valores, dtype=np.float64)[:n]
+            faixa = np.clip(np.floor(np.nan_to_num(v, nan=0.0, posinf=2.0) * N_CORES_UTILIZACAO),
+                            0, N_CORES_UTILIZACAO - 1)
+            codigos = np.where(np.isnan(v), _COR_PADRAO,
+                               np.where(v > 1.0, N_CORES_UTILIZACAO, faixa)).astype(np.intp).tolist()
+
+        self._aplicar_cores(codigos)
+
+    def definir_campo(self, campo: CampoNodal = None, nome: str = None):
+        """
+        Mostra o campo nodal `nome` como contorno sob os contornos das lajes
+        (que ficam sem preenchimento). None remove o contorno e volta à cor padrão.
+        A escala de cores é a do pavimento inteiro, estável ao navegar.
+        """
+        self._raster = (None, None)
+        if campo is None or nome not in campo.valores:
+            self._campo = self._campo_nome = None
+            self._aplicar_cores([_COR_PADRAO] * len(self._lajes_por_linha))
+            self.viewport().update()
+            return
+
+        vmin, vmax = campo.limites(nome)
+        if nome in CAMPOS_COM_SINAL:
+            m = max(abs(vmin), abs(vmax))
+            self._campo_escala = (-m, m, contour_layer.lut_divergente())
+        else:
+            self._campo_escala = (vmin, vmax, contour_layer.lut_sequencial())
+        self._campo, self._campo_nome = campo, nome
+        self._aplicar_cores([_SEM_PREENCHIMENTO] * len(self._lajes_por_linha))
+        self.viewport().update()
+
+    def _aplicar_cores(self, codigos):
+        alterou = False
+        for item, codigo in zip(self._lajes_por_linha, codigos):
+            if item.cor != codigo:
+                item.cor = codigo
+                item.setBrush(_PALETA[codigo])
+                alterou = True
+        if alterou:
+            self._visao_geral_desatualizada = True
+            self.viewport().update()
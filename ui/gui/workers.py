@@ -0,0 +1,184 @@
+"""
+Execução de cálculos fora da thread da interface.
+
+As tarefas rodam num QThreadPool e devolvem resultado/progresso por sinais, que
+o Qt entrega na thread da interface. Cada tarefa pertence a um "canal"
+(ex: 'calculadora', 'exportacao'): um pedido novo no mesmo canal cancela o
+anterior e qualquer resultado atrasado de uma geração antiga é descartado.
+
+O cancelamento é cooperativo: a função da tarefa recebe um callback
+`progresso(concluidas, total)` que levanta TarefaCancelada quando o pedido foi
+substituído ou cancelado.
+
+Falhas vão para o `ao_falhar` da tarefa ou, sem ele, para o sinal `erro` do
+executor (a janela principal mostra na barra de status). O traceback completo
+segue para o logging.
+"""
+import logging
+import threading
+import traceback
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+Progresso = Callable[[int, int], None]
+
+_log = logging.getLogger(__name__)
+
+
+class TarefaCancelada(Exception):
+    """Interrompe a tarefa em execução (pedido substituído ou cancelado)."""
+    pass
+
+
+class TokenCancelamento:
+    """Sinalizador compartilhado entre a interface e a thread de trabalho."""
+
+    def __init__(self):
+        self._evento = threading.Event()
+
+    def cancelar(self):
+        self._evento.set()
+
+    @property
+    def cancelado(self) -> bool:
+        return self._evento.is_set()
+
+    def verificar(self):
+        if self._evento.is_set():
+            raise TarefaCancelada()
+
+
+class _SinaisTarefa(QObject):
+    # (canal, geracao, ...) - o executor confere a geração antes de entregar
+    progresso = pyqtSignal(str, int, int, int)
+    concluido = pyqtSignal(str, int, object)
+    falhou = pyqtSignal(str, int, str, str) # ..., mensagem, traceback
+
+
+class _Tarefa(QRunnable):
+    def __init__(self, canal: str, geracao: int, funcao: Callable[[Progresso], Any], token: TokenCancelamento):
+        super().__init__()
+        self.canal = canal
+        self.geracao = geracao
+        self.funcao = funcao
+        self.token = token
+        self.sinais = _SinaisTarefa()
+
+    def _progresso(self, concluidas: int, total: int):
+        self.token.verificar()
+        self.sinais.progresso.emit(self.canal, self.geracao, concluidas, total)
+
+    def run(self):
+        try:
+            self.token.verificar()
+            resultado = self.funcao(self._progresso)
+            self.token.verificar()
+        except TarefaCancelada:
+            return
+        except Exception as e:
+            self.sinais.falhou.emit(self.canal, self.geracao, str(e), traceback.format_exc())
+            return
+        self.sinais.concluido.emit(self.canal, self.geracao, resultado)
+
+
+class ExecutorTarefas(QObject):
+    """
+    Despacha funções para o pool de threads e entrega os retornos na thread da
+    interface, descartando pedidos obsoletos (coalescência por canal).
+    """
+    # Notificações gerais para barra de status / indicador de ocupado
+    progresso = pyqtSignal(str, int, int)
+    ocupado = pyqtSignal(str, bool)
+    erro = pyqtSignal(str, str) # (canal, mensagem) de falhas sem ao_falhar
+
+    def __init__(self, parent: Optional[QObject] = None, max_threads: Optional[int] = None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self._geracao: Dict[str, int] = {}
+        # canal -> (tarefa, token, ao_concluir, ao_progresso, ao_falhar)
+        self._ativas: Dict[str, Tuple[_Tarefa, TokenCancelamento, Callable, Optional[Callable], Optional[Callable]]] = {}
+
+    def submeter(
+        self,
+        canal: str,
+        funcao: Callable[[Progresso], Any],
+        ao_concluir: Callable[[Any], None],
+        ao_progresso: Optional[Callable[[int, int], None]] = None,
+        ao_falhar: Optional[Callable[[str], None]] = None
+    ) -> int:
+        """
+        Agenda `funcao(progresso)` no pool. Substitui o pedido ainda pendente do
+        mesmo canal. Retorna a geração atribuída ao pedido.
+        """
+        self.cancelar(canal, notificar=False)
+        geracao = self._geracao.get(canal, 0) + 1
+        self._geracao[canal] = geracao
+
+        token = TokenCancelamento()
+        tarefa = _Tarefa(canal, geracao, funcao, token)
+        tarefa.sinais.progresso.connect(self._ao_progresso)
+        tarefa.sinais.concluido.connect(self._ao_concluir)
+        tarefa.sinais.falhou.connect(self._ao_falhar)
+        # A referência é mantida até a entrega para que os sinais não sejam coletados
+        self._ativas[canal] = (tarefa, token, ao_concluir, ao_progresso, ao_falhar)
+
+        self.ocupado.emit(canal, True)
+        self.pool.start(tarefa)
+        return geracao
+
+    def cancelar(self, canal: str, notificar: bool = True):
+        ativa = self._ativas.pop(canal, None)
+        if ativa:
+            ativa[1].cancelar()
+            if notificar:
+                self.ocupado.emit(canal, False)
+
+    def cancelar_todos(self):
+        for canal in list(self._ativas):
+            self.cancelar(canal)
+
+    def em_execucao(self, canal: Optional[str] = None) -> bool:
+        return bool(self._ativas) if canal is None else canal in self._ativas
+
+    def aguardar(self, timeout_ms: int = -1) -> bool:
+        """Bloqueia até o fim das tarefas em andamento (ex: ao fechar a janela)."""
+        return self.pool.waitForDone(timeout_ms)
+
+    # --- Entrega na thread da interface ---
+
+    def _vigente(self, canal: str, geracao: int):
+        ativa = self._ativas.get(canal)
+        if ativa is None or ativa[0].geracao != geracao:
+            return None
+        return ativa
+
+    def _ao_progresso(self, canal: str, geracao: int, concluidas: int, total: int):
+        ativa = self._vigente(canal, geracao)
+        if ativa is None: return
+        if ativa[3]:
+            ativa[3](concluidas, total)
+        self.progresso.emit(canal, concluidas, total)
+
+    def _ao_concluir(self, canal: str, geracao: int, resultado: Any):
+        ativa = self._vigente(canal, geracao)
+        if ativa is None: return
+        del self._ativas[canal]
+        self.ocupado.emit(canal, False)
+        ativa[2](resultado)
+
+    def _ao_falhar(self, canal: str, geracao: int, mensagem: str, detalhes: str):
+        ativa = self._vigente(canal, geracao)
+        if ativa is None: return
+        del self._ativas[canal]
+        self.ocupado.emit(canal, False)
+        if ativa[4]:
+            _log.debug("Tarefa '%s' falhou:\n%s", canal, detalhes)
+            ativa[4](mensagem)
+        elif self.receivers(self.erro) > 0:
+            _log.debug("Tarefa '%s' falhou:\n%s", canal, detalhes)
+            self.erro.emit(canal, mensagem)
+        else:
+            _log.error("Erro na tarefa '%s': %s\n%s", canal, mensagem, detalhes)